@@ -0,0 +1,90 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Compare the header-only metadata reader with `importlib.metadata`."""
+
+
+import argparse
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from typing import List, Optional
+
+from depinfo.domain import DistributionMetadata, EnvironmentIndex, MetadataReader
+
+
+if sys.version_info < (3, 8):
+    from importlib_metadata import PathDistribution
+else:
+    from importlib.metadata import PathDistribution
+
+
+def create_distribution(directory: Path, body_size: int) -> Path:
+    """Create a distribution whose metadata has a description of the given size."""
+    location = directory / "crystal_ball-4.2.0.dist-info"
+    location.mkdir()
+    with (location / "METADATA").open("w", encoding="utf-8") as handle:
+        handle.write("Metadata-Version: 2.1\nName: crystal_ball\nVersion: 4.2.0\n")
+        handle.writelines(f"Requires-Dist: dependency-{i}\n" for i in range(20))
+        handle.write("\n")
+        handle.write("x" * body_size)
+    return location
+
+
+def benchmark(locations: List[Path], number: int) -> None:
+    """Time reading the given locations with both approaches and print the results."""
+    importlib_time = min(
+        timeit.repeat(
+            lambda: [
+                DistributionMetadata.from_distribution(PathDistribution(location))
+                for location in locations
+            ],
+            number=number,
+            repeat=5,
+        )
+    )
+    reader_time = min(
+        timeit.repeat(
+            lambda: [MetadataReader.read(location) for location in locations],
+            number=number,
+            repeat=5,
+        )
+    )
+    per_dist = 1e6 / (number * len(locations))
+    print(f"  importlib.metadata: {importlib_time * per_dist:10.1f} µs/distribution")
+    print(f"  MetadataReader:     {reader_time * per_dist:10.1f} µs/distribution")
+    print(f"  speed-up:           {importlib_time / reader_time:10.1f}x")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark on installed and synthetic distributions."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=10)
+    parser.add_argument("--body-size", type=int, default=500_000)
+    args = parser.parse_args(argv)
+
+    locations = list(EnvironmentIndex.create().locations.values())
+    print(f"{len(locations)} installed distributions:")
+    benchmark(locations, args.number)
+
+    with tempfile.TemporaryDirectory() as directory:
+        location = create_distribution(Path(directory), args.body_size)
+        print(f"One distribution with a {args.body_size:,} character description:")
+        benchmark([location], args.number)
+
+
+if __name__ == "__main__":
+    main()
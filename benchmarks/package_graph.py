@@ -0,0 +1,152 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Compare traversals over the package graph with dictionary lookups per edge."""
+
+
+import argparse
+import random
+import sys
+import timeit
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from depinfo.domain import Package, PackageGraph
+
+
+def create_packages(size: int, fan_out: int, seed: int) -> Dict[str, Package]:
+    """Create a random acyclic map of packages, each with up to `fan_out` edges."""
+    rng = random.Random(seed)
+    names = [f"package-{i}" for i in range(size)]
+    return {
+        name: Package(
+            name=name,
+            version="1.0.0",
+            requirements=rng.sample(names[i + 1 :], min(fan_out, size - i - 1)),
+        )
+        for i, name in enumerate(names)
+    }
+
+
+def traverse_dict(
+    packages: Dict[str, Package], root: str, max_depth: int
+) -> List[Tuple[int, Package]]:
+    """Traverse the requirements by looking up each edge by name."""
+    result = []
+    discovered: Deque[Tuple[int, Package]] = deque(
+        (1, packages[req]) for req in packages[root].requirements
+    )
+    while discovered:
+        level, pkg = discovered.popleft()
+        if level < max_depth:
+            discovered.extend((level + 1, packages[req]) for req in pkg.requirements)
+        result.append((level, pkg))
+    return result
+
+
+def traverse_graph(
+    graph: PackageGraph, root: str, max_depth: int
+) -> List[Tuple[int, Package]]:
+    """Traverse the requirements by following integer identifiers."""
+    result = []
+    root_id = graph.node_id(root)
+    assert root_id is not None  # noqa: S101
+    discovered: Deque[Tuple[int, int]] = deque(
+        (1, node) for node in graph.successors(root_id)
+    )
+    while discovered:
+        level, node = discovered.popleft()
+        if level < max_depth:
+            discovered.extend((level + 1, succ) for succ in graph.successors(node))
+        result.append((level, graph.packages[node]))
+    return result
+
+
+def measure_memory(packages: Dict[str, Package], graph: PackageGraph) -> None:
+    """Print the memory used for storing the requirement edges."""
+    lists = sum(sys.getsizeof(pkg.requirements) for pkg in packages.values())
+    arrays = sum(
+        len(values) * values.itemsize for values in (graph.offsets, graph.targets)
+    )
+    reverse_arrays = sum(
+        len(values) * values.itemsize
+        for values in (graph.reverse_offsets, graph.reverse_targets)
+    )
+    interning = sys.getsizeof(graph.ids) + sys.getsizeof(graph.names)
+    print("Memory for the requirement edges:")
+    print(f"  lists of names:     {lists / 2**20:10.2f} MiB")
+    print(f"  CSR arrays:         {arrays / 2**20:10.2f} MiB")
+    print(f"  inverted CSR:       {reverse_arrays / 2**20:10.2f} MiB")
+    print(
+        f"  name interning:     {interning / 2**20:10.2f} MiB (shared by all reports)"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark on a synthetic package map."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=20_000)
+    parser.add_argument("--fan-out", type=int, default=5)
+    parser.add_argument("--max-depth", type=int, default=6)
+    parser.add_argument("-n", "--number", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    packages = create_packages(args.size, args.fan_out, args.seed)
+    graph = PackageGraph.from_packages(packages)
+    print(f"{len(graph):,} packages with {graph.num_edges:,} edges")
+
+    root = next(iter(packages))
+    assert traverse_dict(packages, root, args.max_depth) == traverse_graph(
+        graph, root, args.max_depth
+    )  # noqa: S101
+    dict_time = min(
+        timeit.repeat(
+            lambda: traverse_dict(packages, root, args.max_depth),
+            number=args.number,
+            repeat=5,
+        )
+    )
+    graph_time = min(
+        timeit.repeat(
+            lambda: traverse_graph(graph, root, args.max_depth),
+            number=args.number,
+            repeat=5,
+        )
+    )
+    build_time = min(
+        timeit.repeat(lambda: PackageGraph.from_packages(packages), number=1, repeat=5)
+    )
+    # The components are cached on a graph, so we condense a fresh graph each time.
+    components_time = min(
+        timeit.repeat(
+            "graph.strongly_connected_components()",
+            setup="graph = PackageGraph.from_packages(packages)",
+            globals={"PackageGraph": PackageGraph, "packages": packages},
+            number=1,
+            repeat=5,
+        )
+    )
+    print(f"Traversal to depth {args.max_depth}:")
+    print(f"  dictionary lookups: {dict_time / args.number * 1e3:10.2f} ms")
+    print(f"  package graph:      {graph_time / args.number * 1e3:10.2f} ms")
+    print(f"  graph construction: {build_time * 1e3:10.2f} ms (once per report)")
+    print(f"  components (cycles): {components_time * 1e3:9.2f} ms (once per graph)")
+
+    measure_memory(packages, graph)
+
+
+if __name__ == "__main__":
+    main()
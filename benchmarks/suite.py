@@ -0,0 +1,210 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Run the benchmark suite on a synthetic environment and compare results.
+
+Examples:
+    python benchmarks/suite.py run --output baseline.json
+    python benchmarks/suite.py run --output candidate.json
+    python benchmarks/suite.py compare baseline.json candidate.json
+
+"""
+
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import timeit
+from io import StringIO
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from synthetic_environment import ROOT, EnvironmentParameters, create_site_packages
+
+from depinfo.domain import DependencyReport, EnvironmentIndex, Package
+from depinfo.infrastructure.application import (
+    MarkdownTableDisplayService,
+    SimpleDisplayService,
+)
+
+
+FORMAT_VERSION = 1
+
+
+def measure(func: Callable[[], object], number: int, repeat: int) -> Dict[str, float]:
+    """Time a function and return the best and mean time per call in seconds."""
+    timings = [
+        time / number for time in timeit.repeat(func, number=number, repeat=repeat)
+    ]
+    return {"best": min(timings), "mean": sum(timings) / len(timings)}
+
+
+def run_cases(
+    site_packages: Path, parameters: EnvironmentParameters, repeat: int
+) -> Dict[str, Dict[str, float]]:
+    """Time all benchmark cases in the given synthetic environment."""
+    depth = parameters.depth
+    index = EnvironmentIndex.create([str(site_packages)])
+    names = sorted(index.locations)
+    report = DependencyReport.from_root(ROOT, (), max_depth=depth, index=index)
+
+    def fresh_report() -> DependencyReport:
+        """Return a copy of the report without a cached traversal order."""
+        return DependencyReport(
+            root=report.root,
+            platform=report.platform,
+            python=report.python,
+            build_tools=report.build_tools,
+            packages=report.packages,
+            graph=report.graph,
+        )
+
+    cli = [
+        sys.executable,
+        "-c",
+        "from depinfo.infrastructure.application.cli import main; main()",
+        "--max-depth",
+        str(min(depth, 4)),
+        ROOT,
+    ]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(site_packages)] + sys.path))
+    return {
+        "environment_index": measure(
+            lambda: EnvironmentIndex.create([str(site_packages)]), 1, repeat
+        ),
+        "package_from_name": measure(
+            lambda: [Package.from_name(name, index=index) for name in names], 1, repeat
+        ),
+        "report_from_root": measure(
+            lambda: DependencyReport.from_root(ROOT, (), max_depth=depth, index=index),
+            1,
+            repeat,
+        ),
+        "iter_requirements": measure(
+            lambda: list(fresh_report().iter_requirements(depth)), 10, repeat
+        ),
+        "iter_unique_requirements": measure(
+            lambda: list(fresh_report().iter_unique_requirements(max_depth=depth)),
+            10,
+            repeat,
+        ),
+        "simple_display": measure(
+            lambda: SimpleDisplayService.display(
+                report, max_depth=depth, stream=StringIO()
+            ),
+            10,
+            repeat,
+        ),
+        "markdown_display": measure(
+            lambda: MarkdownTableDisplayService.display(
+                report, max_depth=depth, stream=StringIO()
+            ),
+            10,
+            repeat,
+        ),
+        "cli": measure(
+            lambda: subprocess.run(cli, env=env, check=True, stdout=subprocess.DEVNULL),
+            1,
+            repeat,
+        ),
+    }
+
+
+def run(args: argparse.Namespace) -> None:
+    """Run the suite and print or store the results."""
+    parameters = EnvironmentParameters(
+        **{field: getattr(args, field) for field in EnvironmentParameters._fields}
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        site_packages = create_site_packages(Path(directory), parameters)
+        results = run_cases(site_packages, parameters, args.repeat)
+    document = {
+        "format_version": FORMAT_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": parameters._asdict(),
+        "results": results,
+    }
+    for case, timing in results.items():
+        print(f"{case:<26} {timing['best'] * 1e3:10.3f} ms")
+    if args.output is not None:
+        with args.output.open("w", encoding="utf-8") as handle:
+            json.dump(document, handle, indent=2)
+
+
+def compare(args: argparse.Namespace) -> None:
+    """Compare two result files and fail if any case regressed beyond a tolerance."""
+    with args.baseline.open(encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    with args.candidate.open(encoding="utf-8") as handle:
+        candidate = json.load(handle)
+    if baseline["parameters"] != candidate["parameters"]:
+        print("Warning: the results were measured on differently shaped environments.")
+    regressions = []
+    for case, timing in candidate["results"].items():
+        if case not in baseline["results"]:
+            continue
+        ratio = timing["best"] / baseline["results"][case]["best"]
+        flag = ""
+        if ratio > 1 + args.tolerance:
+            regressions.append(case)
+            flag = "  regression"
+        print(f"{case:<26} {ratio:8.2f}x{flag}")
+    if regressions:
+        sys.exit(1)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parse command line arguments and run the desired command."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run the benchmark suite.")
+    defaults = EnvironmentParameters()
+    for field in EnvironmentParameters._fields:
+        run_parser.add_argument(
+            f"--{field.replace('_', '-')}",
+            type=type(getattr(defaults, field)),
+            default=getattr(defaults, field),
+        )
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument(
+        "-o", "--output", type=Path, help="Store the results in this JSON file."
+    )
+    run_parser.set_defaults(func=run)
+    compare_parser = commands.add_parser(
+        "compare", help="Compare two result files (by their best times)."
+    )
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("candidate", type=Path)
+    compare_parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="The relative slow-down that is tolerated (default 0.1).",
+    )
+    compare_parser.set_defaults(func=compare)
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
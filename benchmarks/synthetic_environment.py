@@ -0,0 +1,145 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Generate synthetic site-packages directories for benchmarking."""
+
+
+import argparse
+import random
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+
+ROOT = "synthetic-root"
+
+
+class EnvironmentParameters(NamedTuple):
+    """Define the shape of a synthetic environment."""
+
+    size: int = 1_000
+    fan_out: int = 5
+    depth: int = 4
+    diamond_density: float = 0.5
+    body_size: int = 10_000
+    seed: int = 42
+
+
+def create_levels(parameters: EnvironmentParameters) -> List[List[str]]:
+    """
+    Distribute the package names over the requirement levels below the root.
+
+    Each level holds up to `fan_out` times as many packages as the level above. Any
+    packages left over after the maximum depth are installed but required by none.
+
+    """
+    levels: List[List[str]] = [[ROOT]]
+    remaining = parameters.size - 1
+    for level in range(1, parameters.depth + 1):
+        count = min(len(levels[-1]) * parameters.fan_out, remaining)
+        if count == 0:
+            break
+        levels.append([f"synthetic-{level}-{i}" for i in range(count)])
+        remaining -= count
+    levels.append([f"synthetic-unrelated-{i}" for i in range(remaining)])
+    return levels
+
+
+def create_requirements(
+    levels: List[List[str]], parameters: EnvironmentParameters
+) -> List[List[List[str]]]:
+    """
+    Choose the requirements of each package among those of the next level.
+
+    With a probability of `diamond_density`, a requirement is drawn at random from the
+    next level, such that several packages may share it. Otherwise, requirements are
+    assigned in turn, which yields a tree as long as the next level is large enough.
+
+    """
+    rng = random.Random(parameters.seed)
+    result = []
+    # The last level holds the unrelated packages.
+    for parents, children in zip(levels[:-1], levels[1:-1] + [[]]):
+        turn = 0
+        level_requirements = []
+        for _ in parents:
+            requirements = {}
+            for _ in range(min(parameters.fan_out, len(children))):
+                if rng.random() < parameters.diamond_density or turn >= len(children):
+                    name = rng.choice(children)
+                else:
+                    name = children[turn]
+                    turn += 1
+                requirements[name] = None
+            level_requirements.append(list(requirements))
+        result.append(level_requirements)
+    result.append([[] for _ in levels[-1]])
+    return result
+
+
+def write_distribution(
+    directory: Path, name: str, requirements: List[str], body_size: int
+) -> None:
+    """Write the metadata of a single distribution."""
+    location = directory / f"{name.replace('-', '_')}-1.0.0.dist-info"
+    location.mkdir()
+    with (location / "METADATA").open("w", encoding="utf-8") as handle:
+        handle.write(f"Metadata-Version: 2.1\nName: {name}\nVersion: 1.0.0\n")
+        handle.writelines(f"Requires-Dist: {req} (>=1.0)\n" for req in requirements)
+        handle.write("\n")
+        handle.write("x" * body_size)
+
+
+def create_site_packages(directory: Path, parameters: EnvironmentParameters) -> Path:
+    """
+    Create a synthetic site-packages directory.
+
+    Args:
+        directory: The directory in which to create the site-packages.
+        parameters: The shape of the synthetic environment.
+
+    Returns:
+        The path to the site-packages directory. The package requiring all others,
+        directly or indirectly, is called `synthetic-root`.
+
+    """
+    site_packages = directory / "site-packages"
+    site_packages.mkdir(parents=True)
+    levels = create_levels(parameters)
+    for names, requirements in zip(levels, create_requirements(levels, parameters)):
+        for name, reqs in zip(names, requirements):
+            write_distribution(site_packages, name, reqs, parameters.body_size)
+    return site_packages
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Create a synthetic site-packages directory from command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("directory", type=Path)
+    defaults = EnvironmentParameters()
+    for field in EnvironmentParameters._fields:
+        parser.add_argument(
+            f"--{field.replace('_', '-')}",
+            type=type(getattr(defaults, field)),
+            default=getattr(defaults, field),
+        )
+    args = parser.parse_args(argv)
+    parameters = EnvironmentParameters(
+        **{field: getattr(args, field) for field in EnvironmentParameters._fields}
+    )
+    print(create_site_packages(args.directory, parameters))
+
+
+if __name__ == "__main__":
+    main()
@@ -20,4 +20,19 @@ __author__ = "Moritz E. Beber"
 __email__ = "midnighter@posteo.net"
 
 
-from .application.compatibility import print_dependencies, show_versions
+from typing import TYPE_CHECKING
+
+from ._lazy import attach
+
+
+if TYPE_CHECKING:
+    from .application.compatibility import print_dependencies, show_versions
+
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "print_dependencies": ".application.compatibility",
+        "show_versions": ".application.compatibility",
+    },
+)
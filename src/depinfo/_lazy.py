@@ -0,0 +1,60 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide lazy loading of package attributes from their submodules."""
+
+
+import importlib
+import sys
+from typing import Any, Callable, List, Mapping, Tuple
+
+
+def attach(
+    package_name: str, attributes: Mapping[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]], List[str]]:
+    """
+    Return the module level functions that load a package's attributes on access.
+
+    Importing a package then no longer imports all of its submodules (and their
+    dependencies), which keeps the start-up time of the command line interface low.
+    The functions implement PEP 562 and are meant to be assigned to `__getattr__`,
+    `__dir__`, and `__all__` in a package's `__init__.py`.
+
+    Args:
+        package_name: The fully qualified name of the package.
+        attributes: A map from attribute names to the (relative) names of the
+            submodules that define them.
+
+    Returns:
+        The package's `__getattr__` and `__dir__` functions and its `__all__` list.
+
+    """
+
+    def __getattr__(name: str) -> Any:
+        try:
+            module_name = attributes[name]
+        except KeyError:
+            raise AttributeError(
+                f"module {package_name!r} has no attribute {name!r}"
+            ) from None
+        value = getattr(importlib.import_module(module_name, package_name), name)
+        # Later accesses no longer go through this function.
+        setattr(sys.modules[package_name], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package_name])).union(attributes))
+
+    return __getattr__, __dir__, list(attributes)
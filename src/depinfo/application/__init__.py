@@ -13,7 +13,24 @@
 # limitations under the License.
 
 
-from .display_format import DisplayFormat
-from .abstract_display_service import AbstractDisplayService
-from .display_service_registry import DisplayServiceRegistry
-from .display_application import DisplayApplication
+from typing import TYPE_CHECKING
+
+from depinfo._lazy import attach
+
+
+if TYPE_CHECKING:
+    from .display_format import DisplayFormat
+    from .abstract_display_service import AbstractDisplayService
+    from .display_service_registry import DisplayServiceRegistry
+    from .display_application import DisplayApplication
+
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "DisplayFormat": ".display_format",
+        "AbstractDisplayService": ".abstract_display_service",
+        "DisplayServiceRegistry": ".display_service_registry",
+        "DisplayApplication": ".display_application",
+    },
+)
@@ -17,6 +17,7 @@
 
 
 from abc import ABC, abstractmethod
+from typing import Optional, Sequence, TextIO
 
 from depinfo.domain import DependencyReport
 
@@ -26,13 +27,44 @@ class AbstractDisplayService(ABC):
 
     @classmethod
     @abstractmethod
-    def display(cls, report: DependencyReport, max_depth: int = 1, **kwargs) -> None:
+    def display(
+        cls,
+        report: DependencyReport,
+        max_depth: int = 1,
+        stream: Optional[TextIO] = None,
+        **kwargs,
+    ) -> None:
         """
         Display a dependency report to a desired maximum depth.
 
         Args:
             report: A dependency report instance.
             max_depth:  The maximum desired depth (default 1).
+            stream: The text stream to write to (default `sys.stdout`).
             **kwargs: Keyword arguments are passed on to the actual display method.
 
         """
+
+    @classmethod
+    def display_all(
+        cls,
+        reports: Sequence[DependencyReport],
+        max_depth: int = 1,
+        stream: Optional[TextIO] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Display multiple dependency reports that share the same environment.
+
+        By default, each report is displayed in full. Services should override this
+        method to display the information that is shared by all reports only once.
+
+        Args:
+            reports: A sequence of dependency report instances.
+            max_depth:  The maximum desired depth (default 1).
+            stream: The text stream to write to (default `sys.stdout`).
+            **kwargs: Keyword arguments are passed on to the actual display method.
+
+        """
+        for report in reports:
+            cls.display(report=report, max_depth=max_depth, stream=stream, **kwargs)
@@ -16,14 +16,38 @@
 """Provide an application that displays dependency information."""
 
 
-from typing import Iterable
+import sys
+from collections import deque
+from concurrent.futures import Executor
+from contextlib import nullcontext
+from io import StringIO
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, TextIO, Tuple
 
-from depinfo.domain import DependencyReport
+from depinfo.domain import (
+    AbstractMetadataCache,
+    DependencyReport,
+    EnvironmentIndex,
+    Profiler,
+)
 
 from .display_format import DisplayFormat
 from .display_service_registry import DisplayServiceRegistry
 
 
+DEFAULT_BUILD_TOOLS: Tuple[str, ...] = (
+    "conda",
+    "flit",
+    "hatch",
+    "mamba",
+    "pbr",
+    "pip",
+    "poetry",
+    "setuptools",
+    "wheel",
+)
+
+
 class DisplayApplication:
     """Define an application that displays dependency information."""
 
@@ -32,18 +56,16 @@ class DisplayApplication:
         cls,
         package_name: str,
         display_format: DisplayFormat = DisplayFormat.Simple,
-        build_tools: Iterable[str] = (
-            "conda",
-            "flit",
-            "hatch",
-            "mamba",
-            "pbr",
-            "pip",
-            "poetry",
-            "setuptools",
-            "wheel",
-        ),
+        build_tools: Iterable[str] = DEFAULT_BUILD_TOOLS,
         max_depth: int = 1,
+        cache: Optional[AbstractMetadataCache] = None,
+        max_workers: Optional[int] = None,
+        include_inactive: bool = False,
+        stream: Optional[TextIO] = None,
+        index: Optional[EnvironmentIndex] = None,
+        profiler: Optional[Profiler] = None,
+        tree: bool = False,
+        fingerprint: bool = False,
     ) -> None:
         """
         Display the given package's dependencies in the desired format.
@@ -53,13 +75,346 @@ class DisplayApplication:
             display_format: One of the supported display formats.
             build_tools: A list of build packages to include.
             max_depth: The maximum desired depth of requirements nesting.
+            cache: An optional cache of previously read distribution metadata.
+            max_workers: If given, load package metadata concurrently using this many
+                threads.
+            include_inactive: Whether to follow requirements whose environment
+                markers do not apply to the running interpreter.
+            stream: The text stream to write to (default `sys.stdout`).
+            index: An index of the installed distributions. If none is given, the
+                current environment is scanned.
+            profiler: An optional profiler that records the time spent on each
+                phase, from discovering the installed distributions to formatting.
+            tree: Whether to display the nested structure of the dependencies, if
+                supported by the display format (default false).
+            fingerprint: Whether to include the environment's fingerprint, if
+                supported by the display format (default false).
 
         """
         report = DependencyReport.from_root(
             root=package_name,
             build_tools=build_tools,
             max_depth=max_depth,
+            index=index,
+            cache=cache,
+            max_workers=max_workers,
+            include_inactive=include_inactive,
+            profiler=profiler,
+        )
+        cls._display(
+            [report], display_format, max_depth, stream, profiler, tree, fingerprint
+        )
+
+    @classmethod
+    def run_all(
+        cls,
+        display_format: DisplayFormat = DisplayFormat.Simple,
+        build_tools: Iterable[str] = DEFAULT_BUILD_TOOLS,
+        max_depth: int = 1,
+        cache: Optional[AbstractMetadataCache] = None,
+        max_workers: Optional[int] = None,
+        include_inactive: bool = False,
+        stream: Optional[TextIO] = None,
+        index: Optional[EnvironmentIndex] = None,
+        profiler: Optional[Profiler] = None,
+        tree: bool = False,
+        fingerprint: bool = False,
+    ) -> None:
+        """
+        Display the dependencies of every installed package in the desired format.
+
+        Args:
+            display_format: One of the supported display formats.
+            build_tools: A list of build packages to include.
+            max_depth: The maximum desired depth of requirements nesting.
+            cache: An optional cache of previously read distribution metadata.
+            max_workers: If given, load package metadata concurrently using this many
+                threads.
+            include_inactive: Whether to follow requirements whose environment
+                markers do not apply to the running interpreter.
+            stream: The text stream to write to (default `sys.stdout`).
+            index: An index of the installed distributions. If none is given, the
+                current environment is scanned.
+            profiler: An optional profiler that records the time spent on each
+                phase, from discovering the installed distributions to formatting.
+            tree: Whether to display the nested structure of the dependencies, if
+                supported by the display format (default false).
+            fingerprint: Whether to include the environment's fingerprint, if
+                supported by the display format (default false).
+
+        """
+        reports = DependencyReport.from_environment(
+            build_tools=build_tools,
+            max_depth=max_depth,
+            index=index,
+            cache=cache,
+            max_workers=max_workers,
+            include_inactive=include_inactive,
+            profiler=profiler,
+        )
+        cls._display(
+            reports,
+            display_format,
+            max_depth,
+            stream,
+            profiler,
+            tree,
+            fingerprint,
+            display_all=True,
+        )
+
+    @classmethod
+    def _display(
+        cls,
+        reports: List[DependencyReport],
+        display_format: DisplayFormat,
+        max_depth: int,
+        stream: Optional[TextIO],
+        profiler: Optional[Profiler],
+        tree: bool,
+        fingerprint: bool,
+        display_all: bool = False,
+    ) -> None:
+        """Display one or all reports and time the traversal and formatting."""
+        service = DisplayServiceRegistry.display_service(display_format=display_format)
+        if profiler is not None:
+            with profiler.phase("traversal"):
+                # Reports cache their traversal, such that formatting is timed alone.
+                for report in reports:
+                    deque(report.iter_requirements(max_depth=max_depth), maxlen=0)
+        with nullcontext() if profiler is None else profiler.phase("formatting"):
+            if display_all:
+                service.display_all(
+                    reports=reports,
+                    max_depth=max_depth,
+                    stream=stream,
+                    tree=tree,
+                    fingerprint=fingerprint,
+                )
+            else:
+                service.display(
+                    report=reports[0],
+                    max_depth=max_depth,
+                    stream=stream,
+                    tree=tree,
+                    fingerprint=fingerprint,
+                )
+
+    @classmethod
+    async def arun(
+        cls,
+        package_name: str,
+        display_format: DisplayFormat = DisplayFormat.Simple,
+        build_tools: Iterable[str] = DEFAULT_BUILD_TOOLS,
+        max_depth: int = 1,
+        cache: Optional[AbstractMetadataCache] = None,
+        include_inactive: bool = False,
+        stream: Optional[TextIO] = None,
+        index: Optional[EnvironmentIndex] = None,
+        executor: Optional[Executor] = None,
+        timeout: Optional[float] = None,
+        tree: bool = False,
+        fingerprint: bool = False,
+    ) -> None:
+        """
+        Display the given package's dependencies without blocking the event loop.
+
+        Args:
+            package_name: The package name for which to generate dependency information.
+            display_format: One of the supported display formats.
+            build_tools: A list of build packages to include.
+            max_depth: The maximum desired depth of requirements nesting.
+            cache: An optional cache of previously read distribution metadata.
+            include_inactive: Whether to follow requirements whose environment
+                markers do not apply to the running interpreter.
+            stream: The text stream to write to (default `sys.stdout`).
+            index: An index of the installed distributions. If none is given, the
+                current environment is scanned.
+            executor: The executor that reads metadata (default the event loop's).
+            timeout: If given, the number of seconds after which creating the report
+                is cancelled and `asyncio.TimeoutError` is raised.
+            tree: Whether to display the nested structure of the dependencies, if
+                supported by the display format (default false).
+            fingerprint: Whether to include the environment's fingerprint, if
+                supported by the display format (default false).
+
+        """
+        import asyncio
+
+        report = await asyncio.wait_for(
+            DependencyReport.afrom_root(
+                root=package_name,
+                build_tools=build_tools,
+                max_depth=max_depth,
+                index=index,
+                cache=cache,
+                include_inactive=include_inactive,
+                executor=executor,
+            ),
+            timeout=timeout,
         )
         DisplayServiceRegistry.display_service(display_format=display_format).display(
-            report=report, max_depth=max_depth
+            report=report,
+            max_depth=max_depth,
+            stream=stream,
+            tree=tree,
+            fingerprint=fingerprint,
+        )
+
+    @classmethod
+    async def arun_all(
+        cls,
+        display_format: DisplayFormat = DisplayFormat.Simple,
+        build_tools: Iterable[str] = DEFAULT_BUILD_TOOLS,
+        max_depth: int = 1,
+        cache: Optional[AbstractMetadataCache] = None,
+        include_inactive: bool = False,
+        stream: Optional[TextIO] = None,
+        index: Optional[EnvironmentIndex] = None,
+        executor: Optional[Executor] = None,
+        timeout: Optional[float] = None,
+        tree: bool = False,
+        fingerprint: bool = False,
+    ) -> None:
+        """
+        Display the dependencies of every installed package without blocking.
+
+        Args:
+            display_format: One of the supported display formats.
+            build_tools: A list of build packages to include.
+            max_depth: The maximum desired depth of requirements nesting.
+            cache: An optional cache of previously read distribution metadata.
+            include_inactive: Whether to follow requirements whose environment
+                markers do not apply to the running interpreter.
+            stream: The text stream to write to (default `sys.stdout`).
+            index: An index of the installed distributions. If none is given, the
+                current environment is scanned.
+            executor: The executor that reads metadata (default the event loop's).
+            timeout: If given, the number of seconds after which creating the reports
+                is cancelled and `asyncio.TimeoutError` is raised.
+            tree: Whether to display the nested structure of the dependencies, if
+                supported by the display format (default false).
+            fingerprint: Whether to include the environment's fingerprint, if
+                supported by the display format (default false).
+
+        """
+        import asyncio
+
+        reports = await asyncio.wait_for(
+            DependencyReport.afrom_environment(
+                build_tools=build_tools,
+                max_depth=max_depth,
+                index=index,
+                cache=cache,
+                include_inactive=include_inactive,
+                executor=executor,
+            ),
+            timeout=timeout,
+        )
+        DisplayServiceRegistry.display_service(
+            display_format=display_format
+        ).display_all(
+            reports=reports,
+            max_depth=max_depth,
+            stream=stream,
+            tree=tree,
+            fingerprint=fingerprint,
+        )
+
+    @classmethod
+    def run_environments(
+        cls,
+        prefixes: Sequence[Path],
+        package_name: Optional[str] = None,
+        build_tools: Iterable[str] = DEFAULT_BUILD_TOOLS,
+        max_depth: int = 1,
+        include_inactive: bool = False,
+        max_processes: Optional[int] = None,
+        stream: Optional[TextIO] = None,
+    ) -> List[Tuple[Path, Exception]]:
+        """
+        Display the dependencies in many other environments as JSON.
+
+        Each environment is scanned directly by a process of a pool, without running
+        its interpreter. The reports of all environments are written as one stream of
+        newline-delimited JSON in the order of the prefixes. Every report includes
+        the prefix of its environment.
+
+        Args:
+            prefixes: The root directories of the environments, for example, those of
+                virtual environments.
+            package_name: The package name for which to generate dependency
+                information (default every installed package).
+            build_tools: A list of build packages to include.
+            max_depth: The maximum desired depth of requirements nesting.
+            include_inactive: Whether to follow requirements whose environment
+                markers do not apply to an environment.
+            max_processes: The number of processes (default the number of CPUs).
+            stream: The text stream to write to (default `sys.stdout`).
+
+        Returns:
+            The prefixes of those environments that could not be reported on, each
+            with its error, for example, a `MissingSitePackagesError`. The other
+            environments are reported on regardless.
+
+        """
+        # Importing the process pool is comparatively slow and only needed here.
+        from concurrent.futures import ProcessPoolExecutor
+
+        if stream is None:
+            stream = sys.stdout
+        failures: List[Tuple[Path, Exception]] = []
+        with ProcessPoolExecutor(max_workers=max_processes) as executor:
+            futures = [
+                executor.submit(
+                    _display_environment,
+                    prefix=prefix,
+                    package_name=package_name,
+                    build_tools=tuple(build_tools),
+                    max_depth=max_depth,
+                    include_inactive=include_inactive,
+                )
+                for prefix in prefixes
+            ]
+            for prefix, future in zip(prefixes, futures):
+                try:
+                    stream.write(future.result())
+                except Exception as error:
+                    # A single broken environment must not abort the whole batch.
+                    failures.append((prefix, error))
+        return failures
+
+
+def _display_environment(
+    prefix: Path,
+    package_name: Optional[str],
+    build_tools: Tuple[str, ...],
+    max_depth: int,
+    include_inactive: bool,
+) -> str:
+    """Return the reports of another environment as newline-delimited JSON."""
+    index = EnvironmentIndex.from_prefix(prefix)
+    if package_name is None:
+        reports = DependencyReport.from_environment(
+            build_tools=build_tools,
+            max_depth=max_depth,
+            index=index,
+            include_inactive=include_inactive,
         )
+    else:
+        reports = [
+            DependencyReport.from_root(
+                root=package_name,
+                build_tools=build_tools,
+                max_depth=max_depth,
+                index=index,
+                include_inactive=include_inactive,
+            )
+        ]
+    stream = StringIO()
+    DisplayServiceRegistry.display_service(
+        display_format=DisplayFormat.Json
+    ).display_all(
+        reports=reports, max_depth=max_depth, stream=stream, environment=str(prefix)
+    )
+    return stream.getvalue()
@@ -33,5 +33,6 @@ class DisplayFormat(AutoNameEnum):
 
     Simple = auto()
     Markdown = auto()
+    Json = auto()
     Rich = auto()
     Textual = auto()
@@ -38,5 +38,17 @@ class DisplayServiceRegistry:
             from depinfo.infrastructure.application import MarkdownTableDisplayService
 
             return MarkdownTableDisplayService
+        elif display_format is DisplayFormat.Json:
+            from depinfo.infrastructure.application import JsonDisplayService
+
+            return JsonDisplayService
+        elif display_format is DisplayFormat.Rich:
+            from depinfo.infrastructure.application import RichDisplayService
+
+            return RichDisplayService
+        elif display_format is DisplayFormat.Textual:
+            from depinfo.infrastructure.application import TextualDisplayService
+
+            return TextualDisplayService
         else:
             raise ValueError(f"Unknown display format {display_format}.")
@@ -16,7 +16,52 @@
 """Provide domain models."""
 
 
-from .platform import Platform
-from .python import Python
-from .package import Package
-from .dependency_report import DependencyReport
+from typing import TYPE_CHECKING
+
+from depinfo._lazy import attach
+
+
+if TYPE_CHECKING:
+    from .platform import Platform
+    from .python import Python
+    from .distribution_metadata import DistributionMetadata
+    from .abstract_metadata_cache import AbstractMetadataCache
+    from .profiler import Profiler
+    from .zip_archive import ZipArchive
+    from .metadata_reader import MetadataReader
+    from .version import Version
+    from .marker import Marker
+    from .requirement import Requirement
+    from .missing_site_packages_error import MissingSitePackagesError
+    from .environment_index import EnvironmentIndex
+    from .environment_fingerprint import EnvironmentFingerprint
+    from .package import Package
+    from .package_graph import PackageGraph
+    from .dependency_report import DependencyReport
+    from .version_matrix import VersionMatrix
+    from .report_diff import ReportDiff
+
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "Platform": ".platform",
+        "Python": ".python",
+        "DistributionMetadata": ".distribution_metadata",
+        "AbstractMetadataCache": ".abstract_metadata_cache",
+        "Profiler": ".profiler",
+        "ZipArchive": ".zip_archive",
+        "MetadataReader": ".metadata_reader",
+        "Version": ".version",
+        "Marker": ".marker",
+        "Requirement": ".requirement",
+        "MissingSitePackagesError": ".missing_site_packages_error",
+        "EnvironmentIndex": ".environment_index",
+        "EnvironmentFingerprint": ".environment_fingerprint",
+        "Package": ".package",
+        "PackageGraph": ".package_graph",
+        "DependencyReport": ".dependency_report",
+        "VersionMatrix": ".version_matrix",
+        "ReportDiff": ".report_diff",
+    },
+)
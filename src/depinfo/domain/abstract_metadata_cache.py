@@ -0,0 +1,60 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide an abstract base class for distribution metadata caches."""
+
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+
+from .distribution_metadata import DistributionMetadata
+
+
+class AbstractMetadataCache(ABC):
+    """
+    Define an abstract base class for distribution metadata caches.
+
+    Caches are keyed by a distribution's metadata location. Implementations are
+    responsible for detecting when a cached entry no longer matches the location's
+    content and must then treat it as missing.
+
+    """
+
+    @abstractmethod
+    def get(self, location: Path) -> Optional[DistributionMetadata]:
+        """
+        Return the cached metadata for a location if it is still valid.
+
+        Args:
+            location: The location of a distribution's `.dist-info` or `.egg-info`
+                metadata.
+
+        Returns:
+            The cached metadata or `None` if there is no valid entry.
+
+        """
+
+    @abstractmethod
+    def set(self, location: Path, metadata: DistributionMetadata) -> None:
+        """
+        Store the metadata read from a location.
+
+        Args:
+            location: The location of a distribution's `.dist-info` or `.egg-info`
+                metadata.
+            metadata: The metadata read from that location.
+
+        """
@@ -18,13 +18,23 @@
 
 from __future__ import annotations
 
-from collections import deque
-from dataclasses import dataclass
-from typing import Deque, Dict, Iterable, Iterator, List, Tuple
+from array import array
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from functools import partial
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+from .abstract_metadata_cache import AbstractMetadataCache
+from .environment_fingerprint import EnvironmentFingerprint
+from .environment_index import EnvironmentIndex
 from .package import Package
+from .package_graph import PackageGraph
 from .platform import Platform
+from .profiler import Profiler
 from .python import Python
+from .requirement import Requirement
 
 
 @dataclass(frozen=True)
@@ -42,6 +52,14 @@ class DependencyReport:
         build_tools: A list of package instances which are considered build tools rather
             than direct dependencies.
         packages: A map from package names to instances.
+        graph: A compact representation of the packages and their requirements that
+            is used for traversals. It is built from the packages unless given.
+        index: The index of the environment that the report was created from, if
+            known. It is set by the factory methods and provides the environment's
+            fingerprint.
+        order: The identifiers of the root's nested requirements in breadth-first
+            order, each at its minimum depth. It is computed on first use.
+        level_ends: The end of each depth level in `order`.
 
     """
 
@@ -50,6 +68,22 @@ class DependencyReport:
     python: Python
     build_tools: List[Package]
     packages: Dict[str, Package]
+    graph: Optional[PackageGraph] = field(default=None, repr=False, compare=False)
+    index: Optional[EnvironmentIndex] = field(default=None, repr=False, compare=False)
+    order: Optional[array] = field(default=None, init=False, repr=False, compare=False)
+    level_ends: Optional[List[int]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        """Build the package graph unless it was provided."""
+        if self.graph is None:
+            object.__setattr__(self, "graph", PackageGraph.from_packages(self.packages))
+
+    @property
+    def fingerprint(self) -> Optional[EnvironmentFingerprint]:
+        """Return the fingerprint of the report's environment if it is known."""
+        return None if self.index is None else self.index.fingerprint()
 
     @classmethod
     def from_root(
@@ -57,6 +91,11 @@ class DependencyReport:
         root: str,
         build_tools: Iterable[str],
         max_depth: int = 1,
+        index: Optional[EnvironmentIndex] = None,
+        cache: Optional[AbstractMetadataCache] = None,
+        max_workers: Optional[int] = None,
+        include_inactive: bool = False,
+        profiler: Optional[Profiler] = None,
     ) -> DependencyReport:
         """
         Return a package instance potentially with its requirements.
@@ -68,39 +107,502 @@ class DependencyReport:
             root: The distribution name of the root package.
             build_tools: A list of build packages to include.
             max_depth: The maximum desired depth of requirements nesting.
+            index: An index of the installed distributions. If none is given, the
+                current environment is scanned once for all packages.
+            cache: An optional cache of previously read distribution metadata.
+            max_workers: If given, load the metadata of all packages at the same
+                level of requirements nesting concurrently using this many threads.
+                This mostly pays off on slow, for example, network file systems.
+            include_inactive: Whether to follow requirements whose environment
+                markers do not apply to the running interpreter.
+            profiler: An optional profiler that records the time spent on each
+                phase and on each package lookup.
+
+        Returns:
+            A dependency report instance with potentially nested requirements.
+
+        """
+        return cls.from_roots(
+            roots=[root],
+            build_tools=build_tools,
+            max_depth=max_depth,
+            index=index,
+            cache=cache,
+            max_workers=max_workers,
+            include_inactive=include_inactive,
+            profiler=profiler,
+        )[0]
+
+    @classmethod
+    def from_roots(
+        cls,
+        roots: Iterable[str],
+        build_tools: Iterable[str],
+        max_depth: int = 1,
+        index: Optional[EnvironmentIndex] = None,
+        cache: Optional[AbstractMetadataCache] = None,
+        max_workers: Optional[int] = None,
+        include_inactive: bool = False,
+        profiler: Optional[Profiler] = None,
+    ) -> List[DependencyReport]:
+        """
+        Return dependency reports for multiple root packages.
+
+        All packages are loaded once, in a single traversal that starts from all roots
+        at the same time. The returned reports share their packages, build tools,
+        platform, and Python information.
+
+        Args:
+            roots: The distribution names of the root packages.
+            build_tools: A list of build packages to include.
+            max_depth: The maximum desired depth of requirements nesting.
+            index: An index of the installed distributions. If none is given, the
+                current environment is scanned once for all packages.
+            cache: An optional cache of previously read distribution metadata.
+            max_workers: If given, load the metadata of all packages at the same
+                level of requirements nesting concurrently using this many threads.
+            include_inactive: Whether to follow requirements whose environment
+                markers do not apply to the running interpreter.
+            profiler: An optional profiler that records the time spent on each
+                phase and on each package lookup.
+
+        Returns:
+            One dependency report per root package, in the given order.
+
+        """
+        # Without a profiler, phases are not timed.
+        phase = nullcontext if profiler is None else profiler.phase
+        if index is None:
+            with phase("discovery"):
+                index = EnvironmentIndex.create()
+        roots, requested = cls._parse_roots(roots)
+        build_tools = [EnvironmentIndex.normalize_name(name) for name in build_tools]
+        with phase("loading"):
+            packages = cls._load_levels(
+                roots,
+                requested,
+                build_tools,
+                max_depth,
+                index,
+                cache,
+                include_inactive,
+                max_workers,
+                profiler,
+            )
+        with phase("graph"):
+            return cls._create_reports(roots, build_tools, packages, index)
+
+    @classmethod
+    async def afrom_root(
+        cls,
+        root: str,
+        build_tools: Iterable[str],
+        max_depth: int = 1,
+        index: Optional[EnvironmentIndex] = None,
+        cache: Optional[AbstractMetadataCache] = None,
+        include_inactive: bool = False,
+        executor: Optional[Executor] = None,
+    ) -> DependencyReport:
+        """
+        Return a dependency report without blocking the running event loop.
+
+        This is the asynchronous counterpart of `from_root`. See `afrom_roots` for
+        details.
+
+        Args:
+            root: The distribution name of the root package.
+            build_tools: A list of build packages to include.
+            max_depth: The maximum desired depth of requirements nesting.
+            index: An index of the installed distributions. If none is given, the
+                current environment is scanned once for all packages.
+            cache: An optional cache of previously read distribution metadata.
+            include_inactive: Whether to follow requirements whose environment
+                markers do not apply to the running interpreter.
+            executor: The executor that reads metadata (default the event loop's).
 
         Returns:
             A dependency report instance with potentially nested requirements.
 
         """
-        discovered = deque([(0, root)])
+        reports = await cls.afrom_roots(
+            roots=[root],
+            build_tools=build_tools,
+            max_depth=max_depth,
+            index=index,
+            cache=cache,
+            include_inactive=include_inactive,
+            executor=executor,
+        )
+        return reports[0]
+
+    @classmethod
+    async def afrom_roots(
+        cls,
+        roots: Iterable[str],
+        build_tools: Iterable[str],
+        max_depth: int = 1,
+        index: Optional[EnvironmentIndex] = None,
+        cache: Optional[AbstractMetadataCache] = None,
+        include_inactive: bool = False,
+        executor: Optional[Executor] = None,
+    ) -> List[DependencyReport]:
+        """
+        Return dependency reports for multiple roots without blocking the event loop.
+
+        This is the asynchronous counterpart of `from_roots` and returns the same
+        reports. All file system access is offloaded to an executor. The packages of
+        a level of requirements nesting are looked up concurrently and the build tools
+        are looked up while the requirements are traversed.
+
+        The coroutine can be cancelled, for example, by `asyncio.wait_for` when a
+        timeout expires. Lookups that have not started by then are dropped.
+
+        Args:
+            roots: The distribution names of the root packages.
+            build_tools: A list of build packages to include.
+            max_depth: The maximum desired depth of requirements nesting.
+            index: An index of the installed distributions. If none is given, the
+                current environment is scanned once for all packages.
+            cache: An optional cache of previously read distribution metadata.
+            include_inactive: Whether to follow requirements whose environment
+                markers do not apply to the running interpreter.
+            executor: The executor that reads metadata (default the event loop's).
+
+        Returns:
+            One dependency report per root package, in the given order.
+
+        """
+        # Importing `asyncio` is comparatively slow and synchronous reports do not
+        # need it.
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        if index is None:
+            index = await loop.run_in_executor(executor, EnvironmentIndex.create)
+        roots, requested = cls._parse_roots(roots)
+        build_tools = [EnvironmentIndex.normalize_name(name) for name in build_tools]
+        load = partial(
+            Package.from_name,
+            index=index,
+            cache=cache,
+            include_inactive=include_inactive,
+        )
+        lookups: Dict[str, asyncio.Future] = {}
+
+        async def gather(names: List[str]) -> List[Package]:
+            """Look up packages by name, each at most once, and in order."""
+            for name in names:
+                if name not in lookups:
+                    lookups[name] = loop.run_in_executor(executor, load, name)
+            return list(await asyncio.gather(*(lookups[name] for name in names)))
+
         packages: Dict[str, Package] = {}
-        while len(discovered) > 0:
-            level, name = discovered.popleft()
-            if name in packages:
-                continue
-            packages[name] = pkg = Package.from_name(name)
-            if level < max_depth:
-                discovered.extend(((level + 1, req) for req in pkg.requirements))
-        tools: List[Package] = []
-        for name in build_tools:
-            if name in packages:
-                tools.append(packages[name])
+        try:
+            for name in build_tools:
+                lookups[name] = loop.run_in_executor(executor, load, name)
+            level = 0
+            frontier = roots
+            while len(frontier) > 0:
+                names = [
+                    name for name in dict.fromkeys(frontier) if name not in packages
+                ]
+                loaded = await gather(names)
+                packages.update(zip(names, loaded))
+                frontier = cls._expand(loaded, packages, requested)
+                if level >= max_depth:
+                    break
+                level += 1
+            names = [
+                name for name in dict.fromkeys(build_tools) if name not in packages
+            ]
+            packages.update(zip(names, await gather(names)))
+        finally:
+            for lookup in lookups.values():
+                lookup.cancel()
+        cls._add_extra_requirements(packages, requested)
+        return cls._create_reports(roots, build_tools, packages, index)
+
+    @classmethod
+    def _create_reports(
+        cls,
+        roots: List[str],
+        build_tools: List[str],
+        packages: Dict[str, Package],
+        index: EnvironmentIndex,
+    ) -> List[DependencyReport]:
+        """Return reports for the given roots that share all loaded packages."""
+        tools: List[Package] = [packages[name] for name in build_tools]
+        graph = PackageGraph.from_packages(packages)
+        platform = Platform.create()
+        python = Python.create(index.marker_environment)
+        return [
+            cls(
+                root=packages[name],
+                build_tools=tools,
+                packages=packages,
+                platform=platform,
+                python=python,
+                graph=graph,
+                index=index,
+            )
+            for name in roots
+        ]
+
+    @classmethod
+    def from_environment(
+        cls,
+        build_tools: Iterable[str],
+        max_depth: int = 1,
+        index: Optional[EnvironmentIndex] = None,
+        cache: Optional[AbstractMetadataCache] = None,
+        max_workers: Optional[int] = None,
+        include_inactive: bool = False,
+        profiler: Optional[Profiler] = None,
+    ) -> List[DependencyReport]:
+        """
+        Return dependency reports for every distribution installed in an environment.
+
+        Args:
+            build_tools: A list of build packages to include.
+            max_depth: The maximum desired depth of requirements nesting.
+            index: An index of the installed distributions. If none is given, the
+                current environment is scanned.
+            cache: An optional cache of previously read distribution metadata.
+            max_workers: If given, load the metadata of all packages at the same
+                level of requirements nesting concurrently using this many threads.
+            include_inactive: Whether to follow requirements whose environment
+                markers do not apply to the running interpreter.
+            profiler: An optional profiler that records the time spent on each
+                phase and on each package lookup.
+
+        Returns:
+            One dependency report per installed distribution, sorted by name.
+
+        """
+        phase = nullcontext if profiler is None else profiler.phase
+        if index is None:
+            with phase("discovery"):
+                index = EnvironmentIndex.create()
+        return cls.from_roots(
+            roots=sorted(index.locations),
+            build_tools=build_tools,
+            max_depth=max_depth,
+            index=index,
+            cache=cache,
+            max_workers=max_workers,
+            include_inactive=include_inactive,
+            profiler=profiler,
+        )
+
+    @classmethod
+    async def afrom_environment(
+        cls,
+        build_tools: Iterable[str],
+        max_depth: int = 1,
+        index: Optional[EnvironmentIndex] = None,
+        cache: Optional[AbstractMetadataCache] = None,
+        include_inactive: bool = False,
+        executor: Optional[Executor] = None,
+    ) -> List[DependencyReport]:
+        """
+        Return reports for every distribution without blocking the event loop.
+
+        This is the asynchronous counterpart of `from_environment`. See `afrom_roots`
+        for details.
+
+        Args:
+            build_tools: A list of build packages to include.
+            max_depth: The maximum desired depth of requirements nesting.
+            index: An index of the installed distributions. If none is given, the
+                current environment is scanned.
+            cache: An optional cache of previously read distribution metadata.
+            include_inactive: Whether to follow requirements whose environment
+                markers do not apply to the running interpreter.
+            executor: The executor that reads metadata (default the event loop's).
+
+        Returns:
+            One dependency report per installed distribution, sorted by name.
+
+        """
+        import asyncio
+
+        if index is None:
+            index = await asyncio.get_running_loop().run_in_executor(
+                executor, EnvironmentIndex.create
+            )
+        return await cls.afrom_roots(
+            roots=sorted(index.locations),
+            build_tools=build_tools,
+            max_depth=max_depth,
+            index=index,
+            cache=cache,
+            include_inactive=include_inactive,
+            executor=executor,
+        )
+
+    @classmethod
+    def _load_levels(
+        cls,
+        roots: List[str],
+        requested: Dict[str, Dict[str, None]],
+        build_tools: List[str],
+        max_depth: int,
+        index: EnvironmentIndex,
+        cache: Optional[AbstractMetadataCache],
+        include_inactive: bool,
+        max_workers: Optional[int],
+        profiler: Optional[Profiler],
+    ) -> Dict[str, Package]:
+        """Load the roots' nested requirements and the build tools by name."""
+        packages: Dict[str, Package] = {}
+        executor = (
+            None if max_workers is None else ThreadPoolExecutor(max_workers=max_workers)
+        )
+        try:
+            # We visit the requirements one level at a time such that all packages of a
+            # level can be loaded concurrently. Within a level, the order of discovery
+            # is maintained, which yields the same result as a sequential traversal.
+            level = 0
+            frontier = roots
+            while len(frontier) > 0:
+                names = [
+                    name for name in dict.fromkeys(frontier) if name not in packages
+                ]
+                loaded = cls._load_packages(
+                    names, index, cache, include_inactive, executor, profiler
+                )
+                packages.update(zip(names, loaded))
+                frontier = cls._expand(loaded, packages, requested)
+                if level >= max_depth:
+                    break
+                level += 1
+            names = [
+                name for name in dict.fromkeys(build_tools) if name not in packages
+            ]
+            packages.update(
+                zip(
+                    names,
+                    cls._load_packages(
+                        names, index, cache, include_inactive, executor, profiler
+                    ),
+                )
+            )
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        cls._add_extra_requirements(packages, requested)
+        return packages
+
+    @classmethod
+    def _parse_roots(
+        cls, roots: Iterable[str]
+    ) -> Tuple[List[str], Dict[str, Dict[str, None]]]:
+        """Return the normalized names of the roots and the extras they request."""
+        names: List[str] = []
+        requested: Dict[str, Dict[str, None]] = {}
+        for root in roots:
+            try:
+                requirement = Requirement.parse(root)
+            except ValueError:
+                names.append(EnvironmentIndex.normalize_name(root))
                 continue
-            packages[name] = pkg = Package.from_name(name)
-            tools.append(pkg)
-        return cls(
-            root=packages[root],
-            build_tools=tools,
-            packages=packages,
-            platform=Platform.create(),
-            python=Python.create(),
+            name = EnvironmentIndex.normalize_name(requirement.name)
+            names.append(name)
+            if requirement.extras:
+                requested.setdefault(name, {}).update(
+                    (EnvironmentIndex.normalize_name(extra), None)
+                    for extra in requirement.extras
+                )
+        return names, requested
+
+    @classmethod
+    def _expand(
+        cls,
+        loaded: List[Package],
+        packages: Dict[str, Package],
+        requested: Dict[str, Dict[str, None]],
+    ) -> List[str]:
+        """
+        Return the requirements of newly loaded packages and record requested extras.
+
+        Extras that are requested of a package anywhere are combined, like an
+        installer does. If a package was loaded before, the requirements of its newly
+        requested extras are returned, too.
+
+        """
+        frontier: List[str] = []
+        # Package names may keep dots and capitals whereas requests are keyed by PEP
+        # 503 normalized names.
+        pending = [
+            (
+                pkg,
+                tuple(requested.get(EnvironmentIndex.normalize_name(pkg.name), ())),
+                True,
+            )
+            for pkg in loaded
+        ]
+        for pkg, extras, include_base in pending:
+            # Packages that are pending only for newly requested extras have had
+            # their base requirements followed already.
+            edges = (
+                pkg.iter_edges(extras)
+                if include_base
+                else (
+                    edge
+                    for extra in extras
+                    for edge in pkg.extra_requirements.get(extra, {}).items()
+                )
+            )
+            for name, edge_extras in edges:
+                frontier.append(name)
+                target = requested.setdefault(name, {})
+                new = tuple(extra for extra in edge_extras if extra not in target)
+                if new:
+                    target.update(dict.fromkeys(new))
+                    if name in packages:
+                        pending.append((packages[name], new, False))
+        return frontier
+
+    @classmethod
+    def _add_extra_requirements(
+        cls, packages: Dict[str, Package], requested: Dict[str, Dict[str, None]]
+    ) -> None:
+        """Replace packages by copies that include their requested extras."""
+        for name, extras in requested.items():
+            if extras and name in packages:
+                packages[name] = packages[name].with_extras(extras)
+
+    @classmethod
+    def _load_packages(
+        cls,
+        names: List[str],
+        index: EnvironmentIndex,
+        cache: Optional[AbstractMetadataCache],
+        include_inactive: bool,
+        executor: Optional[Executor],
+        profiler: Optional[Profiler] = None,
+    ) -> List[Package]:
+        """Load packages by name, in order, and possibly concurrently."""
+        load = partial(
+            Package.from_name,
+            index=index,
+            cache=cache,
+            include_inactive=include_inactive,
+            profiler=profiler,
         )
+        if executor is None or len(names) < 2:
+            return [load(name) for name in names]
+        return list(executor.map(load, names))
 
     def iter_requirements(self, max_depth: int = 1) -> Iterator[Tuple[int, Package]]:
         """
         Iterate over the root package's nested requirements up to a maximum depth.
 
+        Every package is visited once, at the minimum depth at which it is
+        required, even if it is reachable along several paths. The breadth-first
+        order of all reachable packages is computed once and cached, such that
+        any query takes time linear in the number of packages yielded.
+
         Args:
             max_depth: The maximum desired depth of requirements nesting to iterate
                 over.
@@ -109,18 +611,47 @@ class DependencyReport:
             Dependency nesting level, package pairs.
 
         """
-        discovered: Deque[Tuple[int, Package]] = deque()
-        if max_depth > 0:
-            discovered.extend(
-                ((1, self.packages[req]) for req in self.root.requirements)
-            )
-        while len(discovered) > 0:
-            level, pkg = discovered.popleft()
-            if level < max_depth:
-                discovered.extend(
-                    ((level + 1, self.packages[req]) for req in pkg.requirements)
-                )
-            yield level, pkg
+        order, level_ends = self._breadth_first_order()
+        assert self.graph is not None  # noqa: S101
+        packages = self.graph.packages
+        start = 0
+        for level, end in enumerate(level_ends[:max_depth], start=1):
+            for node in order[start:end]:
+                yield level, packages[node]
+            start = end
+
+    def root_id(self) -> Optional[int]:
+        """Return the root package's identifier in the graph if it is part of it."""
+        # Package names may keep dots and capitals whereas the graph is keyed by PEP
+        # 503 normalized names.
+        assert self.graph is not None  # noqa: S101
+        return self.graph.node_id(EnvironmentIndex.normalize_name(self.root.name))
+
+    def _breadth_first_order(self) -> Tuple[array, List[int]]:
+        """Return the cached breadth-first order of all nested requirements."""
+        if self.order is not None and self.level_ends is not None:
+            return self.order, self.level_ends
+        graph = self.graph
+        assert graph is not None  # noqa: S101
+        order = array("L", graph.lookup(dict.fromkeys(self.root.requirements)))
+        # The root package itself is only listed if it is part of a cycle.
+        visited = bytearray(len(graph))
+        for node in order:
+            visited[node] = 1
+        level_ends: List[int] = []
+        start = 0
+        while start < len(order):
+            end = len(order)
+            level_ends.append(end)
+            for node in order[start:end]:
+                for succ in graph.successors(node):
+                    if not visited[succ]:
+                        visited[succ] = 1
+                        order.append(succ)
+            start = end
+        object.__setattr__(self, "order", order)
+        object.__setattr__(self, "level_ends", level_ends)
+        return order, level_ends
 
     def iter_unique_requirements(
         self, missing_version: str = "missing", max_depth: int = 1
@@ -136,9 +667,109 @@ class DependencyReport:
             Package name, version pairs.
 
         """
-        seen = set()
         for _, pkg in self.iter_requirements(max_depth=max_depth):
-            if pkg.name in seen:
-                continue
             yield pkg.name, missing_version if pkg.version is None else pkg.version
-            seen.add(pkg.name)
+
+    def iter_tree(
+        self, max_depth: int = 1
+    ) -> Iterator[Tuple[int, Package, bool, bool]]:
+        """
+        Iterate over the root package's requirements as a tree in depth-first order.
+
+        Each package's requirements are expanded only once, where the package occurs
+        first at its minimum depth. Any other occurrence that could be expanded
+        refers to that subtree instead. The tree thus contains every package up to
+        the maximum depth and grows with the number of distinct packages and
+        requirements rather than the number of paths.
+
+        Args:
+            max_depth: The maximum desired depth of requirements nesting to iterate
+                over.
+
+        Yields:
+            Dependency nesting level, package, whether the package is the last
+            requirement of its parent, and whether its requirements are expanded
+            elsewhere.
+
+        """
+        if max_depth < 1:
+            return
+        graph = self.graph
+        assert graph is not None  # noqa: S101
+        order, level_ends = self._breadth_first_order()
+        min_depths = [0] * len(graph)
+        start = 0
+        for level, end in enumerate(level_ends, start=1):
+            for node in order[start:end]:
+                min_depths[node] = level
+            start = end
+        expanded = bytearray(len(graph))
+        root = self.root_id()
+        if root is not None:
+            # The root is expanded at depth zero such that cycles refer back to it.
+            min_depths[root] = 0
+            expanded[root] = 1
+        # Each frame holds the children of an expanded node and the position of the
+        # next child.
+        stack: List[list] = [[graph.lookup(dict.fromkeys(self.root.requirements)), 0]]
+        while stack:
+            frame = stack[-1]
+            children, position = frame
+            if position == len(children):
+                stack.pop()
+                continue
+            frame[1] += 1
+            node = children[position]
+            depth = len(stack)
+            successors = graph.successors(node)
+            expand = is_reference = False
+            if successors and depth < max_depth:
+                if depth == min_depths[node] and not expanded[node]:
+                    expanded[node] = 1
+                    expand = True
+                else:
+                    is_reference = True
+            is_last = position == len(children) - 1
+            yield depth, graph.packages[node], is_last, is_reference
+            if expand:
+                stack.append([successors, 0])
+
+    def cycles(self, max_depth: int = 1) -> List[List[Package]]:
+        """
+        Return the groups of displayed packages that require each other.
+
+        Only the requirements that are displayed up to the maximum depth are
+        considered, that is, those of the root package and of packages at a smaller
+        depth. Cycles are found by condensing this part of the package graph into its
+        strongly connected components, in time linear in the number of packages and
+        requirements.
+
+        Args:
+            max_depth: The maximum desired depth of requirements nesting.
+
+        Returns:
+            Each cycle's packages sorted by name. The cycles are sorted by their
+            first package's name.
+
+        """
+        if max_depth < 1:
+            return []
+        order, level_ends = self._breadth_first_order()
+        graph = self.graph
+        assert graph is not None  # noqa: S101
+        # Packages at the maximum depth are listed but their requirements are not.
+        expanded_levels = min(max_depth - 1, len(level_ends))
+        within = bytearray(len(graph))
+        for node in order[: level_ends[expanded_levels - 1] if expanded_levels else 0]:
+            within[node] = 1
+        root = self.root_id()
+        if root is not None:
+            within[root] = 1
+        packages = graph.packages
+        return sorted(
+            (
+                sorted((packages[node] for node in component), key=attrgetter("name"))
+                for component in graph.cycles(within)
+            ),
+            key=lambda cycle: cycle[0].name,
+        )
@@ -0,0 +1,61 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a description of a distribution's core metadata."""
+
+
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING, List, NamedTuple, Optional
+
+
+if TYPE_CHECKING:
+    if sys.version_info < (3, 8):
+        from importlib_metadata import Distribution
+    else:
+        from importlib.metadata import Distribution
+
+
+class DistributionMetadata(NamedTuple):
+    """
+    Define the subset of a distribution's core metadata that is relevant to us.
+
+    Attributes:
+        name: The distribution name as recorded in its metadata.
+        version: The distribution version.
+        requires: The distribution's requirements as described in PEP 508
+            (https://peps.python.org/pep-0508/).
+
+    """
+
+    name: Optional[str]
+    version: Optional[str]
+    requires: List[str]
+
+    @classmethod
+    def from_distribution(cls, dist: Distribution) -> DistributionMetadata:
+        """Return a metadata instance extracted from an `importlib` distribution."""
+        # Every access to `dist.metadata` parses the metadata file again.
+        metadata = dist.metadata
+        requires = metadata.get_all("Requires-Dist")
+        if requires is None:
+            # Egg-info distributions instead record their requirements separately.
+            requires = dist.requires
+        return cls(
+            name=metadata["Name"],
+            version=metadata["Version"],
+            requires=[] if requires is None else list(requires),
+        )
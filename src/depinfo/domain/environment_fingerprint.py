@@ -0,0 +1,98 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a fingerprint of an environment that changes when it does."""
+
+
+from __future__ import annotations
+
+import os
+from typing import NamedTuple, Optional, Tuple
+
+from .environment_index import EnvironmentIndex
+from .platform import Platform
+from .python import Python
+
+
+class EnvironmentFingerprint(NamedTuple):
+    """
+    Define a fingerprint of an environment that changes when it does.
+
+    Installing, upgrading, or removing a distribution replaces its metadata
+    directory and thus changes its modification time. Comparing fingerprints is
+    therefore a cheap way to find out whether a previously created report is still
+    valid. Computing one only lists the search paths and stats each distribution's
+    metadata; nothing is read.
+
+    Attributes:
+        python: A `Python` information instance.
+        platform: A `Platform` information instance.
+        distributions: For each indexed distribution, sorted by name, its PEP 503
+            normalized name, the location of its metadata, and that location's
+            modification time (in nanoseconds) and size, or `-1` for both if it
+            could not be accessed.
+
+    """
+
+    python: Python
+    platform: Platform
+    distributions: Tuple[Tuple[str, str, int, int], ...]
+
+    @classmethod
+    def create(cls, index: Optional[EnvironmentIndex] = None) -> EnvironmentFingerprint:
+        """
+        Return the fingerprint of an indexed environment.
+
+        Args:
+            index: An index of the installed distributions. If none is given, the
+                current environment is scanned.
+
+        Returns:
+            An environment fingerprint instance.
+
+        """
+        if index is None:
+            index = EnvironmentIndex.create()
+        distributions = []
+        for name, location in sorted(index.locations.items()):
+            # Metadata within a zip archive changes only with the archive itself.
+            archive = index.archives.get(location)
+            try:
+                stat = os.stat(location if archive is None else archive.path)
+            except OSError:
+                distributions.append((name, str(location), -1, -1))
+            else:
+                distributions.append(
+                    (name, str(location), stat.st_mtime_ns, stat.st_size)
+                )
+        return cls(
+            python=Python.create(index.marker_environment),
+            platform=Platform.create(),
+            distributions=tuple(distributions),
+        )
+
+    @property
+    def digest(self) -> str:
+        """Return a hexadecimal SHA-256 digest that is suitable for storage."""
+        # Computing the digest is rarely needed, so we defer importing `hashlib`.
+        import hashlib
+
+        result = hashlib.sha256()
+        for field in (*self.python, *self.platform):
+            result.update(field.encode("utf-8"))
+            result.update(b"\0")
+        for name, location, mtime, size in self.distributions:
+            result.update(f"{name}\0{location}\0{mtime}\0{size}\n".encode("utf-8"))
+        return result.hexdigest()
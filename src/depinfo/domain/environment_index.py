@@ -0,0 +1,487 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide an index of the distributions installed in an environment."""
+
+
+from __future__ import annotations
+
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Pattern,
+    Tuple,
+)
+
+from .abstract_metadata_cache import AbstractMetadataCache
+from .distribution_metadata import DistributionMetadata
+from .metadata_reader import MetadataReader
+from .missing_site_packages_error import MissingSitePackagesError
+from .profiler import Profiler
+from .zip_archive import ZipArchive
+
+
+if TYPE_CHECKING:
+    from .environment_fingerprint import EnvironmentFingerprint
+
+    if sys.version_info < (3, 8):
+        from importlib_metadata import Distribution
+    else:
+        from importlib.metadata import Distribution
+
+
+@dataclass(frozen=True)
+class EnvironmentIndex:
+    """
+    Define an index of the distributions installed in an environment.
+
+    The index is built by scanning each search path exactly once and maps normalized
+    distribution names to their metadata directories. Like `importlib.metadata`, the
+    first distribution found on the search path takes precedence.
+
+    Attributes:
+        locations: A map from PEP 503 normalized distribution names to the location of
+            their `.dist-info` or `.egg-info` metadata.
+        exhaustive: Whether every search path entry could be scanned. If not, for
+            example, because an entry is a file but not a zip archive, lookups of
+            unknown names fall back to `importlib.metadata`.
+        stamps: A map from the scanned search paths to their modification times (in
+            nanoseconds) or `None` if they did not exist.
+        marker_environment: Values of environment marker variables that differ from
+            those of the running interpreter, for example, the Python version of
+            another virtual environment.
+        archives: A map from the metadata locations within zip archives to their
+            archive. Each archive is opened once and shared by all lookups.
+        environment_fingerprint: The fingerprint of the indexed environment. It is
+            computed on first use.
+
+    """
+
+    locations: Dict[str, Path]
+    exhaustive: bool = True
+    stamps: Dict[str, Optional[int]] = field(default_factory=dict)
+    marker_environment: Dict[str, str] = field(default_factory=dict)
+    archives: Dict[Path, ZipArchive] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    environment_fingerprint: Optional[EnvironmentFingerprint] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    _normalize_pattern: ClassVar[Pattern] = re.compile(r"[-_.]+")
+    _suffixes: ClassVar[Tuple[str, ...]] = (".dist-info", ".egg-info")
+    _python_directory_pattern: ClassVar[Pattern] = re.compile(
+        r"python(\d+\.\d+)t?", re.IGNORECASE
+    )
+
+    @classmethod
+    def create(
+        cls,
+        paths: Optional[Iterable[str]] = None,
+        marker_environment: Optional[Mapping[str, str]] = None,
+    ) -> EnvironmentIndex:
+        """
+        Return an index of the distributions found on the given search paths.
+
+        Args:
+            paths: The search paths to scan (default `sys.path`).
+            marker_environment: Values of environment marker variables that differ
+                from those of the running interpreter.
+
+        Returns:
+            An environment index instance.
+
+        """
+        locations: Dict[str, Path] = {}
+        exhaustive = True
+        stamps: Dict[str, Optional[int]] = {}
+        archives: Dict[Path, ZipArchive] = {}
+        opened: Dict[Path, ZipArchive] = {}
+        for entry in sys.path if paths is None else paths:
+            # An empty entry denotes the current working directory.
+            directory = entry or "."
+            stamps[entry] = cls._stamp(directory)
+            archive: Optional[ZipArchive] = None
+            if os.path.isdir(directory):
+                try:
+                    children = os.listdir(directory)
+                except OSError:
+                    exhaustive = False
+                    continue
+                has_egg_info = os.path.isdir(os.path.join(directory, "EGG-INFO"))
+            else:
+                try:
+                    found = cls._open_archive(Path(directory), opened)
+                except (OSError, ValueError):
+                    exhaustive = False
+                    continue
+                if found is None:
+                    continue
+                archive, inner = found
+                children = archive.children(inner)
+                has_egg_info = "EGG-INFO" in children
+            names: List[Tuple[str, str]] = []
+            if has_egg_info and directory.lower().endswith(".egg"):
+                names.append((os.path.basename(directory), "EGG-INFO"))
+            for child in children:
+                if child.lower().endswith(cls._suffixes):
+                    # Metadata of development installations may lack the version.
+                    names.append((os.path.splitext(child)[0], child))
+            for stem, child in names:
+                name = cls.normalize_name(stem.partition("-")[0])
+                if name not in locations:
+                    location = locations[name] = Path(directory, child)
+                    if archive is not None:
+                        archives[location] = archive
+        return cls(
+            locations=locations,
+            exhaustive=exhaustive,
+            stamps=stamps,
+            marker_environment=dict(marker_environment or {}),
+            archives=archives,
+        )
+
+    @classmethod
+    def _open_archive(
+        cls, path: Path, opened: Dict[Path, ZipArchive]
+    ) -> Optional[Tuple[ZipArchive, str]]:
+        """
+        Return the zip archive that contains a search path and the path within it.
+
+        Args:
+            path: A search path that is not a directory, for example, a zip archive or
+                a directory within one.
+            opened: A map from paths to previously opened archives that is updated.
+
+        Returns:
+            The archive and the directory within it, or `None` if the path does not
+            exist.
+
+        Raises:
+            OSError: If the archive cannot be read.
+            ValueError: If the file is not a zip archive.
+
+        """
+        inner: List[str] = []
+        while not path.exists():
+            if path.parent == path:
+                return None
+            inner.insert(0, path.name)
+            path = path.parent
+        if not path.is_file():
+            return None
+        archive = opened.get(path)
+        if archive is None:
+            archive = opened[path] = ZipArchive.from_path(path)
+        return archive, "/".join(inner)
+
+    @classmethod
+    def from_prefix(cls, prefix: Path) -> EnvironmentIndex:
+        """
+        Return an index of the distributions installed in another environment.
+
+        The environment is scanned directly, without running its interpreter. Its
+        site-packages directories are found below the prefix, following the layouts of
+        virtual environments, conda environments, and Python installations on POSIX
+        and Windows. Directories that `.pth` files add to the search path are scanned,
+        too. If the prefix contains a `pyvenv.cfg` file, its Python version is used
+        for evaluating environment markers, otherwise the version is inferred from
+        the site-packages directory's parent. If the virtual environment includes
+        the system site-packages, those of its base installation are scanned as well.
+
+        Args:
+            prefix: The environment's root directory, for example, that of a virtual
+                environment.
+
+        Returns:
+            An environment index instance.
+
+        Raises:
+            MissingSitePackagesError: If there is no site-packages directory below
+                the prefix.
+
+        """
+        config = cls._read_pyvenv_cfg(prefix / "pyvenv.cfg")
+        marker_environment: Dict[str, str] = {}
+        # The `venv` module records the `version` whereas `virtualenv` records the
+        # `version_info`, for example, 3.11.7.final.0, and the `implementation`.
+        version = config.get("version", config.get("version_info"))
+        if version is not None:
+            full_version = ".".join(version.split(".")[:3])
+            marker_environment["python_full_version"] = full_version
+            marker_environment["python_version"] = ".".join(full_version.split(".")[:2])
+        if "implementation" in config:
+            marker_environment["platform_python_implementation"] = config[
+                "implementation"
+            ]
+            marker_environment["implementation_name"] = config["implementation"].lower()
+        paths = cls._find_site_packages(
+            prefix, marker_environment.get("python_version")
+        )
+        if not paths:
+            raise MissingSitePackagesError(
+                f"There is no site-packages directory below '{prefix}'."
+            )
+        if "python_version" not in marker_environment:
+            match = cls._python_directory_pattern.fullmatch(paths[0].parent.name)
+            if match is not None:
+                # Without the patch level, the full version is assumed to be that of
+                # the first release rather than taken from the running interpreter.
+                marker_environment["python_full_version"] = f"{match.group(1)}.0"
+                marker_environment["python_version"] = match.group(1)
+        if config.get("include-system-site-packages", "").lower() == "true":
+            # The `home` is the directory of the base interpreter, which is located in
+            # the `bin` directory of the installation on POSIX but not on Windows.
+            home = Path(config.get("home", ""))
+            for base in (home.parent, home):
+                base_paths = cls._find_site_packages(
+                    base, marker_environment.get("python_version")
+                )
+                if base_paths:
+                    paths.extend(base_paths)
+                    break
+        return cls.create(
+            paths=[str(path) for path in cls._extend_by_pth_files(paths)],
+            marker_environment=marker_environment,
+        )
+
+    @classmethod
+    def _read_pyvenv_cfg(cls, path: Path) -> Dict[str, str]:
+        """Return the key, value pairs of a virtual environment configuration."""
+        result: Dict[str, str] = {}
+        try:
+            lines = path.read_text(encoding="utf-8").splitlines()
+        except (OSError, UnicodeDecodeError):
+            return result
+        for line in lines:
+            key, separator, value = line.partition("=")
+            if separator:
+                result[key.strip().lower()] = value.strip()
+        return result
+
+    @classmethod
+    def _find_site_packages(
+        cls, prefix: Path, python_version: Optional[str] = None
+    ) -> List[Path]:
+        """Return the site-packages directories below a prefix for a Python version."""
+        result: List[Path] = []
+        resolved = set()
+        candidates = [prefix / "Lib" / "site-packages"]
+        candidates.extend(sorted(prefix.glob("lib*/python*/site-packages")))
+        for path in candidates:
+            match = cls._python_directory_pattern.fullmatch(path.parent.name)
+            if (
+                match is not None
+                and python_version is not None
+                and match.group(1) != python_version
+            ):
+                continue
+            if not path.is_dir():
+                continue
+            # Some installations link `lib64` to `lib`.
+            real_path = path.resolve()
+            if real_path not in resolved:
+                resolved.add(real_path)
+                result.append(path)
+        return result
+
+    @classmethod
+    def _extend_by_pth_files(cls, site_packages: List[Path]) -> List[Path]:
+        """Return the site-packages directories and the directories they add."""
+        result: List[Path] = []
+        for directory in site_packages:
+            result.append(directory)
+            for pth in sorted(directory.glob("*.pth")):
+                try:
+                    lines = pth.read_text(encoding="utf-8").splitlines()
+                except (OSError, UnicodeDecodeError):
+                    continue
+                for line in lines:
+                    # Like the `site` module, we skip comments and executable lines.
+                    if not line.strip() or line.startswith(
+                        ("#", "import ", "import\t")
+                    ):
+                        continue
+                    path = directory / line.rstrip()
+                    if path.is_dir() and path not in result:
+                        result.append(path)
+        return result
+
+    @classmethod
+    def _stamp(cls, path: str) -> Optional[int]:
+        """Return a path's modification time if it exists."""
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def refresh(self) -> EnvironmentIndex:
+        """
+        Return an index that is up-to-date with the search paths.
+
+        Installing, upgrading, or removing a distribution changes the modification
+        time of its search path, which is cheap to check.
+
+        Returns:
+            This very index if none of its search paths changed, otherwise a new index
+            of the same search paths.
+
+        """
+        if all(
+            self._stamp(entry or ".") == stamp for entry, stamp in self.stamps.items()
+        ):
+            return self
+        return self.create(
+            list(self.stamps), marker_environment=self.marker_environment
+        )
+
+    def fingerprint(self) -> EnvironmentFingerprint:
+        """
+        Return the fingerprint of the indexed environment.
+
+        Computing a fingerprint stats every indexed distribution, so it is deferred
+        until first use and then shared by everyone using this index.
+
+        Returns:
+            An environment fingerprint instance.
+
+        """
+        if self.environment_fingerprint is None:
+            from .environment_fingerprint import EnvironmentFingerprint
+
+            object.__setattr__(
+                self, "environment_fingerprint", EnvironmentFingerprint.create(self)
+            )
+        return self.environment_fingerprint  # type: ignore[return-value]
+
+    @classmethod
+    def normalize_name(cls, name: str) -> str:
+        """
+        Return a distribution name normalized as described in PEP 503.
+
+        Metadata directory names typically end in a `.dist-info` or `.egg-info` suffix
+        which is stripped before normalization.
+
+        Args:
+            name: A distribution name.
+
+        Returns:
+            The normalized distribution name.
+
+        """
+        for suffix in cls._suffixes:
+            if name.lower().endswith(suffix):
+                name = name[: -len(suffix)]
+                break
+        return cls._normalize_pattern.sub("-", name).lower()
+
+    def locate(self, name: str) -> Optional[Path]:
+        """Return the metadata location of the named distribution if it is indexed."""
+        return self.locations.get(self.normalize_name(name))
+
+    def distribution(self, name: str) -> Optional[Distribution]:
+        """
+        Return the named distribution from the index.
+
+        Args:
+            name: A distribution name.
+
+        Returns:
+            A distribution instance if it is installed in the indexed environment,
+            `None` otherwise.
+
+        """
+        location = self.locate(name)
+        if location is None and self.exhaustive:
+            return None
+        # Importing `importlib.metadata` is comparatively slow and it is only needed
+        # when the header-only metadata reader cannot be used.
+        if sys.version_info < (3, 8):
+            from importlib_metadata import (
+                PackageNotFoundError,
+                PathDistribution,
+                distribution,
+            )
+        else:
+            from importlib.metadata import (
+                PackageNotFoundError,
+                PathDistribution,
+                distribution,
+            )
+
+        archive = self.archives.get(location) if location is not None else None
+        if archive is not None and location is not None:
+            import zipfile
+
+            inner = location.relative_to(archive.path).as_posix()
+            return PathDistribution(zipfile.Path(archive.path, at=f"{inner}/"))
+        if location is not None:
+            return PathDistribution(location)
+        try:
+            return distribution(name)
+        except PackageNotFoundError:
+            return None
+
+    def metadata(
+        self,
+        name: str,
+        cache: Optional[AbstractMetadataCache] = None,
+        profiler: Optional[Profiler] = None,
+    ) -> Optional[DistributionMetadata]:
+        """
+        Return the named distribution's metadata.
+
+        Args:
+            name: A distribution name.
+            cache: An optional cache that is consulted before reading metadata and
+                updated afterwards.
+            profiler: An optional profiler that records cache hits and misses as well
+                as the number of bytes read.
+
+        Returns:
+            The distribution's metadata if it is installed in the indexed environment,
+            `None` otherwise.
+
+        """
+        location = self.locate(name)
+        if location is None:
+            dist = self.distribution(name)
+            return (
+                None if dist is None else DistributionMetadata.from_distribution(dist)
+            )
+        archive = self.archives.get(location)
+        if archive is not None:
+            # Reading from the mapped archive is faster than validating a cache entry.
+            return MetadataReader.read(location, archive=archive, profiler=profiler)
+        if cache is not None:
+            cached = cache.get(location)
+            if profiler is not None:
+                profiler.record_cache(hit=cached is not None)
+            if cached is not None:
+                return cached
+        result = MetadataReader.read(location, profiler=profiler)
+        if cache is not None:
+            cache.set(location, result)
+        return result
@@ -0,0 +1,360 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide environment markers as described in PEP 508."""
+
+
+from __future__ import annotations
+
+import os
+import platform
+import re
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, ClassVar, Dict, List, Mapping, Optional, Pattern, Tuple
+
+from .version import Version
+
+
+# A compiled marker is a tree of nested tuples. Inner nodes are `("and", left, right)`
+# or `("or", left, right)` and leaves are `("compare", lhs, operator, rhs)` where each
+# side is either `("variable", name)` or `("string", value)`.
+Node = Tuple[Any, ...]
+
+
+class Marker:
+    """
+    Define an environment marker as described in PEP 508.
+
+    Markers are compiled once into a small expression tree, and since the same marker
+    strings recur across many distributions, compiled markers are cached.
+
+    Attributes:
+        text: The marker's text.
+
+    """
+
+    _token_pattern: ClassVar[Pattern] = re.compile(
+        r"""
+        \s*(?:
+            (?P<parenthesis>[()])
+            | (?P<operator>===|==|!=|<=|>=|~=|<|>|not\s+in\b|in\b)
+            | (?P<boolean>and\b|or\b)
+            | (?P<string>'[^']*'|"[^"]*")
+            | (?P<variable>[a-z_][a-z0-9_.]*)
+        )
+        """,
+        re.VERBOSE,
+    )
+    _aliases: ClassVar[Dict[str, str]] = {
+        "os.name": "os_name",
+        "sys.platform": "sys_platform",
+        "platform.version": "platform_version",
+        "platform.machine": "platform_machine",
+        "platform.python_implementation": "platform_python_implementation",
+        "python_implementation": "platform_python_implementation",
+    }
+    _variables: ClassVar[Tuple[str, ...]] = (
+        "implementation_name",
+        "implementation_version",
+        "os_name",
+        "platform_machine",
+        "platform_python_implementation",
+        "platform_release",
+        "platform_system",
+        "platform_version",
+        "python_full_version",
+        "python_version",
+        "sys_platform",
+        "extra",
+    )
+    _extra_pattern: ClassVar[Pattern] = re.compile(r"[-_.]+")
+
+    def __init__(self, text: str, tree: Node) -> None:
+        """
+        Initialize a marker from its text and compiled expression tree.
+
+        Args:
+            text: The marker's text.
+            tree: The compiled expression tree.
+
+        """
+        self.text = text
+        self._tree = tree
+
+    def __repr__(self) -> str:
+        """Return a representation of the marker."""
+        return f"{type(self).__name__}({self.text!r})"
+
+    @property
+    def extras(self) -> Tuple[str, ...]:
+        """Return the normalized names of the extras that the marker compares with."""
+        result: Dict[str, None] = {}
+        nodes = [self._tree]
+        while nodes:
+            node = nodes.pop()
+            if node[0] != "compare":
+                nodes.extend((node[2], node[1]))
+                continue
+            _, lhs, _, rhs = node
+            for variable, value in ((lhs, rhs), (rhs, lhs)):
+                if variable == ("variable", "extra") and value[0] == "string":
+                    result[self._extra_pattern.sub("-", value[1]).lower()] = None
+        return tuple(result)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def compile(cls, text: str) -> Marker:
+        """
+        Return a compiled marker.
+
+        Args:
+            text: A marker expression, for example, `python_version < "3.8"`.
+
+        Returns:
+            A marker instance.
+
+        Raises:
+            ValueError: If the marker expression is invalid.
+
+        """
+        tokens = cls._tokenize(text)
+        tree, position = cls._parse_or(tokens, 0, text)
+        if position != len(tokens):
+            raise ValueError(f"Unexpected '{tokens[position][1]}' in marker '{text}'.")
+        return cls(text=text, tree=tree)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def default_environment(cls) -> Mapping[str, str]:
+        """Return the marker environment of the running interpreter."""
+        return MappingProxyType(
+            {
+                "implementation_name": sys.implementation.name,
+                "implementation_version": cls._format_full_version(
+                    sys.implementation.version
+                ),
+                "os_name": os.name,
+                "platform_machine": platform.machine(),
+                "platform_python_implementation": platform.python_implementation(),
+                "platform_release": platform.release(),
+                "platform_system": platform.system(),
+                "platform_version": platform.version(),
+                "python_full_version": platform.python_version(),
+                "python_version": ".".join(platform.python_version_tuple()[:2]),
+                "sys_platform": sys.platform,
+                "extra": "",
+            }
+        )
+
+    def evaluate(self, environment: Optional[Mapping[str, str]] = None) -> bool:
+        """
+        Evaluate the marker in an environment.
+
+        Args:
+            environment: A map from marker variables to values. Missing variables are
+                taken from the running interpreter's environment.
+
+        Returns:
+            Whether the marker applies to the environment.
+
+        Raises:
+            ValueError: If the marker contains a compatible release comparison of a
+                value that is not a version.
+
+        """
+        default = self.default_environment()
+        if environment is None:
+            environment = default
+        else:
+            environment = {**default, **environment}
+        return self._evaluate(self._tree, environment)
+
+    @classmethod
+    def _format_full_version(cls, info: Any) -> str:
+        """Format version information as described in PEP 508."""
+        version = f"{info.major}.{info.minor}.{info.micro}"
+        if info.releaselevel != "final":
+            version = f"{version}{info.releaselevel[0]}{info.serial}"
+        return version
+
+    @classmethod
+    def _tokenize(cls, text: str) -> List[Tuple[str, str]]:
+        """Split a marker expression into kinds of tokens and their values."""
+        result = []
+        position = 0
+        text = text.rstrip()
+        while position < len(text):
+            match = cls._token_pattern.match(text, position)
+            if match is None or match.lastgroup is None:
+                raise ValueError(f"Invalid marker '{text}' at position {position}.")
+            kind = match.lastgroup
+            value = match.group(kind)
+            if kind == "operator":
+                value = " ".join(value.split())
+            elif kind == "variable":
+                value = cls._aliases.get(value, value)
+                if value not in cls._variables:
+                    raise ValueError(f"Unknown variable '{value}' in marker '{text}'.")
+            result.append((kind, value))
+            position = match.end()
+        return result
+
+    @classmethod
+    def _parse_or(
+        cls, tokens: List[Tuple[str, str]], position: int, text: str
+    ) -> Tuple[Node, int]:
+        """Parse a disjunction of conjunctions."""
+        left, position = cls._parse_and(tokens, position, text)
+        while position < len(tokens) and tokens[position] == ("boolean", "or"):
+            right, position = cls._parse_and(tokens, position + 1, text)
+            left = ("or", left, right)
+        return left, position
+
+    @classmethod
+    def _parse_and(
+        cls, tokens: List[Tuple[str, str]], position: int, text: str
+    ) -> Tuple[Node, int]:
+        """Parse a conjunction of atoms."""
+        left, position = cls._parse_atom(tokens, position, text)
+        while position < len(tokens) and tokens[position] == ("boolean", "and"):
+            right, position = cls._parse_atom(tokens, position + 1, text)
+            left = ("and", left, right)
+        return left, position
+
+    @classmethod
+    def _parse_atom(
+        cls, tokens: List[Tuple[str, str]], position: int, text: str
+    ) -> Tuple[Node, int]:
+        """Parse a parenthesized expression or a comparison."""
+        if position < len(tokens) and tokens[position] == ("parenthesis", "("):
+            node, position = cls._parse_or(tokens, position + 1, text)
+            if position >= len(tokens) or tokens[position] != ("parenthesis", ")"):
+                raise ValueError(f"Missing closing parenthesis in marker '{text}'.")
+            return node, position + 1
+        if (
+            position + 2 < len(tokens)
+            and tokens[position][0] in ("variable", "string")
+            and tokens[position + 1][0] == "operator"
+            and tokens[position + 2][0] in ("variable", "string")
+        ):
+            lhs, (_, operator), rhs = tokens[position : position + 3]
+            if lhs[0] == "string":
+                lhs = ("string", lhs[1][1:-1])
+            if rhs[0] == "string":
+                rhs = ("string", rhs[1][1:-1])
+            return ("compare", lhs, operator, rhs), position + 3
+        raise ValueError(f"Expected a comparison in marker '{text}'.")
+
+    @classmethod
+    def _evaluate(cls, node: Node, environment: Mapping[str, str]) -> bool:
+        """Evaluate a compiled expression tree in the given environment."""
+        kind = node[0]
+        if kind == "and":
+            return cls._evaluate(node[1], environment) and cls._evaluate(
+                node[2], environment
+            )
+        if kind == "or":
+            return cls._evaluate(node[1], environment) or cls._evaluate(
+                node[2], environment
+            )
+        _, lhs, operator, rhs = node
+        left = environment[lhs[1]] if lhs[0] == "variable" else lhs[1]
+        right = environment[rhs[1]] if rhs[0] == "variable" else rhs[1]
+        if ("variable", "extra") in (lhs, rhs):
+            # Extra names are compared in their normalized form (PEP 685).
+            left = cls._extra_pattern.sub("-", left).lower()
+            right = cls._extra_pattern.sub("-", right).lower()
+        return cls._compare(left, operator, right)
+
+    @classmethod
+    def _compare(cls, left: str, operator: str, right: str) -> bool:
+        """
+        Compare two values as versions if possible and as strings otherwise.
+
+        As specified by PEP 508, values that are not valid PEP 440 versions are
+        compared using Python's string comparison. Only the compatible release
+        operator has no string equivalent.
+
+        """
+        if operator == "in":
+            return left in right
+        if operator == "not in":
+            return left not in right
+        if operator == "===":
+            return left == right
+        try:
+            return cls._compare_versions(left, operator, right)
+        except ValueError:
+            if operator == "==":
+                return left == right
+            if operator == "!=":
+                return left != right
+            if operator == "<":
+                return left < right
+            if operator == "<=":
+                return left <= right
+            if operator == ">":
+                return left > right
+            if operator == ">=":
+                return left >= right
+            raise ValueError(
+                f"Undefined comparison '{left}' {operator} '{right}' in marker."
+            ) from None
+
+    @classmethod
+    def _compare_versions(cls, candidate: str, operator: str, spec: str) -> bool:
+        """Evaluate whether a candidate version satisfies a version specifier."""
+        if operator in ("==", "!=") and spec.endswith(".*"):
+            prefix = Version.parse(spec[:-2])
+            version = Version.parse(candidate)
+            padded = version.release + (0,) * len(prefix.release)
+            matches = (
+                version.epoch == prefix.epoch
+                and padded[: len(prefix.release)] == prefix.release
+            )
+            return matches if operator == "==" else not matches
+        version = Version.parse(candidate)
+        target = Version.parse(spec)
+        if operator in ("==", "!="):
+            matches = version == target and (
+                target.local is None or version.local == target.local
+            )
+            return matches if operator == "==" else not matches
+        if operator == "<=":
+            return version.key <= target.key
+        if operator == ">=":
+            return version.key >= target.key
+        same_release = version.key[:2] == target.key[:2]
+        if operator == "<":
+            # A pre-release of the specified version is excluded, unless the specified
+            # version is itself a pre-release.
+            return version < target and not (
+                same_release and version.is_prerelease and not target.is_prerelease
+            )
+        if operator == ">":
+            # Likewise, post-releases of the specified version are excluded.
+            return version > target and not (
+                same_release and version.post is not None and target.post is None
+            )
+        if operator == "~=":
+            if len(target.release) < 2:
+                raise ValueError(f"Invalid compatible release specifier '{spec}'.")
+            release = ".".join(map(str, target.release[:-1]))
+            return version >= target and cls._compare_versions(
+                candidate, "==", f"{target.epoch}!{release}.*"
+            )
+        raise ValueError(f"Unknown operator '{operator}'.")
@@ -0,0 +1,201 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a fast reader of distribution metadata headers."""
+
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import BinaryIO, ClassVar, Iterator, List, Optional, Tuple
+
+from .distribution_metadata import DistributionMetadata
+from .profiler import Profiler
+from .zip_archive import ZipArchive
+
+
+class MetadataReader:
+    """
+    Define a fast reader of distribution metadata headers.
+
+    Core metadata files (https://packaging.python.org/specifications/core-metadata/)
+    are formatted like email messages. Since the headers end at the first blank line,
+    we can extract the version and requirements without reading, let alone parsing,
+    the possibly very long description that follows in the message body.
+
+    """
+
+    _metadata_files: ClassVar[Tuple[str, ...]] = ("METADATA", "PKG-INFO")
+
+    @classmethod
+    def read(
+        cls,
+        location: Path,
+        archive: Optional[ZipArchive] = None,
+        profiler: Optional[Profiler] = None,
+    ) -> DistributionMetadata:
+        """
+        Return the metadata of a distribution.
+
+        Args:
+            location: The location of a distribution's `.dist-info` or `.egg-info`
+                directory, or of a single `.egg-info` file.
+            archive: The zip archive that contains the location, if any.
+            profiler: An optional profiler that records the number of bytes read.
+
+        Returns:
+            The distribution's metadata. Fields are empty if no metadata file could be
+            read.
+
+        """
+        if archive is not None:
+            return cls._read_archive(location, archive, profiler)
+        if location.is_dir():
+            for filename in cls._metadata_files:
+                try:
+                    with (location / filename).open("rb") as handle:
+                        name, version, requires = cls._parse_headers(handle, profiler)
+                except FileNotFoundError:
+                    continue
+                break
+            else:
+                return DistributionMetadata(name=None, version=None, requires=[])
+        else:
+            with location.open("rb") as handle:
+                name, version, requires = cls._parse_headers(handle, profiler)
+        if requires is None:
+            # Egg-info distributions may record their requirements separately.
+            requires = cls._read_requires_txt(location / "requires.txt", profiler)
+        return DistributionMetadata(
+            name=name, version=version, requires=[] if requires is None else requires
+        )
+
+    @classmethod
+    def _read_archive(
+        cls, location: Path, archive: ZipArchive, profiler: Optional[Profiler]
+    ) -> DistributionMetadata:
+        """Return the metadata of a distribution within a zip archive."""
+        prefix = location.relative_to(archive.path).as_posix()
+        # A single `.egg-info` file is a member itself.
+        candidates = [prefix] + [f"{prefix}/{name}" for name in cls._metadata_files]
+        for member in candidates:
+            if member in archive:
+                with archive.open(member) as handle:
+                    name, version, requires = cls._parse_headers(handle, profiler)
+                break
+        else:
+            return DistributionMetadata(name=None, version=None, requires=[])
+        if requires is None and f"{prefix}/requires.txt" in archive:
+            content = archive.read(f"{prefix}/requires.txt")
+            if profiler is not None:
+                profiler.record_bytes(len(content))
+            requires = cls._parse_requires_txt(content.decode("utf-8"))
+        return DistributionMetadata(
+            name=name, version=version, requires=[] if requires is None else requires
+        )
+
+    @classmethod
+    def _iter_headers(cls, handle: BinaryIO) -> Iterator[Tuple[str, str]]:
+        """Iterate over header field, value pairs until the first blank line."""
+        field: Optional[str] = None
+        value = ""
+        for raw in handle:
+            line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+            if not line:
+                break
+            if line[0] in " \t":
+                # A folded header continues the previous field's value. Notably, a
+                # line of only whitespace does not end the headers.
+                value = f"{value} {line.strip()}"
+                continue
+            if ":" not in line:
+                # Like the email parser, treat anything else as the start of the body.
+                break
+            if field is not None:
+                yield field, value
+            field, _, value = line.partition(":")
+            field = field.strip().lower()
+            value = value.strip()
+        if field is not None:
+            yield field, value
+
+    @classmethod
+    def _parse_headers(
+        cls, handle: BinaryIO, profiler: Optional[Profiler] = None
+    ) -> Tuple[Optional[str], Optional[str], Optional[List[str]]]:
+        """Return the name, version, and requirements from the metadata headers."""
+        name: Optional[str] = None
+        version: Optional[str] = None
+        requires: Optional[List[str]] = None
+        for field, value in cls._iter_headers(handle):
+            if field == "requires-dist":
+                if requires is None:
+                    requires = []
+                requires.append(value)
+            elif field == "version" and version is None:
+                version = value
+            elif field == "name" and name is None:
+                name = value
+        if profiler is not None:
+            # The position is where reading stopped, that is, after the headers.
+            profiler.record_bytes(handle.tell())
+        return name, version, requires
+
+    @classmethod
+    def _read_requires_txt(
+        cls, path: Path, profiler: Optional[Profiler] = None
+    ) -> Optional[List[str]]:
+        """
+        Return requirements from an egg-info `requires.txt` file.
+
+        The file lists requirements in sections, for example, `[extra:marker]`, which
+        are converted to PEP 508 environment markers the same way that
+        `importlib.metadata` does.
+
+        """
+        try:
+            content = path.read_bytes()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        if profiler is not None:
+            profiler.record_bytes(len(content))
+        return cls._parse_requires_txt(content.decode("utf-8"))
+
+    @classmethod
+    def _parse_requires_txt(cls, text: str) -> List[str]:
+        """Return requirements from the content of an egg-info `requires.txt` file."""
+        result: List[str] = []
+        section = ""
+        for line in text.splitlines():
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("[") and line.endswith("]"):
+                section = line[1:-1].strip()
+                continue
+            extra, _, markers = section.partition(":")
+            if extra and markers:
+                markers = f"({markers})"
+            conditions = [
+                condition
+                for condition in (markers, extra and f'extra == "{extra}"')
+                if condition
+            ]
+            if conditions:
+                # A space is needed to separate a URL requirement from the marker.
+                space = " " if "@" in line else ""
+                line = f"{line}{space}; {' and '.join(conditions)}"
+            result.append(line)
+        return result
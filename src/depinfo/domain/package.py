@@ -18,19 +18,22 @@
 
 from __future__ import annotations
 
-import re
 import sys
-from dataclasses import dataclass
-from typing import ClassVar, List, Optional, Pattern
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
+from .abstract_metadata_cache import AbstractMetadataCache
+from .environment_index import EnvironmentIndex
+from .profiler import Profiler
+from .requirement import Requirement
 
-if sys.version_info < (3, 8):
-    from importlib_metadata import PackageNotFoundError, distribution
-else:
-    from importlib.metadata import PackageNotFoundError, distribution
 
+# Packages are numerous in environment-wide reports, so we avoid per-instance
+# dictionaries where data classes support slots (Python 3.10 and later).
+_slots: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, **_slots)
 class Package:
     """
     Define a package model.
@@ -38,21 +41,42 @@ class Package:
     A package is defined by its name, version, and requirements. It can be constructed
     from its name via a convenient factory method.
 
+    Requirements may request extras of the required distribution, for example,
+    `requests[socks]`, and a package may itself have requirements that only apply
+    when one of its extras is requested.
+
     Attributes:
         name: The package name.
         version: The package version.
-        requirements: The package's requirements as other packages (if any).
+        requirements: The PEP 503 normalized names of the package's requirements (if
+            any).
+        extras: A map from the names of requirements to the normalized names of the
+            extras that they request, if any.
+        extra_requirements: A map from the normalized names of the package's extras
+            to the requirements that apply only if the extra is requested. Each
+            maps requirement names to the extras that they request.
 
     """
 
     name: str
     version: Optional[str]
     requirements: List[str]
-
-    _req_pattern: ClassVar[Pattern] = re.compile(r"[\s();<>=]")
+    # Snapshots record names, versions, and requirements only, so equality is
+    # defined by those, too.
+    extras: Dict[str, Tuple[str, ...]] = field(default_factory=dict, compare=False)
+    extra_requirements: Dict[str, Dict[str, Tuple[str, ...]]] = field(
+        default_factory=dict, compare=False
+    )
 
     @classmethod
-    def from_name(cls, name: str) -> Package:
+    def from_name(
+        cls,
+        name: str,
+        index: Optional[EnvironmentIndex] = None,
+        cache: Optional[AbstractMetadataCache] = None,
+        include_inactive: bool = False,
+        profiler: Optional[Profiler] = None,
+    ) -> Package:
         """
         Return a package instance from its distribution name.
 
@@ -61,6 +85,13 @@ class Package:
 
         Args:
             name: A package's distribution name.
+            index: An index of the installed distributions. If none is given, the
+                current environment is scanned.
+            cache: An optional cache of previously read distribution metadata.
+            include_inactive: Whether to include requirements whose environment
+                markers do not apply to the indexed environment, for example, those
+                of extras or other platforms.
+            profiler: An optional profiler that records the lookup.
 
         Returns:
             A package instance with its version and requirements if it is installed in
@@ -68,19 +99,33 @@ class Package:
             and requirements are empty.
 
         """
+        if profiler is not None:
+            start = profiler.clock()
         name = cls._normalize_name(name)
-        try:
-            dist = distribution(name)
-        except PackageNotFoundError:
+        if index is None:
+            index = EnvironmentIndex.create()
+        metadata = index.metadata(name, cache=cache, profiler=profiler)
+        if metadata is None:
             result = cls(name=name, version=None, requirements=[])
         else:
+            requirements, extra_requirements = cls._resolve_requirements(
+                metadata.requires,
+                include_inactive,
+                index.marker_environment or None,
+            )
             result = cls(
-                name=name,
-                version=dist.version,
-                requirements=[]
-                if dist.requires is None
-                else [cls._normalize_name(cls._get_name(req)) for req in dist.requires],
+                name=name
+                if metadata.name is None
+                else cls._normalize_name(metadata.name),
+                version=metadata.version,
+                requirements=list(requirements),
+                extras={
+                    name: extras for name, extras in requirements.items() if extras
+                },
+                extra_requirements=extra_requirements,
             )
+        if profiler is not None:
+            profiler.record_lookup(name, profiler.clock() - start)
         return result
 
     @classmethod
@@ -89,16 +134,141 @@ class Package:
         return name.lower().replace("_", "-")
 
     @classmethod
-    def _get_name(cls, requirement: str) -> str:
+    def _get_requirements(
+        cls,
+        requires: Iterable[str],
+        include_inactive: bool = False,
+        environment: Optional[Mapping[str, str]] = None,
+    ) -> List[str]:
+        """
+        Return the unique names of the required packages.
+
+        Args:
+            requires: Package requirement metadata as described in PEP 508
+                (https://peps.python.org/pep-0508/).
+            include_inactive: Whether to include requirements whose environment
+                markers do not apply.
+            environment: Values of environment marker variables that differ from
+                those of the running interpreter.
+
+        Returns:
+            The PEP 503 normalized names of the required packages in order of
+            occurrence.
+
+        """
+        requirements, _ = cls._resolve_requirements(
+            requires, include_inactive, environment
+        )
+        return list(requirements)
+
+    @classmethod
+    def _resolve_requirements(
+        cls,
+        requires: Iterable[str],
+        include_inactive: bool = False,
+        environment: Optional[Mapping[str, str]] = None,
+    ) -> Tuple[Dict[str, Tuple[str, ...]], Dict[str, Dict[str, Tuple[str, ...]]]]:
+        """
+        Return the required packages and the extras they request.
+
+        Args:
+            requires: Package requirement metadata as described in PEP 508
+                (https://peps.python.org/pep-0508/).
+            include_inactive: Whether to include requirements whose environment
+                markers do not apply, including those of extras.
+            environment: Values of environment marker variables that differ from
+                those of the running interpreter.
+
+        Returns:
+            A pair of the active requirements and the requirements that only apply
+            for one of the package's extras, by extra. Requirements map the PEP 503
+            normalized names of the required packages, in order of occurrence, to the
+            normalized names of the extras that they request.
+
+        """
+        requirements: Dict[str, Dict[str, None]] = {}
+        extra_requirements: Dict[str, Dict[str, Dict[str, None]]] = {}
+        for text in requires:
+            try:
+                requirement = Requirement.parse(text)
+            except ValueError:
+                continue
+            if include_inactive or requirement.is_active(environment):
+                cls._add_requirement(requirements, requirement)
+                continue
+            # Requirements of extras apply only if their extra is requested.
+            for extra in requirement.marker_extras():
+                if requirement.is_active({**(environment or {}), "extra": extra}):
+                    cls._add_requirement(
+                        extra_requirements.setdefault(extra, {}), requirement
+                    )
+        return (
+            {name: tuple(extras) for name, extras in requirements.items()},
+            {
+                extra: {name: tuple(extras) for name, extras in target.items()}
+                for extra, target in extra_requirements.items()
+            },
+        )
+
+    @classmethod
+    def _add_requirement(
+        cls, target: Dict[str, Dict[str, None]], requirement: Requirement
+    ) -> None:
+        """Add a requirement's normalized name and requested extras to a map."""
+        extras = target.setdefault(
+            EnvironmentIndex.normalize_name(requirement.name), {}
+        )
+        for extra in requirement.extras:
+            extras[EnvironmentIndex.normalize_name(extra)] = None
+
+    def iter_edges(
+        self, extras: Iterable[str] = ()
+    ) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+        """
+        Iterate over the package's requirements when some of its extras are requested.
+
+        Args:
+            extras: The normalized names of the requested extras of this package.
+
+        Yields:
+            The names of the required packages and the extras that they request.
+            Names may repeat if several extras require the same package.
+
+        """
+        for name in self.requirements:
+            yield name, self.extras.get(name, ())
+        for extra in extras:
+            yield from self.extra_requirements.get(extra, {}).items()
+
+    def with_extras(self, extras: Iterable[str]) -> Package:
         """
-        Return the package name from requirement metadata.
+        Return the package with the requirements of the requested extras added.
 
         Args:
-            requirement: Package requirement metadata as described in PEP 566
-                (https://peps.python.org/pep-0566/).
+            extras: The normalized names of the requested extras of this package.
 
         Returns:
-            The package name.
+            This very package if the extras add no requirements, otherwise a copy
+            whose requirements include those of the extras.
 
         """
-        return cls._req_pattern.split(requirement, maxsplit=1)[0]
+        requirements: Dict[str, Dict[str, None]] = {
+            name: dict.fromkeys(self.extras.get(name, ())) for name in self.requirements
+        }
+        num_requirements = len(requirements)
+        changed = False
+        for name, requested in self.iter_edges(extras):
+            target = requirements.setdefault(name, {})
+            for extra in requested:
+                if extra not in target:
+                    target[extra] = None
+                    changed = True
+        if len(requirements) == num_requirements and not changed:
+            return self
+        return replace(
+            self,
+            requirements=list(requirements),
+            extras={
+                name: tuple(extras) for name, extras in requirements.items() if extras
+            },
+        )
@@ -0,0 +1,300 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a compact, integer-indexed graph of packages and their requirements."""
+
+
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+from .package import Package
+
+
+class PackageGraph:
+    """
+    Define a compact, integer-indexed graph of packages and their requirements.
+
+    Package names are interned to consecutive integer identifiers and the requirement
+    edges are stored in compressed sparse row (CSR) format: the requirements of the
+    package with identifier `i` are `targets[offsets[i]:offsets[i + 1]]`. Traversals
+    thus work on integers and compact arrays instead of looking up names in
+    dictionaries for every edge. The inverted edges, from requirements to the packages
+    that depend on them, are stored in the same format.
+
+    Attributes:
+        names: The package names in order of their identifiers.
+        packages: The package instances in order of their identifiers.
+        ids: A map from package names to identifiers.
+        offsets: The start of each package's requirements in `targets`.
+        targets: The identifiers of all packages' requirements.
+        reverse_offsets: The start of each package's dependents in `reverse_targets`.
+        reverse_targets: The identifiers of all packages' dependents.
+
+    """
+
+    __slots__ = (
+        "names",
+        "packages",
+        "ids",
+        "offsets",
+        "targets",
+        "reverse_offsets",
+        "reverse_targets",
+        "_components",
+    )
+
+    def __init__(
+        self,
+        names: List[str],
+        packages: List[Package],
+        ids: Dict[str, int],
+        offsets: array,
+        targets: array,
+        reverse_offsets: array,
+        reverse_targets: array,
+    ) -> None:
+        """
+        Initialize a package graph from its components.
+
+        Args:
+            names: The package names in order of their identifiers.
+            packages: The package instances in order of their identifiers.
+            ids: A map from package names to identifiers.
+            offsets: The start of each package's requirements in `targets`.
+            targets: The identifiers of all packages' requirements.
+            reverse_offsets: The start of each package's dependents in
+                `reverse_targets`.
+            reverse_targets: The identifiers of all packages' dependents.
+
+        """
+        self.names = names
+        self.packages = packages
+        self.ids = ids
+        self.offsets = offsets
+        self.targets = targets
+        self.reverse_offsets = reverse_offsets
+        self.reverse_targets = reverse_targets
+        self._components: Optional[List[List[int]]] = None
+
+    @classmethod
+    def from_packages(cls, packages: Mapping[str, Package]) -> PackageGraph:
+        """
+        Return a graph built from a map of package names to instances.
+
+        Requirements that are not themselves part of the map, for example, because
+        they were beyond the maximum depth of a traversal, are omitted.
+
+        Args:
+            packages: A map from package names to instances.
+
+        Returns:
+            A package graph instance.
+
+        """
+        names = list(packages)
+        ids = {name: node for node, name in enumerate(names)}
+        offsets = array("L", [0])
+        targets = array("L")
+        # We count the dependents of each package while adding the requirements such
+        # that the inverted edges can be placed directly afterwards.
+        num_dependents = array("L", [0]) * (len(names) + 1)
+        for pkg in packages.values():
+            for node in (ids.get(req) for req in pkg.requirements):
+                if node is not None:
+                    targets.append(node)
+                    num_dependents[node + 1] += 1
+            offsets.append(len(targets))
+        reverse_offsets = num_dependents
+        for node in range(len(names)):
+            reverse_offsets[node + 1] += reverse_offsets[node]
+        reverse_targets = array("L", [0]) * len(targets)
+        positions = reverse_offsets[:-1]
+        for source in range(len(names)):
+            for node in targets[offsets[source] : offsets[source + 1]]:
+                reverse_targets[positions[node]] = source
+                positions[node] += 1
+        return cls(
+            names=names,
+            packages=list(packages.values()),
+            ids=ids,
+            offsets=offsets,
+            targets=targets,
+            reverse_offsets=reverse_offsets,
+            reverse_targets=reverse_targets,
+        )
+
+    def __len__(self) -> int:
+        """Return the number of packages in the graph."""
+        return len(self.names)
+
+    @property
+    def num_edges(self) -> int:
+        """Return the number of requirement edges in the graph."""
+        return len(self.targets)
+
+    def node_id(self, name: str) -> Optional[int]:
+        """Return the identifier of the named package if it is part of the graph."""
+        return self.ids.get(name)
+
+    def lookup(self, names: Iterable[str]) -> List[int]:
+        """Return the identifiers of those named packages that are part of the graph."""
+        ids = self.ids
+        return [ids[name] for name in names if name in ids]
+
+    def successors(self, node: int) -> Sequence[int]:
+        """Return the identifiers of the requirements of the given package."""
+        return self.targets[self.offsets[node] : self.offsets[node + 1]]
+
+    def predecessors(self, node: int) -> Sequence[int]:
+        """Return the identifiers of the packages that require the given package."""
+        return self.reverse_targets[
+            self.reverse_offsets[node] : self.reverse_offsets[node + 1]
+        ]
+
+    def shortest_chains(self, node: int) -> List[List[int]]:
+        """
+        Return the shortest chains of requirements from top-level packages to a node.
+
+        Top-level packages are those that no other package in the graph requires.
+        A breadth-first search along the inverted edges finds the chains in time
+        linear in the size of the graph.
+
+        Args:
+            node: The identifier of the required package.
+
+        Returns:
+            For every top-level package that transitively requires the given one, a
+            shortest chain of identifiers starting with the top-level package and
+            ending with the given one. Chains are ordered by length. The given package
+            forms a chain on its own if no package requires it.
+
+        """
+        # For every transitive dependent, we record the next package on a shortest
+        # chain towards the given one. The number of packages denotes unvisited ones.
+        unvisited = len(self)
+        next_nodes = array("L", [unvisited]) * len(self)
+        next_nodes[node] = node
+        queue = [node]
+        for current in queue:
+            for dependent in self.predecessors(current):
+                if next_nodes[dependent] == unvisited:
+                    next_nodes[dependent] = current
+                    queue.append(dependent)
+        chains = []
+        for top in queue:
+            if self.reverse_offsets[top] != self.reverse_offsets[top + 1]:
+                continue
+            chain = [top]
+            while chain[-1] != node:
+                chain.append(next_nodes[chain[-1]])
+            chains.append(chain)
+        return chains
+
+    def strongly_connected_components(
+        self, within: Optional[bytearray] = None
+    ) -> List[List[int]]:
+        """
+        Return the strongly connected components of the graph.
+
+        Packages in the same component require each other, directly or
+        transitively. Components are found by Tarjan's algorithm in time linear in
+        the number of packages and requirements, and computed only once per graph.
+
+        Args:
+            within: An optional mask of the identifiers to which the graph is
+                restricted. Components of a restricted graph are not cached.
+
+        Returns:
+            The components as lists of identifiers. The components are in reverse
+            topological order, that is, every component comes after the components
+            of its requirements.
+
+        """
+        if within is None and self._components is not None:
+            return self._components
+        offsets = self.offsets
+        targets = self.targets
+        unvisited = len(self)
+        indices = array("L", [unvisited]) * len(self)
+        lowlinks = array("L", [0]) * len(self)
+        on_stack = bytearray(len(self))
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+        for start in range(len(self)):
+            if indices[start] != unvisited or (
+                within is not None and not within[start]
+            ):
+                continue
+            indices[start] = lowlinks[start] = counter
+            counter += 1
+            stack.append(start)
+            on_stack[start] = 1
+            # Instead of recursing, we keep each visited node with its next edge.
+            work = [[start, offsets[start]]]
+            while work:
+                frame = work[-1]
+                node, edge = frame
+                if edge < offsets[node + 1]:
+                    frame[1] += 1
+                    succ = targets[edge]
+                    if within is not None and not within[succ]:
+                        continue
+                    if indices[succ] == unvisited:
+                        indices[succ] = lowlinks[succ] = counter
+                        counter += 1
+                        stack.append(succ)
+                        on_stack[succ] = 1
+                        work.append([succ, offsets[succ]])
+                    elif on_stack[succ]:
+                        lowlinks[node] = min(lowlinks[node], indices[succ])
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlinks[parent] = min(lowlinks[parent], lowlinks[node])
+                if lowlinks[node] == indices[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+        if within is None:
+            self._components = components
+        return components
+
+    def cycles(self, within: Optional[bytearray] = None) -> List[List[int]]:
+        """
+        Return the groups of packages that require each other.
+
+        Args:
+            within: An optional mask of the identifiers to which the graph is
+                restricted.
+
+        Returns:
+            The strongly connected components that form a cycle, that is, those with
+            more than one package or a package that requires itself.
+
+        """
+        return [
+            component
+            for component in self.strongly_connected_components(within)
+            if len(component) > 1 or component[0] in self.successors(component[0])
+        ]
@@ -0,0 +1,132 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a recorder of where time is spent while creating reports."""
+
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+
+
+class Profiler:
+    """
+    Define a recorder of where time is spent while creating and displaying reports.
+
+    A profiler is passed to the application or the report factories, which report
+    the wall time of each phase, for example, `discovery` of the installed
+    distributions, `loading` of their metadata, building the `graph`, its
+    `traversal`, and `formatting` the output. Every package lookup is recorded with
+    its latency, as are metadata cache hits and misses and the number of metadata
+    bytes read. Recording is thread-safe.
+
+    Subclasses may override the `record_*` methods, for example, to forward the
+    measurements to a metrics system.
+
+    Attributes:
+        clock: A function that returns the current time in seconds.
+        phases: A map from phase names to their total wall time in seconds.
+        lookups: A map from package names to their number of lookups and total
+            latency in seconds.
+        cache_hits: The number of metadata cache hits.
+        cache_misses: The number of metadata cache misses.
+        bytes_read: The number of metadata bytes read.
+
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        """
+        Initialize an empty profile.
+
+        Args:
+            clock: A function that returns the current time in seconds.
+
+        """
+        self.clock = clock
+        self.phases: Dict[str, float] = {}
+        self.lookups: Dict[str, List[float]] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.bytes_read = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Record the wall time of the enclosed block as part of the named phase."""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.record_phase(name, self.clock() - start)
+
+    def record_phase(self, name: str, seconds: float) -> None:
+        """Add wall time to the named phase."""
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def record_lookup(self, name: str, seconds: float) -> None:
+        """Record the latency of looking up a package."""
+        with self._lock:
+            entry = self.lookups.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def record_cache(self, hit: bool) -> None:
+        """Record a metadata cache hit or miss."""
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def record_bytes(self, count: int) -> None:
+        """Record the number of metadata bytes read."""
+        with self._lock:
+            self.bytes_read += count
+
+    def to_dict(self, max_packages: int = 10) -> Dict[str, Any]:
+        """
+        Return the profile as a JSON-serializable dictionary.
+
+        Args:
+            max_packages: The number of packages with the highest total lookup
+                latency to include.
+
+        Returns:
+            A dictionary with the keys `phases`, `lookups`, `slowest_lookups`,
+            `cache`, and `bytes_read`. Times are in seconds.
+
+        """
+        with self._lock:
+            slowest = sorted(
+                self.lookups.items(), key=lambda item: item[1][1], reverse=True
+            )[:max_packages]
+            return {
+                "phases": dict(self.phases),
+                "lookups": {
+                    "packages": len(self.lookups),
+                    "count": int(sum(count for count, _ in self.lookups.values())),
+                    "seconds": sum(seconds for _, seconds in self.lookups.values()),
+                },
+                "slowest_lookups": [
+                    {"name": name, "count": int(count), "seconds": seconds}
+                    for name, (count, seconds) in slowest
+                ],
+                "cache": {"hits": self.cache_hits, "misses": self.cache_misses},
+                "bytes_read": self.bytes_read,
+            }
@@ -19,7 +19,7 @@
 from __future__ import annotations
 
 import platform
-from typing import NamedTuple
+from typing import Mapping, NamedTuple, Optional
 
 
 class Python(NamedTuple):
@@ -36,8 +36,27 @@ class Python(NamedTuple):
     version: str
 
     @classmethod
-    def create(cls) -> Python:
-        """Return a Python instance generated from the current environment."""
+    def create(cls, environment: Optional[Mapping[str, str]] = None) -> Python:
+        """
+        Return a Python instance generated from the current environment.
+
+        Args:
+            environment: Values of environment marker variables that override those
+                of the running interpreter, for example, of another virtual
+                environment.
+
+        Returns:
+            A Python instance.
+
+        """
+        if environment is None:
+            environment = {}
         return cls(
-            name=platform.python_implementation(), version=platform.python_version()
+            name=environment.get(
+                "platform_python_implementation", platform.python_implementation()
+            ),
+            version=environment.get(
+                "python_full_version",
+                environment.get("python_version", platform.python_version()),
+            ),
         )
@@ -0,0 +1,74 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a model of the differences between the packages of two reports."""
+
+
+from __future__ import annotations
+
+from typing import List, Mapping, NamedTuple, Tuple
+
+from .package import Package
+
+
+class ReportDiff(NamedTuple):
+    """
+    Define the differences between the installed packages of two reports.
+
+    Packages that are required but not installed, that is, without a version, are
+    considered absent.
+
+    Attributes:
+        added: The packages that are only installed in the new report.
+        removed: The packages that are only installed in the old report.
+        changed: The old and new packages whose version or requirements differ.
+
+    """
+
+    added: List[Package]
+    removed: List[Package]
+    changed: List[Tuple[Package, Package]]
+
+    @classmethod
+    def from_packages(
+        cls, old: Mapping[str, Package], new: Mapping[str, Package]
+    ) -> ReportDiff:
+        """
+        Return the differences between two maps of package names to instances.
+
+        Args:
+            old: The packages of the old report.
+            new: The packages of the new report.
+
+        Returns:
+            The differences with packages ordered by their names.
+
+        """
+        old = {key: pkg for key, pkg in old.items() if pkg.version is not None}
+        new = {key: pkg for key, pkg in new.items() if pkg.version is not None}
+        return cls(
+            added=[new[key] for key in sorted(new.keys() - old.keys())],
+            removed=[old[key] for key in sorted(old.keys() - new.keys())],
+            changed=[
+                (old[key], new[key])
+                for key in sorted(old.keys() & new.keys())
+                if old[key] != new[key]
+            ],
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        """Return whether there are no differences."""
+        return not (self.added or self.removed or self.changed)
@@ -0,0 +1,141 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a requirement model as described in PEP 508."""
+
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import ClassVar, Mapping, Optional, Pattern, Tuple
+
+from .marker import Marker
+
+
+@dataclass(frozen=True)
+class Requirement:
+    """
+    Define a requirement as described in PEP 508.
+
+    Attributes:
+        name: The required distribution's name.
+        extras: The requested extras of the required distribution.
+        specifier: The version specifier, for example, `>=1.0,<2`, which may be empty.
+        url: The URL of a direct reference, if any.
+        marker: The environment marker that decides whether the requirement applies,
+            if any.
+
+    """
+
+    name: str
+    extras: Tuple[str, ...] = ()
+    specifier: str = ""
+    url: Optional[str] = None
+    marker: Optional[str] = None
+
+    _pattern: ClassVar[Pattern] = re.compile(
+        r"^\s*(?P<name>[A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)\s*"
+        r"(?:\[(?P<extras>[^\]]*)\])?\s*(?P<rest>.*)$",
+        re.DOTALL,
+    )
+    _url_marker_pattern: ClassVar[Pattern] = re.compile(r"\s+;")
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def parse(cls, text: str) -> Requirement:
+        """
+        Return a requirement parsed from its text.
+
+        The same requirement strings recur across many distributions, so parsed
+        requirements are cached. They are immutable and can thus be shared.
+
+        Args:
+            text: A requirement, for example, `requests[socks] (>=2.0) ; python_version
+                >= "3.8"`.
+
+        Returns:
+            A requirement instance.
+
+        Raises:
+            ValueError: If the text does not start with a valid distribution name.
+
+        """
+        match = cls._pattern.match(text)
+        if match is None:
+            raise ValueError(f"Invalid requirement '{text}'.")
+        extras = tuple(
+            extra.strip()
+            for extra in (match.group("extras") or "").split(",")
+            if extra.strip()
+        )
+        rest = match.group("rest").strip()
+        url: Optional[str] = None
+        if rest.startswith("@"):
+            # A URL may itself contain semicolons, so the marker must be separated by
+            # whitespace.
+            location, *marker = cls._url_marker_pattern.split(rest[1:], maxsplit=1)
+            url = location.strip()
+            specifier = ""
+        else:
+            specifier, *marker = rest.split(";", maxsplit=1)
+            specifier = "".join(specifier.split())
+            if specifier.startswith("(") and specifier.endswith(")"):
+                specifier = specifier[1:-1]
+        return cls(
+            name=match.group("name"),
+            extras=extras,
+            specifier=specifier,
+            url=url,
+            marker=marker[0].strip() or None if marker else None,
+        )
+
+    def is_active(self, environment: Optional[Mapping[str, str]] = None) -> bool:
+        """
+        Return whether the requirement applies to an environment.
+
+        Args:
+            environment: A map from marker variables to values. Missing variables are
+                taken from the running interpreter's environment.
+
+        Returns:
+            Whether the requirement's marker, if any, applies to the environment. A
+            requirement whose marker cannot be evaluated is considered active.
+
+        """
+        if self.marker is None:
+            return True
+        try:
+            return Marker.compile(self.marker).evaluate(environment)
+        except ValueError:
+            return True
+
+    def marker_extras(self) -> Tuple[str, ...]:
+        """
+        Return the extras of the requiring distribution that the marker refers to.
+
+        Returns:
+            The normalized names of the extras that the marker compares with, for
+            example, `http` for the marker `extra == "http"`, or an empty tuple if
+            there is no marker or it is invalid.
+
+        """
+        if self.marker is None:
+            return ()
+        try:
+            return Marker.compile(self.marker).extras
+        except ValueError:
+            return ()
@@ -0,0 +1,153 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a comparable version model following PEP 440."""
+
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import total_ordering
+from typing import ClassVar, Dict, Optional, Pattern, Tuple
+
+
+@total_ordering
+@dataclass(frozen=True, eq=False)
+class Version:
+    """
+    Define a comparable version following PEP 440.
+
+    Versions are ordered such that, for example, `1.0.dev0 < 1.0a1 < 1.0 < 1.0.post1`.
+    Trailing zeros of the release segment and local version labels are ignored when
+    comparing versions.
+
+    Attributes:
+        epoch: The version epoch.
+        release: The release segment.
+        pre: The pre-release phase, one of `a`, `b`, or `rc`, and its number.
+        post: The post-release number.
+        dev: The development release number.
+        local: The local version label.
+
+    """
+
+    epoch: int
+    release: Tuple[int, ...]
+    pre: Optional[Tuple[str, int]] = None
+    post: Optional[int] = None
+    dev: Optional[int] = None
+    local: Optional[str] = None
+
+    _pattern: ClassVar[Pattern] = re.compile(
+        r"""
+        ^\s*v?
+        (?:(?P<epoch>[0-9]+)!)?
+        (?P<release>[0-9]+(?:\.[0-9]+)*)
+        (?P<pre>[-_.]?(?P<pre_l>alpha|a|beta|b|preview|pre|c|rc)[-_.]?(?P<pre_n>[0-9]+)?)?
+        (?P<post>-(?P<post_n1>[0-9]+)|[-_.]?(?:post|rev|r)[-_.]?(?P<post_n2>[0-9]+)?)?
+        (?P<dev>[-_.]?dev[-_.]?(?P<dev_n>[0-9]+)?)?
+        (?:\+(?P<local>[a-z0-9]+(?:[-_.][a-z0-9]+)*))?
+        \s*$
+        """,
+        re.VERBOSE | re.IGNORECASE,
+    )
+    _pre_phases: ClassVar[Dict[str, str]] = {
+        "alpha": "a",
+        "a": "a",
+        "beta": "b",
+        "b": "b",
+        "c": "rc",
+        "pre": "rc",
+        "preview": "rc",
+        "rc": "rc",
+    }
+
+    @classmethod
+    def parse(cls, text: str) -> Version:
+        """
+        Return a version parsed from its text representation.
+
+        Args:
+            text: A version string as described in PEP 440.
+
+        Returns:
+            A version instance.
+
+        Raises:
+            ValueError: If the text is not a valid version.
+
+        """
+        match = cls._pattern.match(text)
+        if match is None:
+            raise ValueError(f"Invalid version '{text}'.")
+        return cls(
+            epoch=int(match.group("epoch") or 0),
+            release=tuple(int(part) for part in match.group("release").split(".")),
+            pre=None
+            if match.group("pre") is None
+            else (
+                cls._pre_phases[match.group("pre_l").lower()],
+                int(match.group("pre_n") or 0),
+            ),
+            post=None
+            if match.group("post") is None
+            else int(match.group("post_n1") or match.group("post_n2") or 0),
+            dev=None if match.group("dev") is None else int(match.group("dev_n") or 0),
+            local=match.group("local"),
+        )
+
+    @property
+    def is_prerelease(self) -> bool:
+        """Return whether this is a pre- or development release."""
+        return self.pre is not None or self.dev is not None
+
+    @property
+    def public(self) -> Version:
+        """Return this version without its local version label."""
+        return Version(self.epoch, self.release, self.pre, self.post, self.dev)
+
+    @property
+    def key(self) -> tuple:
+        """Return a key that orders versions as described in PEP 440."""
+        if self.pre is None and self.post is None and self.dev is not None:
+            # A development release of a final release sorts before its pre-releases.
+            pre: tuple = (-1,)
+        elif self.pre is None:
+            pre = (1,)
+        else:
+            pre = (0, *self.pre)
+        post = (-1,) if self.post is None else (0, self.post)
+        dev = (1,) if self.dev is None else (0, self.dev)
+        release = self.release
+        while len(release) > 1 and release[-1] == 0:
+            release = release[:-1]
+        return self.epoch, release, pre, post, dev
+
+    def __eq__(self, other: object) -> bool:
+        """Compare versions by their key."""
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.key == other.key
+
+    def __hash__(self) -> int:
+        """Hash versions by their key."""
+        return hash(self.key)
+
+    def __lt__(self, other: object) -> bool:
+        """Order versions by their key."""
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.key < other.key
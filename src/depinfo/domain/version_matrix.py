@@ -0,0 +1,199 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a columnar index of the package versions installed across many hosts."""
+
+
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class VersionMatrix:
+    """
+    Define a columnar index of the package versions installed across many hosts.
+
+    Package names, versions, and host names are interned to integer identifiers and
+    every distinct (package, version, host) combination is stored once. The rows are
+    partitioned by package into two compact integer columns, of version and host
+    identifiers, such that queries about a package only touch its own rows. Reports
+    can thus be added one host at a time while only the columns are kept in memory.
+
+    Attributes:
+        packages: The package names in order of their identifiers.
+        versions: The versions in order of their identifiers.
+        hosts: The host names in order of their identifiers.
+
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty version matrix."""
+        self.packages: List[str] = []
+        self.versions: List[str] = []
+        self.hosts: List[str] = []
+        self._package_ids: Dict[str, int] = {}
+        self._version_ids: Dict[str, int] = {}
+        self._host_ids: Dict[str, int] = {}
+        # The version and host identifiers of each package's rows.
+        self._columns: List[Tuple[array, array]] = []
+
+    def __len__(self) -> int:
+        """Return the number of distinct (package, version, host) rows."""
+        return sum(len(versions) for versions, _ in self._columns)
+
+    @classmethod
+    def _intern(cls, value: str, values: List[str], ids: Dict[str, int]) -> int:
+        """Return the identifier of a value, assigning a new one if necessary."""
+        result = ids.get(value)
+        if result is None:
+            result = ids[value] = len(values)
+            values.append(value)
+        return result
+
+    def add(self, host: str, packages: Iterable[Tuple[str, Optional[str]]]) -> None:
+        """
+        Add the packages installed on a host.
+
+        All of a host's packages must be added at once since duplicates are only
+        removed within a single call.
+
+        Args:
+            host: The host's name.
+            packages: Package name, version pairs. Packages without a version, that
+                is, those that are not installed, are skipped.
+
+        Raises:
+            ValueError: If the host's packages were added before.
+
+        """
+        if host in self._host_ids:
+            raise ValueError(f"The packages of the host '{host}' were added before.")
+        host_id = self._intern(host, self.hosts, self._host_ids)
+        seen: Set[Tuple[int, int]] = set()
+        for name, version in packages:
+            if version is None:
+                continue
+            package_id = self._intern(name, self.packages, self._package_ids)
+            version_id = self._intern(version, self.versions, self._version_ids)
+            if (package_id, version_id) in seen:
+                continue
+            seen.add((package_id, version_id))
+            if package_id == len(self._columns):
+                self._columns.append((array("I"), array("I")))
+            versions, hosts = self._columns[package_id]
+            versions.append(version_id)
+            hosts.append(host_id)
+
+    def _count_versions(self, package_id: int) -> List[Tuple[int, int]]:
+        """Return a package's version identifiers and counts, most common first."""
+        return sorted(
+            Counter(self._columns[package_id][0]).items(),
+            key=lambda item: (-item[1], self.versions[item[0]]),
+        )
+
+    def _hosts_of(self, package_id: int, version_id: int) -> List[str]:
+        """Return the sorted names of the hosts that run a version of a package."""
+        versions, hosts = self._columns[package_id]
+        return sorted(
+            self.hosts[host_id]
+            for other_id, host_id in zip(versions, hosts)
+            if other_id == version_id
+        )
+
+    def versions_of(self, package: str) -> Dict[str, List[str]]:
+        """
+        Return which hosts run which version of a package.
+
+        Args:
+            package: The package's name.
+
+        Returns:
+            A map from versions, most common first, to sorted host names.
+
+        """
+        package_id = self._package_ids.get(package)
+        if package_id is None:
+            return {}
+        result: Dict[str, List[str]] = {
+            self.versions[version_id]: []
+            for version_id, _ in self._count_versions(package_id)
+        }
+        versions, hosts = self._columns[package_id]
+        for version_id, host_id in zip(versions, hosts):
+            result[self.versions[version_id]].append(self.hosts[host_id])
+        for names in result.values():
+            names.sort()
+        return result
+
+    def skew(self) -> List[Tuple[str, Dict[str, int]]]:
+        """
+        Return the packages that are installed in more than one version.
+
+        Returns:
+            Package names with a map from each version to its number of hosts (most
+            common first), ordered by descending number of versions and then name.
+
+        """
+        result = []
+        for package_id, package in enumerate(self.packages):
+            counts = self._count_versions(package_id)
+            if len(counts) > 1:
+                result.append(
+                    (
+                        package,
+                        {
+                            self.versions[version_id]: count
+                            for version_id, count in counts
+                        },
+                    )
+                )
+        result.sort(key=lambda item: (-len(item[1]), item[0]))
+        return result
+
+    def outliers(self, fraction: float = 0.1) -> List[Tuple[str, str, List[str]]]:
+        """
+        Return the rare versions of packages and the hosts that run them.
+
+        A version is rare if it is not the most common version of a package and at
+        most the given fraction of the hosts with that package run it.
+
+        Args:
+            fraction: The maximum fraction of hosts that run a rare version.
+
+        Returns:
+            Package name, version, and sorted host names triples ordered by package
+            and version.
+
+        """
+        result: List[Tuple[str, str, List[str]]] = []
+        for package_id, package in sorted(
+            enumerate(self.packages), key=lambda item: item[1]
+        ):
+            counts = self._count_versions(package_id)
+            if len(counts) < 2:
+                continue
+            total = sum(count for _, count in counts)
+            most_common = counts[0][1]
+            result.extend(
+                (package, version, self._hosts_of(package_id, version_id))
+                for version, version_id in sorted(
+                    (self.versions[version_id], version_id)
+                    for version_id, count in counts
+                    if count < most_common and count <= fraction * total
+                )
+            )
+        return result
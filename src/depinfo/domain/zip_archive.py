@@ -0,0 +1,324 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide read-only access to zip archives through a memory map."""
+
+
+from __future__ import annotations
+
+import io
+import mmap
+import struct
+import zlib
+from pathlib import Path
+from typing import BinaryIO, ClassVar, Dict, List, NamedTuple, Tuple, Union
+
+
+class ZipMember(NamedTuple):
+    """
+    Define the location of a member's data within a zip archive.
+
+    Attributes:
+        offset: The offset of the member's local file header.
+        compressed_size: The size of the member's stored data.
+        method: The compression method, either stored (0) or deflated (8).
+        flags: The general purpose bit flags.
+
+    """
+
+    offset: int
+    compressed_size: int
+    method: int
+    flags: int
+
+
+class ZipArchive:
+    """
+    Define read-only access to a zip archive through a memory map.
+
+    The archive is mapped into memory once and its central directory is parsed once,
+    such that any number of members can be read without opening the file again. The
+    data of a member are decompressed straight from the mapped buffer and only as far
+    as they are read. Archives with data prepended, for example, executable zip
+    applications, and ZIP64 archives are supported, encrypted members are not.
+
+    Attributes:
+        path: The location of the archive.
+        members: A map from member names to their locations within the archive.
+
+    """
+
+    __slots__ = ("path", "members", "_buffer")
+
+    _end_signature: ClassVar[bytes] = b"PK\x05\x06"
+    _end: ClassVar[struct.Struct] = struct.Struct("<4s4H2LH")
+    _end64_locator_signature: ClassVar[bytes] = b"PK\x06\x07"
+    _end64_locator: ClassVar[struct.Struct] = struct.Struct("<4sLQL")
+    _end64_signature: ClassVar[bytes] = b"PK\x06\x06"
+    _end64: ClassVar[struct.Struct] = struct.Struct("<4sQ2H2L4Q")
+    _central_signature: ClassVar[bytes] = b"PK\x01\x02"
+    _central: ClassVar[struct.Struct] = struct.Struct("<4s6H3L5H2L")
+    _local_signature: ClassVar[bytes] = b"PK\x03\x04"
+    _local: ClassVar[struct.Struct] = struct.Struct("<4s5H3L2H")
+    _chunk_size: ClassVar[int] = 2**14
+
+    def __init__(
+        self, path: Path, members: Dict[str, ZipMember], buffer: mmap.mmap
+    ) -> None:
+        """
+        Initialize a zip archive from its components.
+
+        Args:
+            path: The location of the archive.
+            members: A map from member names to their locations within the archive.
+            buffer: The memory-mapped archive.
+
+        """
+        self.path = path
+        self.members = members
+        self._buffer = buffer
+
+    @classmethod
+    def from_path(cls, path: Path) -> ZipArchive:
+        """
+        Return an archive by mapping a file into memory and reading its directory.
+
+        Args:
+            path: The location of a zip archive.
+
+        Returns:
+            A zip archive instance.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the file is not a zip archive.
+
+        """
+        with path.open("rb") as handle:
+            try:
+                buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as error:
+                # Empty files cannot be mapped.
+                raise ValueError(f"'{path}' is not a zip archive.") from error
+        try:
+            members = cls._read_central_directory(buffer)
+        except (ValueError, struct.error) as error:
+            buffer.close()
+            raise ValueError(f"'{path}' is not a zip archive: {error}") from error
+        return cls(path=path, members=members, buffer=buffer)
+
+    @classmethod
+    def _read_central_directory(cls, buffer: mmap.mmap) -> Dict[str, ZipMember]:
+        """Return the members listed in an archive's central directory."""
+        # The end of central directory record is followed by a comment of at most
+        # 65535 bytes.
+        end = buffer.rfind(
+            cls._end_signature, max(0, len(buffer) - cls._end.size - 0xFFFF)
+        )
+        if end < 0:
+            raise ValueError("The end of the central directory is missing.")
+        _, _, _, _, count, size, offset, _ = cls._end.unpack_from(buffer, end)
+        directory_end = end
+        locator = end - cls._end64_locator.size
+        if (
+            locator >= 0
+            and buffer[locator : locator + 4] == cls._end64_locator_signature
+        ):
+            end64 = locator - cls._end64.size
+            if buffer[end64 : end64 + 4] != cls._end64_signature:
+                raise ValueError("The ZIP64 end of the central directory is missing.")
+            (_, _, _, _, _, _, _, count, size, offset) = cls._end64.unpack_from(
+                buffer, end64
+            )
+            directory_end = end64
+        # Data may be prepended to an archive, which shifts all recorded offsets.
+        shift = directory_end - size - offset
+        if shift < 0:
+            raise ValueError("The central directory is truncated.")
+        members: Dict[str, ZipMember] = {}
+        position = directory_end - size
+        for _ in range(count):
+            (
+                signature,
+                _,
+                _,
+                flags,
+                method,
+                _,
+                _,
+                _,
+                compressed_size,
+                _,
+                name_length,
+                extra_length,
+                comment_length,
+                _,
+                _,
+                _,
+                local_offset,
+            ) = cls._central.unpack_from(buffer, position)
+            if signature != cls._central_signature:
+                raise ValueError("A central directory entry is corrupt.")
+            position += cls._central.size
+            raw_name = buffer[position : position + name_length]
+            position += name_length
+            if compressed_size == 0xFFFFFFFF or local_offset == 0xFFFFFFFF:
+                compressed_size, local_offset = cls._read_zip64_extra(
+                    buffer[position : position + extra_length],
+                    compressed_size,
+                    local_offset,
+                )
+            position += extra_length + comment_length
+            name = raw_name.decode("utf-8" if flags & 0x800 else "cp437")
+            members[name] = ZipMember(
+                offset=local_offset + shift,
+                compressed_size=compressed_size,
+                method=method,
+                flags=flags,
+            )
+        return members
+
+    @classmethod
+    def _read_zip64_extra(
+        cls, extra: bytes, compressed_size: int, local_offset: int
+    ) -> Tuple[int, int]:
+        """Return the sizes and offset that a ZIP64 extra field replaces."""
+        position = 0
+        while position + 4 <= len(extra):
+            tag, length = struct.unpack_from("<2H", extra, position)
+            position += 4
+            if tag == 0x0001:
+                values: List[int] = list(
+                    struct.unpack_from(f"<{length // 8}Q", extra, position)
+                )
+                # The uncompressed size comes first but is not needed.
+                values.pop(0)
+                if compressed_size == 0xFFFFFFFF:
+                    compressed_size = values.pop(0)
+                if local_offset == 0xFFFFFFFF:
+                    local_offset = values.pop(0)
+                break
+            position += length
+        return compressed_size, local_offset
+
+    def __contains__(self, name: object) -> bool:
+        """Return whether the archive contains the named member."""
+        return name in self.members
+
+    def children(self, directory: str = "") -> List[str]:
+        """
+        Return the names of the files and directories within a directory.
+
+        Args:
+            directory: A directory within the archive (default the top level).
+
+        Returns:
+            The names without the directory prefix in order of appearance.
+
+        """
+        prefix = f"{directory.strip('/')}/" if directory.strip("/") else ""
+        result: Dict[str, None] = {}
+        for name in self.members:
+            if name.startswith(prefix) and len(name) > len(prefix):
+                result[name[len(prefix) :].partition("/")[0]] = None
+        return list(result)
+
+    def open(self, name: str) -> BinaryIO:
+        """
+        Return a binary stream of a member's data.
+
+        Args:
+            name: The member's name within the archive.
+
+        Returns:
+            A buffered binary stream that decompresses the data as far as it is read.
+
+        Raises:
+            KeyError: If the archive has no such member.
+            ValueError: If the member is encrypted or its compression method is not
+                supported.
+
+        """
+        member = self.members[name]
+        if member.flags & 0x1:
+            raise ValueError(f"The member '{name}' is encrypted.")
+        (
+            signature,
+            _,
+            _,
+            _,
+            _,
+            _,
+            _,
+            _,
+            _,
+            name_length,
+            extra_length,
+        ) = self._local.unpack_from(self._buffer, member.offset)
+        if signature != self._local_signature:
+            raise ValueError(f"The local header of '{name}' is corrupt.")
+        start = member.offset + self._local.size + name_length + extra_length
+        data = memoryview(self._buffer)[start : start + member.compressed_size]
+        if member.method == 0:
+            return io.BytesIO(data)
+        if member.method == 8:
+            return io.BufferedReader(_InflatingReader(data, self._chunk_size))
+        raise ValueError(
+            f"The compression method {member.method} of '{name}' is not supported."
+        )
+
+    def read(self, name: str) -> bytes:
+        """Return a member's complete data."""
+        with self.open(name) as handle:
+            return handle.read()
+
+
+class _InflatingReader(io.RawIOBase):
+    """Define a raw stream that decompresses deflated data chunk by chunk."""
+
+    def __init__(self, data: memoryview, chunk_size: int) -> None:
+        """Initialize the stream from the compressed data."""
+        super().__init__()
+        self._data = data
+        self._chunk_size = chunk_size
+        self._position = 0
+        self._output_position = 0
+        self._inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+
+    def readable(self) -> bool:
+        """Return that the stream can be read."""
+        return True
+
+    def tell(self) -> int:
+        """Return the number of decompressed bytes read so far."""
+        return self._output_position
+
+    def readinto(self, buffer) -> int:  # type: ignore[override]
+        """Decompress data into the given buffer and return their size."""
+        size = len(buffer)
+        chunk: Union[bytes, memoryview]
+        while True:
+            if self._inflater.unconsumed_tail:
+                chunk = self._inflater.unconsumed_tail
+            elif self._position < len(self._data):
+                chunk = self._data[self._position : self._position + self._chunk_size]
+                self._position += len(chunk)
+            else:
+                return 0
+            result = self._inflater.decompress(chunk, size)
+            if result:
+                buffer[: len(result)] = result
+                self._output_position += len(result)
+                return len(result)
@@ -13,5 +13,30 @@
 # limitations under the License.
 
 
-from .simple_display_service import SimpleDisplayService
-from .markdown_table_display_service import MarkdownTableDisplayService
+from typing import TYPE_CHECKING
+
+from depinfo._lazy import attach
+
+
+if TYPE_CHECKING:
+    from .simple_display_service import SimpleDisplayService
+    from .markdown_table_display_service import MarkdownTableDisplayService
+    from .json_display_service import JsonDisplayService
+    from .rich_display_service import RichDisplayService
+    from .textual_display_service import TextualDisplayService
+    from .json_report_reader import JsonReportReader
+    from .report_server import ReportServer
+
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "SimpleDisplayService": ".simple_display_service",
+        "MarkdownTableDisplayService": ".markdown_table_display_service",
+        "JsonDisplayService": ".json_display_service",
+        "RichDisplayService": ".rich_display_service",
+        "TextualDisplayService": ".textual_display_service",
+        "JsonReportReader": ".json_report_reader",
+        "ReportServer": ".report_server",
+    },
+)
@@ -19,9 +19,24 @@
 import argparse
 import logging
 import sys
-from typing import List, Optional
+from contextlib import nullcontext
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
-from depinfo.application import DisplayApplication, DisplayFormat
+from depinfo.infrastructure.domain import JSONMetadataCache
+
+
+if TYPE_CHECKING:
+    from depinfo.domain import EnvironmentIndex
 
 
 logger = logging.getLogger()
@@ -29,18 +44,63 @@ logger = logging.getLogger()
 
 MAX_DEPTH = 5
 
+# Following every requirement is requested by `--max-depth all`. Traversals are
+# cycle-safe and stop once no new packages are found, so any depth beyond the
+# number of packages is equivalent.
+UNLIMITED_DEPTH = sys.maxsize
 
-def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
-    """Define and immediately parse command line arguments."""
-    parser = argparse.ArgumentParser(
-        description="Display a package's dependencies, platform, and Python "
-        "information.",
-    )
+
+class VersionAction(argparse.Action):
+    """Define an action that looks up the installed version only when requested."""
+
+    def __init__(self, option_strings: Sequence[str], dest: str, **kwargs) -> None:
+        """Initialize a flag that takes no arguments."""
+        super().__init__(
+            option_strings=option_strings,
+            dest=dest,
+            default=argparse.SUPPRESS,
+            nargs=0,
+            help="Show the version of depinfo and exit.",
+            **kwargs,
+        )
+
+    def __call__(
+        self,
+        parser: argparse.ArgumentParser,
+        namespace: argparse.Namespace,
+        values: Union[str, Sequence[Any], None],
+        option_string: Optional[str] = None,
+    ) -> None:
+        """Print the version and exit."""
+        if sys.version_info < (3, 8):
+            from importlib_metadata import version
+        else:
+            from importlib.metadata import version
+
+        print(f"{parser.prog} {version('depinfo')}")
+        parser.exit()
+
+
+def add_report_arguments(parser: argparse.ArgumentParser, verb: str) -> None:
+    """Add the arguments that define which reports to create."""
     parser.add_argument(
         "package_name",
         metavar="PACKAGE",
+        nargs="?",
         help="The package's distribution name.",
     )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help=f"{verb} the dependencies of every installed package instead of a "
+        f"single one (default false).",
+    )
+    add_traversal_arguments(parser)
+    add_max_workers_argument(parser)
+
+
+def add_traversal_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the arguments that define how requirements are followed."""
     default_build_tools = "conda,flit,hatch,mamba,pbr,pip,poetry,setuptools,wheel"
     parser.add_argument(
         "--build-tools",
@@ -52,16 +112,46 @@ def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser.add_argument(
         "-d",
         "--max-depth",
-        type=int,
+        type=parse_max_depth,
         help=f"The maximum desired depth of nested dependencies to show "
-        f"(default {default_max_depth}). Should be >= 0 and <{MAX_DEPTH}.",
+        f"(default {default_max_depth}). Should be >= 0 and <{MAX_DEPTH}, or 'all' "
+        f"to show every transitive dependency and the packages that form cycles.",
         default=default_max_depth,
     )
     parser.add_argument(
-        "--markdown",
+        "--include-inactive",
         action="store_true",
-        help="Display information as markdown tables (default false).",
+        help="Include requirements whose environment markers do not apply, for "
+        "example, those of extras or other platforms (default false).",
     )
+
+
+def parse_max_depth(value: str) -> int:
+    """Return a maximum depth from an integer or 'all' for an unlimited depth."""
+    if value == "all":
+        return UNLIMITED_DEPTH
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid depth: '{value}' (choose an integer or 'all')"
+        ) from None
+
+
+def add_max_workers_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the argument that enables concurrent loading."""
+    parser.add_argument(
+        "-j",
+        "--max-workers",
+        type=int,
+        metavar="N",
+        help="Load package metadata concurrently using N threads (default "
+        "sequentially). Useful on network file systems.",
+    )
+
+
+def add_log_level_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the argument that sets the log level."""
     default_log_level = "WARNING"
     parser.add_argument(
         "-l",
@@ -70,23 +160,692 @@ def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
         choices=("CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"),
         default=default_log_level,
     )
+
+
+def validate_report_arguments(args: argparse.Namespace) -> None:
+    """Exit if the arguments that define which reports to create are invalid."""
+    validate_max_depth_argument(args)
+    if (args.package_name is None) is not args.all:
+        logger.critical("Please provide either a package name or the --all option.")
+        sys.exit(2)
+    validate_max_workers_argument(args)
+
+
+def validate_format_arguments(args: argparse.Namespace) -> None:
+    """Exit if the requested display format's optional dependency is missing."""
+    for name in ("rich", "textual"):
+        if getattr(args, name):
+            from importlib.util import find_spec
+
+            if find_spec(name) is None:
+                logger.critical(
+                    f"The --{name} option requires the optional dependency '{name}'. "
+                    f"Please install it with 'pip install depinfo[{name}]'."
+                )
+                sys.exit(2)
+
+
+def validate_max_depth_argument(args: argparse.Namespace) -> None:
+    """Exit if the maximum depth is invalid."""
+    if args.max_depth != UNLIMITED_DEPTH and not (0 <= args.max_depth < MAX_DEPTH):
+        logger.critical(f"The maximum depth must be >=0 and <{MAX_DEPTH}.")
+        sys.exit(2)
+
+
+def validate_max_workers_argument(args: argparse.Namespace) -> None:
+    """Exit if the number of workers is invalid."""
+    if args.max_workers is not None and args.max_workers < 1:
+        logger.critical("The number of workers must be >=1.")
+        sys.exit(2)
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Define and immediately parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Display a package's dependencies, platform, and Python "
+        "information.",
+        epilog="Further commands are available as 'depinfo aggregate', "
+        "'depinfo snapshot', 'depinfo diff', 'depinfo why', 'depinfo batch', and "
+        "'depinfo serve'. To display a package that is named like a command, "
+        "separate its name by '--', for example, 'depinfo -- serve'.",
+    )
+    parser.add_argument("--version", action=VersionAction)
+    add_report_arguments(parser, verb="Display")
+    formats = parser.add_mutually_exclusive_group()
+    formats.add_argument(
+        "--markdown",
+        action="store_true",
+        help="Display information as markdown tables (default false).",
+    )
+    formats.add_argument(
+        "--json",
+        action="store_true",
+        help="Display information as JSON, one line per package (default false).",
+    )
+    formats.add_argument(
+        "--rich",
+        action="store_true",
+        help="Display the dependencies as a tree and information as tables with "
+        "rich, which must be installed (default false).",
+    )
+    formats.add_argument(
+        "--textual",
+        action="store_true",
+        help="Browse the dependencies as a tree that loads requirements on demand "
+        "in a terminal app with textual, which must be installed (default false).",
+    )
+    parser.add_argument(
+        "--tree",
+        action="store_true",
+        help="Display the nested structure of the dependencies in which each "
+        "package's requirements are shown once and referred to afterwards "
+        "(default false).",
+    )
+    environments = parser.add_mutually_exclusive_group()
+    environments.add_argument(
+        "--site-packages",
+        action="append",
+        type=Path,
+        metavar="PATH",
+        help="Scan this directory for installed distributions instead of the "
+        "running interpreter's search path. May be given multiple times.",
+    )
+    environments.add_argument(
+        "--env",
+        type=Path,
+        metavar="PREFIX",
+        help="Scan the environment with this root directory, for example, a virtual "
+        "environment, without running its interpreter.",
+    )
+    parser.add_argument(
+        "--cache",
+        nargs="?",
+        const=JSONMetadataCache.default_path(),
+        type=Path,
+        metavar="PATH",
+        help=f"Reuse distribution metadata between runs by caching it in a file "
+        f"(default {JSONMetadataCache.default_path()}).",
+    )
+    parser.add_argument(
+        "--fingerprint",
+        action="store_true",
+        help="Print a fingerprint of the environment which changes whenever a "
+        "distribution is installed, upgraded, or removed. Together with --json, "
+        "include it in each report instead (default false).",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the time spent on each phase, package lookups, cache hits, and "
+        "metadata bytes read to standard error (default false).",
+    )
+    parser.add_argument(
+        "--profile-json",
+        type=Path,
+        metavar="PATH",
+        help="Write the profile as JSON to a file.",
+    )
+    add_log_level_argument(parser)
+    return parser.parse_args(argv)
+
+
+def print_profile(profile: Dict[str, Any]) -> None:
+    """Print a summary of a profile to standard error."""
+    lines = ["", "Profile", "-------"]
+    phases = profile["phases"]
+    if phases:
+        width = max(len(name) for name in phases)
+        lines.extend(
+            f"{name:<{width}} {1000 * seconds:10.2f} ms"
+            for name, seconds in phases.items()
+        )
+    lookups = profile["lookups"]
+    lines.append(
+        f"Looked up {lookups['packages']:,} packages {lookups['count']:,} times in "
+        f"{1000 * lookups['seconds']:.2f} ms."
+    )
+    if profile["slowest_lookups"]:
+        lines.append(
+            "Slowest: "
+            + ", ".join(
+                f"{entry['name']} ({1000 * entry['seconds']:.2f} ms)"
+                for entry in profile["slowest_lookups"]
+            )
+        )
+    cache = profile["cache"]
+    lines.append(f"Cache: {cache['hits']:,} hits, {cache['misses']:,} misses.")
+    lines.append(f"Read {profile['bytes_read']:,} bytes of metadata.")
+    print("\n".join(lines), file=sys.stderr)
+
+
+def parse_aggregate_arguments(argv: List[str]) -> argparse.Namespace:
+    """Define and immediately parse command line arguments of report aggregation."""
+    parser = argparse.ArgumentParser(
+        prog="depinfo aggregate",
+        description="Aggregate the JSON reports of many hosts and show which hosts "
+        "run which package versions.",
+    )
+    parser.add_argument(
+        "reports",
+        metavar="REPORT",
+        nargs="+",
+        type=Path,
+        help="A file of reports as written by 'depinfo --json' or 'depinfo --all "
+        "--json' for each host. Hosts are named after the files without extension "
+        "which must thus be unique.",
+    )
+    queries = parser.add_mutually_exclusive_group()
+    queries.add_argument(
+        "--package",
+        metavar="NAME",
+        help="Show which hosts run which version of the named package.",
+    )
+    queries.add_argument(
+        "--skew",
+        action="store_true",
+        help="Show the packages that are installed in more than one version "
+        "(default).",
+    )
+    default_fraction = 0.1
+    queries.add_argument(
+        "--outliers",
+        nargs="?",
+        const=default_fraction,
+        type=float,
+        metavar="FRACTION",
+        help=f"Show the hosts that run a rare version of a package, that is, one run "
+        f"by at most this fraction of hosts (default {default_fraction}).",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Display the result as JSON (default false).",
+    )
+    add_log_level_argument(parser)
+    return parser.parse_args(argv)
+
+
+def aggregate(argv: List[str]) -> None:
+    """Aggregate reports of many hosts and answer a version query."""
+    import json
+
+    from depinfo.domain import EnvironmentIndex, VersionMatrix
+    from depinfo.infrastructure.application import JsonReportReader
+
+    args = parse_aggregate_arguments(argv)
+    logging.basicConfig(level=args.log_level, format="[%(levelname)s] %(message)s")
+    paths: Dict[str, Path] = {}
+    for path in args.reports:
+        if path.stem in paths:
+            logger.critical(
+                f"The reports '{paths[path.stem]}' and '{path}' would both be "
+                f"attributed to the host '{path.stem}'."
+            )
+            sys.exit(2)
+        paths[path.stem] = path
+    matrix = VersionMatrix()
+    for path in args.reports:
+        try:
+            with path.open(encoding="utf-8") as handle:
+                matrix.add(path.stem, JsonReportReader.iter_packages(handle))
+        except OSError as error:
+            logger.critical(f"Could not read the reports '{path}': {error}")
+            sys.exit(1)
+    logger.info(
+        f"Aggregated {len(matrix):,} rows of {len(matrix.packages):,} packages in "
+        f"{len(matrix.versions):,} versions on {len(matrix.hosts):,} hosts."
+    )
+    if args.package is not None:
+        # The matrix is keyed by normalized package names.
+        package = EnvironmentIndex.normalize_name(args.package)
+        versions = matrix.versions_of(package)
+        if args.json:
+            print(json.dumps({"package": package, "versions": versions}))
+        else:
+            for version, hosts in versions.items():
+                print(f"{version}: {', '.join(hosts)}")
+    elif args.outliers is not None:
+        outliers = matrix.outliers(fraction=args.outliers)
+        if args.json:
+            print(
+                json.dumps(
+                    [
+                        {"package": package, "version": version, "hosts": hosts}
+                        for package, version, hosts in outliers
+                    ]
+                )
+            )
+        else:
+            for package, version, hosts in outliers:
+                print(f"{package} {version}: {', '.join(hosts)}")
+    else:
+        skew = matrix.skew()
+        if args.json:
+            print(
+                json.dumps(
+                    [
+                        {"package": package, "versions": counts}
+                        for package, counts in skew
+                    ]
+                )
+            )
+        else:
+            for package, counts in skew:
+                summary = ", ".join(
+                    f"{version} ({count} host{'' if count == 1 else 's'})"
+                    for version, count in counts.items()
+                )
+                print(f"{package}: {summary}")
+
+
+def parse_snapshot_arguments(argv: List[str]) -> argparse.Namespace:
+    """Define and immediately parse command line arguments of taking snapshots."""
+    parser = argparse.ArgumentParser(
+        prog="depinfo snapshot",
+        description="Save the dependency reports of a package, or of every installed "
+        "package, to a file for later comparison with 'depinfo diff'.",
+    )
+    parser.add_argument(
+        "snapshot", metavar="SNAPSHOT", type=Path, help="The snapshot file to write."
+    )
+    add_report_arguments(parser, verb="Record")
+    add_log_level_argument(parser)
+    return parser.parse_args(argv)
+
+
+def snapshot(argv: List[str]) -> None:
+    """Save a snapshot of dependency reports."""
+    from depinfo.infrastructure.domain import JSONReportSnapshot
+
+    args = parse_snapshot_arguments(argv)
+    logging.basicConfig(level=args.log_level, format="[%(levelname)s] %(message)s")
+    validate_report_arguments(args)
+    result = JSONReportSnapshot.create(
+        roots=None if args.all else [args.package_name],
+        build_tools=[token.strip() for token in args.build_tools.split(",")],
+        max_depth=args.max_depth,
+        include_inactive=args.include_inactive,
+        max_workers=args.max_workers,
+    )
+    try:
+        result.save(args.snapshot)
+    except OSError as error:
+        logger.critical(f"Could not write the snapshot '{args.snapshot}': {error}")
+        sys.exit(1)
+
+
+def parse_diff_arguments(argv: List[str]) -> argparse.Namespace:
+    """Define and immediately parse command line arguments of comparing snapshots."""
+    parser = argparse.ArgumentParser(
+        prog="depinfo diff",
+        description="Compare a snapshot with the current environment or with another "
+        "snapshot. The exit status is 0 if the packages are the same and 1 if they "
+        "differ.",
+    )
+    parser.add_argument(
+        "old", metavar="OLD", type=Path, help="The snapshot to compare against."
+    )
+    parser.add_argument(
+        "new",
+        metavar="NEW",
+        type=Path,
+        nargs="?",
+        help="Another snapshot (default the current environment which is recorded "
+        "with the same options as the old snapshot).",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Display the differences as JSON (default false).",
+    )
+    add_max_workers_argument(parser)
+    add_log_level_argument(parser)
+    return parser.parse_args(argv)
+
+
+def diff(argv: List[str]) -> None:
+    """Compare a snapshot with the current environment or another snapshot."""
+    import json
+
+    from depinfo.domain import ReportDiff
+    from depinfo.infrastructure.domain import JSONReportSnapshot
+
+    args = parse_diff_arguments(argv)
+    logging.basicConfig(level=args.log_level, format="[%(levelname)s] %(message)s")
+    validate_max_workers_argument(args)
+    snapshots = []
+    for path in (args.old, args.new):
+        if path is None:
+            continue
+        try:
+            snapshots.append(JSONReportSnapshot.load(path))
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            logger.critical(f"Could not read the snapshot '{path}': {error!r}")
+            sys.exit(2)
+    if args.new is None:
+        snapshots.append(snapshots[0].retake(max_workers=args.max_workers))
+    old, new = snapshots
+    differences = ReportDiff.from_packages(old.packages, new.packages)
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "added": [
+                        {"name": pkg.name, "version": pkg.version}
+                        for pkg in differences.added
+                    ],
+                    "removed": [
+                        {"name": pkg.name, "version": pkg.version}
+                        for pkg in differences.removed
+                    ],
+                    "changed": [
+                        {
+                            "name": new_pkg.name,
+                            "old_version": old_pkg.version,
+                            "new_version": new_pkg.version,
+                            "old_requirements": old_pkg.requirements,
+                            "new_requirements": new_pkg.requirements,
+                        }
+                        for old_pkg, new_pkg in differences.changed
+                    ],
+                }
+            )
+        )
+    else:
+        sections: List[Tuple[str, List[Tuple[str, Optional[str]]]]] = [
+            ("Added Packages", [(pkg.name, pkg.version) for pkg in differences.added]),
+            (
+                "Removed Packages",
+                [(pkg.name, pkg.version) for pkg in differences.removed],
+            ),
+            (
+                "Changed Packages",
+                [
+                    (
+                        new_pkg.name,
+                        f"{old_pkg.version} -> {new_pkg.version}"
+                        if old_pkg.version != new_pkg.version
+                        else "requirements changed",
+                    )
+                    for old_pkg, new_pkg in differences.changed
+                ],
+            ),
+        ]
+        for title, pairs in sections:
+            if not pairs:
+                continue
+            width = max(len(name) for name, _ in pairs)
+            print(f"\n{title}\n{'-' * len(title)}")
+            for name, change in pairs:
+                print(f"{name:<{width}} {change}")
+    if not differences.is_empty:
+        sys.exit(1)
+
+
+def parse_why_arguments(argv: List[str]) -> argparse.Namespace:
+    """Define and immediately parse command line arguments of dependents queries."""
+    parser = argparse.ArgumentParser(
+        prog="depinfo why",
+        description="Show why a package is installed, that is, the shortest chains "
+        "of requirements that lead to it from each top-level package which no other "
+        "installed package requires.",
+    )
+    parser.add_argument(
+        "package_name", metavar="PACKAGE", help="The package's distribution name."
+    )
+    parser.add_argument(
+        "--include-inactive",
+        action="store_true",
+        help="Include requirements whose environment markers do not apply, for "
+        "example, those of extras or other platforms (default false).",
+    )
+    add_max_workers_argument(parser)
+    add_log_level_argument(parser)
+    return parser.parse_args(argv)
+
+
+def why(argv: List[str]) -> None:
+    """Show the shortest chains of requirements that lead to a package."""
+    from depinfo.domain import DependencyReport, EnvironmentIndex
+
+    args = parse_why_arguments(argv)
+    logging.basicConfig(level=args.log_level, format="[%(levelname)s] %(message)s")
+    validate_max_workers_argument(args)
+    # Every installed distribution is a root, so the requirements among them are
+    # complete without descending any further.
+    reports = DependencyReport.from_environment(
+        build_tools=(),
+        max_depth=0,
+        include_inactive=args.include_inactive,
+        max_workers=args.max_workers,
+    )
+    name = EnvironmentIndex.normalize_name(args.package_name)
+    graph = reports[0].graph if reports else None
+    node = None if graph is None else graph.node_id(name)
+    if graph is None or node is None:
+        logger.critical(f"The package '{args.package_name}' is not installed.")
+        sys.exit(1)
+    chains = graph.shortest_chains(node)
+    if chains == [[node]]:
+        print(f"{name} is not required by any other installed package.")
+        return
+    if not chains:
+        # All dependents require each other in a cycle.
+        dependents = ", ".join(
+            graph.names[member] for member in graph.predecessors(node)
+        )
+        print(f"{name} is required by {dependents} but not by any top-level package.")
+        return
+    title = f"Why is {name} installed?"
+    print(f"{title}\n{'-' * len(title)}")
+    for chain in chains:
+        print(" -> ".join(graph.names[member] for member in chain))
+
+
+def parse_batch_arguments(argv: List[str]) -> argparse.Namespace:
+    """Define and immediately parse command line arguments of batch reports."""
+    parser = argparse.ArgumentParser(
+        prog="depinfo batch",
+        description="Report on many environments, for example, virtual environments, "
+        "without running their interpreters. The environments are scanned by a pool "
+        "of processes and the reports are written as one stream of JSON lines, each "
+        "with the 'environment' it belongs to.",
+    )
+    parser.add_argument(
+        "prefixes",
+        metavar="PREFIX",
+        nargs="+",
+        type=Path,
+        help="The root directory of an environment.",
+    )
+    parser.add_argument(
+        "--package",
+        metavar="NAME",
+        help="Report on the named package only (default every installed package).",
+    )
+    add_traversal_arguments(parser)
+    parser.add_argument(
+        "-p",
+        "--processes",
+        type=int,
+        metavar="N",
+        help="Scan environments using N processes (default the number of CPUs).",
+    )
+    add_log_level_argument(parser)
     return parser.parse_args(argv)
 
 
+def batch(argv: List[str]) -> None:
+    """Report on many environments at once."""
+    from depinfo.application import DisplayApplication
+    from depinfo.domain import MissingSitePackagesError
+
+    args = parse_batch_arguments(argv)
+    logging.basicConfig(level=args.log_level, format="[%(levelname)s] %(message)s")
+    validate_max_depth_argument(args)
+    if args.processes is not None and args.processes < 1:
+        logger.critical("The number of processes must be >=1.")
+        sys.exit(2)
+    failures = DisplayApplication.run_environments(
+        prefixes=args.prefixes,
+        package_name=args.package,
+        build_tools=[token.strip() for token in args.build_tools.split(",")],
+        max_depth=args.max_depth,
+        include_inactive=args.include_inactive,
+        max_processes=args.processes,
+    )
+    for prefix, error in failures:
+        if isinstance(error, MissingSitePackagesError):
+            logger.error(str(error))
+        else:
+            logger.error(f"Could not report on the environment '{prefix}': {error!r}")
+    if failures:
+        sys.exit(1)
+
+
+def parse_serve_arguments(argv: List[str]) -> argparse.Namespace:
+    """Define and immediately parse command line arguments of the report server."""
+    parser = argparse.ArgumentParser(
+        prog="depinfo serve",
+        description="Answer report requests over a Unix domain socket. Each request is "
+        "a single line with a JSON object, for example, "
+        '\'{"package": "depinfo", "max_depth": 2}\'.',
+    )
+    parser.add_argument(
+        "socket",
+        metavar="SOCKET",
+        type=Path,
+        help="The location of the Unix domain socket to create.",
+    )
+    add_log_level_argument(parser)
+    return parser.parse_args(argv)
+
+
+def serve(argv: List[str]) -> None:
+    """Answer report requests over a Unix domain socket until terminated."""
+    import signal
+    import socket
+
+    from depinfo.infrastructure.application import ReportServer
+
+    args = parse_serve_arguments(argv)
+    logging.basicConfig(level=args.log_level, format="[%(levelname)s] %(message)s")
+    if not hasattr(socket, "AF_UNIX"):
+        logger.critical("Unix domain sockets are not supported on this platform.")
+        sys.exit(2)
+    # Exit normally on termination such that the socket is removed.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        ReportServer(path=args.socket, max_depth_limit=MAX_DEPTH).serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except OSError as error:
+        logger.critical(f"Could not serve on '{args.socket}': {error}")
+        sys.exit(2)
+
+
+def create_index(args: argparse.Namespace) -> Optional["EnvironmentIndex"]:
+    """Return an index of the environment selected by the arguments, if any."""
+    from depinfo.domain import EnvironmentIndex
+
+    if args.env is not None:
+        try:
+            return EnvironmentIndex.from_prefix(args.env)
+        except ValueError as error:
+            logger.critical(str(error))
+            sys.exit(1)
+    if args.site_packages is not None:
+        return EnvironmentIndex.create([str(path) for path in args.site_packages])
+    return None
+
+
+COMMANDS = {
+    "aggregate": aggregate,
+    "snapshot": snapshot,
+    "diff": diff,
+    "why": why,
+    "batch": batch,
+    "serve": serve,
+}
+
+
 def main(argv: Optional[List[str]] = None) -> None:
     """Coordinate argument parsing, input validation, and program execution."""
+    if argv is None:
+        argv = sys.argv[1:]
+    # Package names that coincide with a command must follow a `--` separator.
+    if argv and argv[0] in COMMANDS:
+        COMMANDS[argv[0]](argv[1:])
+        return
     args = parse_arguments(argv)
     logging.basicConfig(level=args.log_level, format="[%(levelname)s] %(message)s")
-    if not (0 <= args.max_depth < MAX_DEPTH):
-        logger.critical(f"The maximum depth must be >=0 and <{MAX_DEPTH}.")
-        sys.exit(2)
+    if args.fingerprint and args.package_name is None and not args.all:
+        from depinfo.domain import EnvironmentFingerprint
+
+        print(EnvironmentFingerprint.create(create_index(args)).digest)
+        return
+    validate_report_arguments(args)
+    validate_format_arguments(args)
+    # The application is imported only now such that showing the help or version
+    # remains fast.
+    from depinfo.application import DisplayApplication, DisplayFormat
+    from depinfo.domain import Profiler
+
     if args.markdown:
         display_format = DisplayFormat.Markdown
+    elif args.json:
+        display_format = DisplayFormat.Json
+    elif args.rich:
+        display_format = DisplayFormat.Rich
+    elif args.textual:
+        display_format = DisplayFormat.Textual
     else:
         display_format = DisplayFormat.Simple
-    DisplayApplication.run(
-        package_name=args.package_name,
-        display_format=display_format,
-        build_tools=[token.strip() for token in args.build_tools.split(",")],
-        max_depth=args.max_depth,
-    )
+    profiler = Profiler() if args.profile or args.profile_json is not None else None
+    index = None
+    if args.env is not None or args.site_packages is not None:
+        with nullcontext() if profiler is None else profiler.phase("discovery"):
+            index = create_index(args)
+    cache = None if args.cache is None else JSONMetadataCache.load(args.cache)
+    build_tools = [token.strip() for token in args.build_tools.split(",")]
+    if args.all:
+        DisplayApplication.run_all(
+            display_format=display_format,
+            build_tools=build_tools,
+            max_depth=args.max_depth,
+            cache=cache,
+            max_workers=args.max_workers,
+            include_inactive=args.include_inactive,
+            index=index,
+            profiler=profiler,
+            tree=args.tree,
+            fingerprint=args.fingerprint,
+        )
+    else:
+        DisplayApplication.run(
+            package_name=args.package_name,
+            display_format=display_format,
+            build_tools=build_tools,
+            max_depth=args.max_depth,
+            cache=cache,
+            max_workers=args.max_workers,
+            include_inactive=args.include_inactive,
+            index=index,
+            profiler=profiler,
+            tree=args.tree,
+            fingerprint=args.fingerprint,
+        )
+    if profiler is not None:
+        if args.profile:
+            print_profile(profiler.to_dict())
+        if args.profile_json is not None:
+            import json
+
+            try:
+                args.profile_json.write_text(json.dumps(profiler.to_dict()))
+            except OSError as error:
+                logger.error(
+                    f"Could not write the profile '{args.profile_json}': {error}"
+                )
+    if cache is not None:
+        cache.save()
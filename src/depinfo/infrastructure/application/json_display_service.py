@@ -0,0 +1,163 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a service that displays dependency information as JSON."""
+
+
+import json
+import sys
+from typing import Dict, Iterator, Optional, Sequence, TextIO
+
+from depinfo.application import AbstractDisplayService
+from depinfo.domain import DependencyReport, Package
+
+
+class JsonDisplayService(AbstractDisplayService):
+    """
+    Define a service that displays dependency information as JSON.
+
+    Each report is written as one JSON object on a single line, such that multiple
+    reports form newline-delimited JSON (https://github.com/ndjson/ndjson-spec).
+    The objects have the following keys: `package`, `dependencies` (each with its
+    nesting `depth`), `cycles` (lists of the names of displayed packages that
+    require each other), `build_tools`, `platform`, and `python`, as well as the
+    `environment` if one is given and the environment's `fingerprint` if requested
+    and known.
+    Missing versions are `null`.
+
+    """
+
+    @classmethod
+    def display(
+        cls,
+        report: DependencyReport,
+        max_depth: int = 1,
+        stream: Optional[TextIO] = None,
+        environment: Optional[str] = None,
+        fingerprint: bool = False,
+        **kwargs,
+    ) -> None:
+        """
+        Display a dependency report to a desired maximum depth as JSON.
+
+        Args:
+            report: A dependency report instance.
+            max_depth:  The maximum desired depth (default 1).
+            stream: The text stream to write to (default `sys.stdout`).
+            environment: An optional description of the environment that the report
+                was created for, for example, its location.
+            fingerprint: Whether to include the fingerprint of the environment, if
+                known (default false). Computing it stats every indexed
+                distribution.
+            **kwargs: Keyword arguments are ignored.
+
+        """
+        if stream is None:
+            stream = sys.stdout
+        digest = None
+        if fingerprint and report.fingerprint is not None:
+            digest = report.fingerprint.digest
+        stream.writelines(cls._encode(report, max_depth, environment, digest))
+
+    @classmethod
+    def display_all(
+        cls,
+        reports: Sequence[DependencyReport],
+        max_depth: int = 1,
+        stream: Optional[TextIO] = None,
+        environment: Optional[str] = None,
+        fingerprint: bool = False,
+        **kwargs,
+    ) -> None:
+        """
+        Display multiple dependency reports as newline-delimited JSON.
+
+        Every line is a complete report, including the build tools and platform
+        information, such that lines can be processed independently.
+
+        Args:
+            reports: A sequence of dependency report instances.
+            max_depth:  The maximum desired depth (default 1).
+            stream: The text stream to write to (default `sys.stdout`).
+            environment: An optional description of the environment that the reports
+                were created for, for example, its location.
+            fingerprint: Whether to include the fingerprint of the environment, if
+                known (default false). Computing it stats every indexed
+                distribution.
+            **kwargs: Keyword arguments are ignored.
+
+        """
+        if stream is None:
+            stream = sys.stdout
+        # Reports created together share their fingerprint, so we compute each
+        # digest once.
+        digests: Dict[int, str] = {}
+        for report in reports:
+            digest = None
+            if fingerprint and report.fingerprint is not None:
+                key = id(report.fingerprint)
+                if key not in digests:
+                    digests[key] = report.fingerprint.digest
+                digest = digests[key]
+            stream.writelines(cls._encode(report, max_depth, environment, digest))
+
+    @classmethod
+    def _encode(
+        cls,
+        report: DependencyReport,
+        max_depth: int,
+        environment: Optional[str],
+        fingerprint: Optional[str],
+    ) -> Iterator[str]:
+        """Generate the JSON encoding of a report piece by piece."""
+        yield '{"package":'
+        yield cls._encode_package(report.root)
+        yield ',"dependencies":['
+        for index, (depth, pkg) in enumerate(
+            report.iter_requirements(max_depth=max_depth)
+        ):
+            if index > 0:
+                yield ","
+            yield cls._encode_package(pkg, depth=depth)
+        yield '],"cycles":'
+        yield json.dumps(
+            [[pkg.name for pkg in cycle] for cycle in report.cycles(max_depth)]
+        )
+        yield ',"build_tools":['
+        yield ",".join(
+            cls._encode_package(pkg)
+            for pkg in sorted(report.build_tools, key=lambda pkg: pkg.name)
+            if pkg.version is not None
+        )
+        yield '],"platform":'
+        yield json.dumps(
+            {"name": report.platform.name, "version": report.platform.version}
+        )
+        yield ',"python":'
+        yield json.dumps({"name": report.python.name, "version": report.python.version})
+        if fingerprint is not None:
+            yield ',"fingerprint":'
+            yield json.dumps(fingerprint)
+        if environment is not None:
+            yield ',"environment":'
+            yield json.dumps(environment)
+        yield "}\n"
+
+    @classmethod
+    def _encode_package(cls, pkg: Package, depth: Optional[int] = None) -> str:
+        """Encode a package's name, version, and optionally its depth."""
+        if depth is None:
+            return json.dumps({"name": pkg.name, "version": pkg.version})
+        return json.dumps({"name": pkg.name, "version": pkg.version, "depth": depth})
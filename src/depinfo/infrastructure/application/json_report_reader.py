@@ -0,0 +1,66 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a reader of reports written by the JSON display service."""
+
+
+import json
+import logging
+from typing import Iterable, Iterator, Optional, Tuple
+
+from depinfo.domain import EnvironmentIndex
+
+
+logger = logging.getLogger(__name__)
+
+
+class JsonReportReader:
+    """Define a reader of reports written by the JSON display service."""
+
+    @classmethod
+    def iter_packages(cls, lines: Iterable[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Iterate over the packages of newline-delimited JSON reports.
+
+        The reports are decoded one line at a time such that only a single report is
+        held in memory.
+
+        Args:
+            lines: Lines of JSON reports, for example, an open file.
+
+        Yields:
+            Normalized package name, version pairs of every report's root package,
+            dependencies, and build tools. Packages may occur more than once.
+            Invalid lines are skipped with a warning.
+
+        """
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                report = json.loads(line)
+                packages = [report["package"], *report["dependencies"]]
+                packages.extend(report["build_tools"])
+                pairs = [
+                    (EnvironmentIndex.normalize_name(pkg["name"]), pkg["version"])
+                    for pkg in packages
+                ]
+            except (ValueError, KeyError, TypeError) as error:
+                logger.warning(
+                    f"Skipping invalid report on line {number} of "
+                    f"'{getattr(lines, 'name', '<input>')}': {error!r}"
+                )
+                continue
+            yield from pairs
@@ -16,8 +16,9 @@
 """Provide a service that displays dependency information as markdown tables."""
 
 
+import sys
 from operator import itemgetter
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Sequence, TextIO, Tuple
 
 from depinfo.application import AbstractDisplayService
 from depinfo.domain import DependencyReport
@@ -27,46 +28,100 @@ class MarkdownTableDisplayService(AbstractDisplayService):
     """Define a service that displays dependency information as markdown tables."""
 
     @classmethod
-    def display(cls, report: DependencyReport, max_depth: int = 1, **kwargs) -> None:
+    def display(
+        cls,
+        report: DependencyReport,
+        max_depth: int = 1,
+        stream: Optional[TextIO] = None,
+        tree: bool = False,
+        **kwargs,
+    ) -> None:
         """
         Display a dependency report to a desired maximum depth as markdown tables.
 
         Args:
             report: A dependency report instance.
             max_depth:  The maximum desired depth (default 1).
+            stream: The text stream to write to (default `sys.stdout`).
+            tree: Whether to display the nested structure of the dependencies as
+                a nested list rather than a table (default false).
             **kwargs: Keyword arguments are ignored.
 
         """
+        if stream is None:
+            stream = sys.stdout
+        cls._display_packages(report, max_depth, stream, tree)
+        cls._display_environment(report, stream)
+
+    @classmethod
+    def display_all(
+        cls,
+        reports: Sequence[DependencyReport],
+        max_depth: int = 1,
+        stream: Optional[TextIO] = None,
+        tree: bool = False,
+        **kwargs,
+    ) -> None:
+        """
+        Display multiple dependency reports as markdown tables.
+
+        Each report's package and dependency information is displayed in turn, followed
+        by the build tools and platform information that all reports share.
+
+        Args:
+            reports: A sequence of dependency report instances.
+            max_depth:  The maximum desired depth (default 1).
+            stream: The text stream to write to (default `sys.stdout`).
+            tree: Whether to display the nested structure of the dependencies as
+                a nested list rather than a table (default false).
+            **kwargs: Keyword arguments are ignored.
+
+        """
+        if stream is None:
+            stream = sys.stdout
+        for report in reports:
+            cls._display_packages(report, max_depth, stream, tree)
+        if reports:
+            cls._display_environment(reports[0], stream)
+
+    @classmethod
+    def _display_packages(
+        cls, report: DependencyReport, max_depth: int, stream: TextIO, tree: bool
+    ) -> None:
+        """Display the root package and its dependencies."""
         assert report.root.version is not None  # noqa: S101
-        print(
-            "\n".join(
-                [
-                    "",
-                    "### Package Information",
-                    "",
-                    *cls._format_table(
-                        ["Package", "Version"],
-                        [(report.root.name, report.root.version)],
-                    ),
-                ]
+        stream.writelines(
+            cls._format_section(
+                "Package Information",
+                ["Package", "Version"],
+                [(report.root.name, report.root.version)],
             )
         )
-        requirements = sorted(
-            report.iter_unique_requirements(
-                missing_version="**missing**", max_depth=max_depth
-            ),
-            key=itemgetter(0),
-        )
-        print(
-            "\n".join(
-                [
-                    "",
-                    "### Dependency Information",
-                    "",
-                    *cls._format_table(["Package", "Version"], requirements),
-                ]
+        if tree:
+            stream.write("\n### Dependency Information\n\n")
+            stream.writelines(cls._format_tree(report, max_depth))
+        else:
+            requirements = sorted(
+                report.iter_unique_requirements(
+                    missing_version="**missing**", max_depth=max_depth
+                ),
+                key=itemgetter(0),
             )
-        )
+            stream.writelines(
+                cls._format_section(
+                    "Dependency Information", ["Package", "Version"], requirements
+                )
+            )
+        cycles = report.cycles(max_depth)
+        if cycles:
+            stream.write("\n### Dependency Cycles\n\n")
+            stream.writelines(
+                f"- {', '.join(pkg.name for pkg in cycle)}\n" for cycle in cycles
+            )
+
+    @classmethod
+    def _display_environment(cls, report: DependencyReport, stream: TextIO) -> None:
+        """Display the build tools and platform information."""
         tools = sorted(
             (
                 (pkg.name, pkg.version)
@@ -75,48 +130,50 @@ class MarkdownTableDisplayService(AbstractDisplayService):
             ),
             key=itemgetter(0),
         )
-        print(
-            "\n".join(
-                [
-                    "",
-                    "### Build Tools Information",
-                    "",
-                    *cls._format_table(["Package", "Version"], tools),
-                ]
+        stream.writelines(
+            cls._format_section(
+                "Build Tools Information", ["Package", "Version"], tools
             )
         )
-        print(
-            "\n".join(
+        stream.writelines(
+            cls._format_section(
+                "Platform Information",
+                ["", ""],
                 [
-                    "",
-                    "### Platform Information",
-                    "",
-                    *cls._format_table(
-                        ["", ""],
-                        [
-                            (report.platform.name, report.platform.version),
-                            (report.python.name, report.python.version),
-                        ],
-                    ),
-                ]
+                    (report.platform.name, report.platform.version),
+                    (report.python.name, report.python.version),
+                ],
             )
         )
 
+    @classmethod
+    def _format_section(
+        cls, title: str, header: List[str], pairs: List[Tuple[str, str]]
+    ) -> Iterator[str]:
+        """Generate the lines of a report section with a title and a table."""
+        yield "\n"
+        yield f"### {title}\n"
+        yield "\n"
+        yield from cls._format_table(header, pairs)
+
+    @classmethod
+    def _format_tree(cls, report: DependencyReport, max_depth: int) -> Iterator[str]:
+        """Generate the lines of a dependency tree as a nested list."""
+        for depth, pkg, _, is_reference in report.iter_tree(max_depth=max_depth):
+            version = "**missing**" if pkg.version is None else pkg.version
+            reference = " (see above)" if is_reference else ""
+            yield f"{'  ' * (depth - 1)}- {pkg.name} {version}{reference}\n"
+
     @classmethod
     def _format_table(
         cls, header: List[str], pairs: List[Tuple[str, str]]
-    ) -> List[str]:
-        """Format pairs of information as a markdown table with two columns."""
+    ) -> Iterator[str]:
+        """Generate pairs of information as lines of a markdown table."""
         if not pairs:
-            return []
+            return
         max_len_name = max(max((len(pair[0]) for pair in pairs)), len(header[0]))
         max_len_version = max(max((len(pair[1]) for pair in pairs)), len(header[1]))
-        result = [
-            f"| {header[0]:^{max_len_name}} | {header[1]:^{max_len_version}} |",
-            f"|:{'-' * max_len_name}-|-{'-' * max_len_version}:|",
-        ]
-        result.extend(
-            f"| {name:<{max_len_name}} | {version:>{max_len_version}} |"
-            for name, version in pairs
-        )
-        return result
+        yield f"| {header[0]:^{max_len_name}} | {header[1]:^{max_len_version}} |\n"
+        yield f"|:{'-' * max_len_name}-|-{'-' * max_len_version}:|\n"
+        for name, version in pairs:
+            yield f"| {name:<{max_len_name}} | {version:>{max_len_version}} |\n"
@@ -0,0 +1,231 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a server that answers report requests over a Unix domain socket."""
+
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+from collections import OrderedDict
+from io import StringIO
+from pathlib import Path
+from typing import Any, ClassVar, Dict, Optional, Tuple
+
+from depinfo.application import DisplayApplication, DisplayFormat
+from depinfo.application.display_application import DEFAULT_BUILD_TOOLS
+from depinfo.domain import EnvironmentIndex
+from depinfo.infrastructure.domain import JSONMetadataCache
+
+
+logger = logging.getLogger(__name__)
+
+
+class ReportServer:
+    """
+    Define a server that answers report requests over a Unix domain socket.
+
+    The server keeps an index of the installed distributions and their metadata in
+    memory. Before answering a request, it checks whether any search path changed and,
+    if so, scans the search paths again. Since metadata are stamped, only those of
+    distributions that were installed or upgraded are read again. Rendered reports are
+    kept until the environment changes.
+
+    Each connection carries a single request: one line of at most `max_request_size`
+    bytes with a JSON object of the following optional keys. The server answers with
+    the report in the requested format and closes the connection, or answers with a
+    line starting with `error:`.
+
+    * `package`: The package's distribution name.
+    * `all`: Whether to report on every installed package instead (default false).
+    * `format`: The name of a display format (default `Simple`).
+    * `max_depth`: The maximum depth of nested dependencies (default 1).
+    * `build_tools`: A list of build tools (default as in the application).
+    * `include_inactive`: Whether to include inactive requirements (default false).
+
+    The socket is only accessible to the user running the server.
+
+    """
+
+    max_request_size: ClassVar[int] = 64 * 1024
+
+    def __init__(
+        self,
+        path: Path,
+        max_depth_limit: Optional[int] = None,
+        max_responses: int = 128,
+    ) -> None:
+        """
+        Initialize a report server for a socket path.
+
+        Args:
+            path: The location of the Unix domain socket.
+            max_depth_limit: If given, the maximum depth of requests must be less.
+            max_responses: The number of rendered reports to keep.
+
+        """
+        self.path = path
+        self.max_depth_limit = max_depth_limit
+        self.max_responses = max_responses
+        self._lock = threading.Lock()
+        self._index = EnvironmentIndex.create()
+        self._cache = JSONMetadataCache(path=None)
+        self._responses: "OrderedDict[Tuple, str]" = OrderedDict()
+
+    def _refresh(self) -> EnvironmentIndex:
+        """Return the current index and forget reports derived from a stale one."""
+        with self._lock:
+            index = self._index.refresh()
+            if index is not self._index:
+                logger.info("The environment changed; reports are created anew.")
+                self._index = index
+                self._responses.clear()
+            return index
+
+    @classmethod
+    def _parse_request(cls, request: Dict[str, Any]) -> Tuple:
+        """Return a request's normalized parameters."""
+        if not isinstance(request, dict):
+            raise ValueError("The request must be a JSON object.")
+        package = request.get("package")
+        if package is not None and not isinstance(package, str):
+            raise ValueError("The package name must be a string.")
+        report_all = bool(request.get("all", False))
+        if (package is None) is not report_all:
+            raise ValueError("Please provide either a package name or 'all'.")
+        display_format = DisplayFormat(
+            request.get("format", DisplayFormat.Simple.value)
+        )
+        max_depth = request.get("max_depth", 1)
+        if not isinstance(max_depth, int) or max_depth < 0:
+            raise ValueError("The maximum depth must be an integer >=0.")
+        build_tools = request.get("build_tools", list(DEFAULT_BUILD_TOOLS))
+        # Strings are iterable, too, but would be split into characters.
+        if not isinstance(build_tools, list) or not all(
+            isinstance(name, str) for name in build_tools
+        ):
+            raise ValueError("The build tools must be a list of package names.")
+        include_inactive = bool(request.get("include_inactive", False))
+        return (
+            package,
+            report_all,
+            display_format,
+            max_depth,
+            tuple(build_tools),
+            include_inactive,
+        )
+
+    def respond(self, request: Dict[str, Any]) -> str:
+        """
+        Return the rendered report for a request.
+
+        Args:
+            request: The request parameters as described for the class.
+
+        Returns:
+            The report in the requested display format.
+
+        Raises:
+            ValueError: If the request is invalid.
+
+        """
+        key = self._parse_request(request)
+        package, report_all, display_format, max_depth, build_tools, inactive = key
+        if self.max_depth_limit is not None and max_depth >= self.max_depth_limit:
+            raise ValueError(f"The maximum depth must be <{self.max_depth_limit}.")
+        index = self._refresh()
+        with self._lock:
+            response = self._responses.get(key)
+            if response is not None:
+                self._responses.move_to_end(key)
+                return response
+        stream = StringIO()
+        options = {
+            "display_format": display_format,
+            "build_tools": build_tools,
+            "max_depth": max_depth,
+            "cache": self._cache,
+            "include_inactive": inactive,
+            "stream": stream,
+            "index": index,
+        }
+        if report_all:
+            DisplayApplication.run_all(**options)
+        else:
+            DisplayApplication.run(package_name=package, **options)
+        response = stream.getvalue()
+        with self._lock:
+            if index is self._index:
+                self._responses[key] = response
+                while len(self._responses) > self.max_responses:
+                    self._responses.popitem(last=False)
+        return response
+
+    def serve_forever(self) -> None:
+        """Answer requests until interrupted and remove the socket afterwards."""
+        if self.path.exists():
+            # A socket file may be left over from a server that did not exit cleanly.
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(str(self.path))
+                except OSError:
+                    self.path.unlink()
+                else:
+                    raise OSError(f"Another server is listening on '{self.path}'.")
+        with _UnixServer(str(self.path), _RequestHandler) as server:
+            server.report_server = self
+            logger.info(f"Serving reports on '{self.path}'.")
+            try:
+                server.serve_forever()
+            finally:
+                os.unlink(self.path)
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Define a threaded Unix domain socket server with a reference to the reports."""
+
+    daemon_threads = True
+    report_server: ReportServer
+
+    def server_bind(self) -> None:
+        """Bind the socket and restrict its access to the current user."""
+        super().server_bind()
+        # The server only listens after binding, so no connection is accepted
+        # before the permissions are restricted.
+        os.chmod(self.socket.getsockname(), 0o600)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Define a handler of single-line JSON report requests."""
+
+    server: _UnixServer
+
+    def handle(self) -> None:
+        """Read a request and write the report or an error message."""
+        try:
+            limit = self.server.report_server.max_request_size
+            # Reading one byte more than the limit reveals requests exceeding it.
+            line = self.rfile.readline(limit + 1)
+            if len(line) > limit:
+                raise ValueError(f"The request exceeds {limit:,} bytes.")
+            request = json.loads(line)
+            response = self.server.report_server.respond(request)
+        except Exception as error:  # noqa: B902
+            logger.debug("Failed to answer a request.", exc_info=True)
+            response = f"error: {error}\n"
+        self.wfile.write(response.encode("utf-8"))
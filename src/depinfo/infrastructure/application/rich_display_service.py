@@ -0,0 +1,177 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a service that displays dependency information with rich."""
+
+
+import sys
+from operator import attrgetter
+from typing import Iterator, List, Optional, Sequence, TextIO
+
+from rich.console import Console, ConsoleOptions, RenderResult
+from rich.table import Table
+from rich.text import Text
+
+from depinfo.application import AbstractDisplayService
+from depinfo.domain import DependencyReport, Package
+
+
+class RichDisplayService(AbstractDisplayService):
+    """
+    Define a service that displays dependency information with rich.
+
+    The dependencies are shown as a tree up to the maximum depth in which each
+    package's requirements are expanded only once (see
+    `DependencyReport.iter_tree`). The tree's lines are generated while they are
+    rendered instead of building all nodes up front.
+
+    """
+
+    @classmethod
+    def display(
+        cls,
+        report: DependencyReport,
+        max_depth: int = 1,
+        stream: Optional[TextIO] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Display a dependency report to a desired maximum depth with rich.
+
+        Args:
+            report: A dependency report instance.
+            max_depth:  The maximum desired depth (default 1).
+            stream: The text stream to write to (default `sys.stdout`).
+            **kwargs: Keyword arguments are ignored.
+
+        """
+        console = Console(file=sys.stdout if stream is None else stream)
+        cls._display_packages(console, report, max_depth)
+        cls._display_environment(console, report)
+
+    @classmethod
+    def display_all(
+        cls,
+        reports: Sequence[DependencyReport],
+        max_depth: int = 1,
+        stream: Optional[TextIO] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Display multiple dependency reports with rich.
+
+        Each report's dependency tree is displayed in turn, followed by the build
+        tools and platform information that all reports share.
+
+        Args:
+            reports: A sequence of dependency report instances.
+            max_depth:  The maximum desired depth (default 1).
+            stream: The text stream to write to (default `sys.stdout`).
+            **kwargs: Keyword arguments are ignored.
+
+        """
+        console = Console(file=sys.stdout if stream is None else stream)
+        for report in reports:
+            cls._display_packages(console, report, max_depth)
+        if reports:
+            cls._display_environment(console, reports[0])
+
+    @classmethod
+    def _display_packages(
+        cls, console: Console, report: DependencyReport, max_depth: int
+    ) -> None:
+        """Display the root package and its dependency tree."""
+        console.print()
+        console.print(DependencyTree(report, max_depth))
+        cycles = report.cycles(max_depth)
+        if cycles:
+            console.print()
+            console.print(Text("Dependency Cycles", style="bold"))
+            for cycle in cycles:
+                console.print(
+                    Text(", ").join(cls.label(pkg) for pkg in cycle), highlight=False
+                )
+
+    @classmethod
+    def _display_environment(cls, console: Console, report: DependencyReport) -> None:
+        """Display the build tools and platform information."""
+        tools = Table("Package", "Version")
+        for pkg in sorted(report.build_tools, key=attrgetter("name")):
+            if pkg.version is not None:
+                tools.add_row(pkg.name, pkg.version)
+        platform = Table(show_header=False)
+        platform.add_row(report.platform.name, report.platform.version)
+        platform.add_row(report.python.name, report.python.version)
+        console.print()
+        console.print(Text("Build Tools Information", style="bold"))
+        console.print(tools)
+        console.print()
+        console.print(Text("Platform Information", style="bold"))
+        console.print(platform)
+
+    @classmethod
+    def label(cls, pkg: Package) -> Text:
+        """Return a package's name and version, highlighting a missing version."""
+        if pkg.version is None:
+            return Text.assemble(pkg.name, " ", ("missing", "bold red"))
+        return Text.assemble(pkg.name, " ", (pkg.version, "green"))
+
+
+class DependencyTree:
+    """
+    Define a renderable tree of a report's nested requirements.
+
+    Attributes:
+        report: A dependency report instance.
+        max_depth: The maximum depth of requirements nesting to display.
+
+    """
+
+    def __init__(self, report: DependencyReport, max_depth: int) -> None:
+        """
+        Initialize a tree of the report's requirements.
+
+        Args:
+            report: A dependency report instance.
+            max_depth: The maximum depth of requirements nesting to display.
+
+        """
+        self.report = report
+        self.max_depth = max_depth
+
+    def __rich_console__(
+        self, console: Console, options: ConsoleOptions
+    ) -> RenderResult:
+        """Render the tree line by line."""
+        title = Text.assemble(("Dependency Information", "bold"), " of ")
+        yield title + RichDisplayService.label(self.report.root)
+        for line in self.iter_lines():
+            line.no_wrap = True
+            line.overflow = "ellipsis"
+            yield line
+
+    def iter_lines(self) -> Iterator[Text]:
+        """Generate the tree's lines in depth-first order."""
+        guides: List[str] = []
+        for depth, pkg, is_last, is_reference in self.report.iter_tree(
+            max_depth=self.max_depth
+        ):
+            del guides[depth - 1 :]
+            label = RichDisplayService.label(pkg)
+            if is_reference:
+                label.append(" (see above)", style="dim")
+            branch = "└── " if is_last else "├── "
+            yield Text("".join(guides) + branch, style="dim") + label
+            guides.append("    " if is_last else "│   ")
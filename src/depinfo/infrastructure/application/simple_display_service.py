@@ -16,8 +16,9 @@
 """Provide a service that displays dependency information as simple tables."""
 
 
+import sys
 from operator import itemgetter
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Sequence, TextIO, Tuple
 
 from depinfo.application import AbstractDisplayService
 from depinfo.domain import DependencyReport
@@ -27,34 +28,99 @@ class SimpleDisplayService(AbstractDisplayService):
     """Define a service that displays dependency information as simple tables."""
 
     @classmethod
-    def display(cls, report: DependencyReport, max_depth: int = 1, **kwargs) -> None:
+    def display(
+        cls,
+        report: DependencyReport,
+        max_depth: int = 1,
+        stream: Optional[TextIO] = None,
+        tree: bool = False,
+        **kwargs,
+    ) -> None:
         """
         Display a dependency report to a desired maximum depth as simple tables.
 
         Args:
             report: A dependency report instance.
             max_depth:  The maximum desired depth (default 1).
+            stream: The text stream to write to (default `sys.stdout`).
+            tree: Whether to display the nested structure of the dependencies
+                rather than a flat table (default false).
             **kwargs: Keyword arguments are ignored.
 
         """
+        if stream is None:
+            stream = sys.stdout
+        cls._display_packages(report, max_depth, stream, tree)
+        cls._display_environment(report, stream)
+
+    @classmethod
+    def display_all(
+        cls,
+        reports: Sequence[DependencyReport],
+        max_depth: int = 1,
+        stream: Optional[TextIO] = None,
+        tree: bool = False,
+        **kwargs,
+    ) -> None:
+        """
+        Display multiple dependency reports as simple tables.
+
+        Each report's package and dependency information is displayed in turn, followed
+        by the build tools and platform information that all reports share.
+
+        Args:
+            reports: A sequence of dependency report instances.
+            max_depth:  The maximum desired depth (default 1).
+            stream: The text stream to write to (default `sys.stdout`).
+            tree: Whether to display the nested structure of the dependencies
+                rather than a flat table (default false).
+            **kwargs: Keyword arguments are ignored.
+
+        """
+        if stream is None:
+            stream = sys.stdout
+        for report in reports:
+            cls._display_packages(report, max_depth, stream, tree)
+        if reports:
+            cls._display_environment(reports[0], stream)
+
+    @classmethod
+    def _display_packages(
+        cls, report: DependencyReport, max_depth: int, stream: TextIO, tree: bool
+    ) -> None:
+        """Display the root package and its dependencies."""
         assert report.root.version is not None  # noqa: S101
-        print(
+        stream.writelines(
             cls._format_section(
                 "Package Information", [(report.root.name, report.root.version)]
             )
         )
-        print(
-            cls._format_section(
-                "Dependency Information",
-                sorted(
-                    report.iter_unique_requirements(
-                        missing_version="missing", max_depth=max_depth
+        if tree:
+            stream.writelines(cls._format_title("Dependency Information"))
+            stream.writelines(cls._format_tree(report, max_depth))
+        else:
+            stream.writelines(
+                cls._format_section(
+                    "Dependency Information",
+                    sorted(
+                        report.iter_unique_requirements(
+                            missing_version="missing", max_depth=max_depth
+                        ),
+                        key=itemgetter(0),
                     ),
-                    key=itemgetter(0),
-                ),
+                )
             )
-        )
-        print(
+        cycles = report.cycles(max_depth)
+        if cycles:
+            stream.writelines(cls._format_title("Dependency Cycles"))
+            stream.writelines(
+                f"{', '.join(pkg.name for pkg in cycle)}\n" for cycle in cycles
+            )
+
+    @classmethod
+    def _display_environment(cls, report: DependencyReport, stream: TextIO) -> None:
+        """Display the build tools and platform information."""
+        stream.writelines(
             cls._format_section(
                 "Build Tools Information",
                 sorted(
@@ -67,7 +133,7 @@ class SimpleDisplayService(AbstractDisplayService):
                 ),
             )
         )
-        print(
+        stream.writelines(
             cls._format_section(
                 "Platform Information",
                 [
@@ -78,25 +144,36 @@ class SimpleDisplayService(AbstractDisplayService):
         )
 
     @classmethod
-    def _format_section(cls, title: str, pairs: List[Tuple[str, str]]) -> str:
-        """Format a report section with a title."""
-        return "\n".join(
-            [
-                "",
-                title,
-                "-" * len(title),
-                *cls._format_pairs(pairs),
-            ]
-        )
+    def _format_section(cls, title: str, pairs: List[Tuple[str, str]]) -> Iterator[str]:
+        """Generate the lines of a report section with a title."""
+        yield from cls._format_title(title)
+        yield from cls._format_pairs(pairs)
+
+    @classmethod
+    def _format_title(cls, title: str) -> Iterator[str]:
+        """Generate the lines of an underlined section title."""
+        yield "\n"
+        yield f"{title}\n"
+        yield f"{'-' * len(title)}\n"
+
+    @classmethod
+    def _format_tree(cls, report: DependencyReport, max_depth: int) -> Iterator[str]:
+        """Generate the lines of a dependency tree with ASCII guides."""
+        guides: List[str] = []
+        for depth, pkg, is_last, is_reference in report.iter_tree(max_depth=max_depth):
+            del guides[depth - 1 :]
+            version = "missing" if pkg.version is None else pkg.version
+            reference = " (see above)" if is_reference else ""
+            branch = "`-- " if is_last else "|-- "
+            yield f"{''.join(guides)}{branch}{pkg.name} {version}{reference}\n"
+            guides.append("    " if is_last else "|   ")
 
     @classmethod
-    def _format_pairs(cls, pairs: List[Tuple[str, str]]) -> List[str]:
-        """Format pairs as two fixed width, left- and right-aligned columns."""
+    def _format_pairs(cls, pairs: List[Tuple[str, str]]) -> Iterator[str]:
+        """Generate pairs as two fixed width, left- and right-aligned columns."""
         if not pairs:
-            return []
+            return
         max_len_name = max((len(pair[0]) for pair in pairs))
         max_len_version = max((len(pair[1]) for pair in pairs))
-        return [
-            f"{name:<{max_len_name}} {version:>{max_len_version}}"
-            for name, version in pairs
-        ]
+        for name, version in pairs:
+            yield f"{name:<{max_len_name}} {version:>{max_len_version}}\n"
@@ -0,0 +1,193 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a service that displays dependency information in a terminal app."""
+
+
+import sys
+from typing import Optional, Sequence, TextIO
+
+from rich.text import Text
+from textual.app import App, ComposeResult
+from textual.widgets import Footer, Static, Tree
+from textual.widgets.tree import TreeNode
+
+from depinfo.application import AbstractDisplayService
+from depinfo.domain import DependencyReport
+
+from .rich_display_service import RichDisplayService
+
+
+class TextualDisplayService(AbstractDisplayService):
+    """
+    Define a service that displays dependency information in a terminal app.
+
+    The reports are shown as an interactive tree whose nodes load their
+    requirements only when they are expanded. Since the tree widget renders only
+    the visible rows, even environments with thousands of packages stay responsive.
+    If the stream is not an interactive terminal, for example, because the output
+    is redirected, the reports are displayed by the `RichDisplayService` instead.
+
+    """
+
+    @classmethod
+    def display(
+        cls,
+        report: DependencyReport,
+        max_depth: int = 1,
+        stream: Optional[TextIO] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Display a dependency report in a terminal app.
+
+        Args:
+            report: A dependency report instance.
+            max_depth:  The depth up to which the tree is initially expanded
+                (default 1).
+            stream: The text stream to write to (default `sys.stdout`).
+            **kwargs: Keyword arguments are ignored.
+
+        """
+        cls.display_all([report], max_depth=max_depth, stream=stream, **kwargs)
+
+    @classmethod
+    def display_all(
+        cls,
+        reports: Sequence[DependencyReport],
+        max_depth: int = 1,
+        stream: Optional[TextIO] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Display multiple dependency reports in a single terminal app.
+
+        Args:
+            reports: A sequence of dependency report instances.
+            max_depth:  The depth up to which the tree of a single report is
+                initially expanded (default 1). The trees of multiple reports are
+                initially collapsed.
+            stream: The text stream to write to (default `sys.stdout`).
+            **kwargs: Keyword arguments are ignored.
+
+        """
+        if stream is None:
+            stream = sys.stdout
+        if stream is not sys.stdout or not stream.isatty():
+            if len(reports) == 1:
+                RichDisplayService.display(reports[0], max_depth, stream)
+            else:
+                RichDisplayService.display_all(reports, max_depth, stream)
+            return
+        if reports:
+            DependencyApp(reports, max_depth).run()
+
+
+class DependencyApp(App):
+    """
+    Define a terminal app that shows dependency reports as a lazily loaded tree.
+
+    Attributes:
+        reports: The dependency reports which share their packages.
+        max_depth: The depth up to which the tree of a single report is initially
+            expanded.
+
+    """
+
+    TITLE = "depinfo"
+    BINDINGS = [("q", "quit", "Quit")]
+
+    def __init__(self, reports: Sequence[DependencyReport], max_depth: int = 1) -> None:
+        """
+        Initialize the app with at least one report.
+
+        Args:
+            reports: The dependency reports which share their packages.
+            max_depth: The depth up to which the tree of a single report is
+                initially expanded.
+
+        """
+        super().__init__()
+        self.reports = reports
+        self.max_depth = max_depth
+
+    def compose(self) -> ComposeResult:
+        """Create a tree of the packages and a summary of the environment."""
+        report = self.reports[0]
+        if len(self.reports) == 1:
+            label = RichDisplayService.label(report.root)
+            tree: Tree[Optional[int]] = Tree(label, data=report.root_id())
+        else:
+            tree = Tree(f"{len(self.reports):,} installed packages")
+        tree.show_root = True
+        yield tree
+        tools = ", ".join(
+            f"{pkg.name} {pkg.version}"
+            for pkg in sorted(report.build_tools, key=lambda pkg: pkg.name)
+            if pkg.version is not None
+        )
+        yield Static(
+            f"{report.python.name} {report.python.version} on "
+            f"{report.platform.name} {report.platform.version} | {tools}"
+        )
+        yield Footer()
+
+    def on_mount(self) -> None:
+        """Populate the first levels of the tree."""
+        tree = self.query_one(Tree)
+        if len(self.reports) > 1:
+            for report in self.reports:
+                self.add_package(tree.root, report.root_id())
+            tree.root.expand()
+            return
+        # Expand each package at most once, where it occurs first, such that the
+        # initial tree grows with the number of distinct packages.
+        expanded = {tree.root.data}
+        level = [tree.root]
+        for _ in range(self.max_depth):
+            next_level = []
+            for node in level:
+                self.load(node)
+                node.expand()
+                for child in node.children:
+                    if child.allow_expand and child.data not in expanded:
+                        expanded.add(child.data)
+                        next_level.append(child)
+            level = next_level
+
+    def on_tree_node_expanded(self, event: Tree.NodeExpanded) -> None:
+        """Load the requirements of a package when its node is expanded."""
+        self.load(event.node)
+
+    def load(self, node: TreeNode) -> None:
+        """Add the requirements of a package node unless they were added before."""
+        if node.children or node.data is None:
+            return
+        graph = self.reports[0].graph
+        assert graph is not None  # noqa: S101
+        for successor in graph.successors(node.data):
+            self.add_package(node, successor)
+
+    def add_package(self, parent: TreeNode, node: Optional[int]) -> None:
+        """Add a collapsed node for a package to a parent node."""
+        if node is None:
+            return
+        graph = self.reports[0].graph
+        assert graph is not None  # noqa: S101
+        label: Text = RichDisplayService.label(graph.packages[node])
+        if graph.successors(node):
+            parent.add(label, data=node)
+        else:
+            parent.add_leaf(label, data=node)
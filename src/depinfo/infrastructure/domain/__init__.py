@@ -0,0 +1,32 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from typing import TYPE_CHECKING
+
+from depinfo._lazy import attach
+
+
+if TYPE_CHECKING:
+    from .json_metadata_cache import JSONMetadataCache
+    from .json_report_snapshot import JSONReportSnapshot
+
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "JSONMetadataCache": ".json_metadata_cache",
+        "JSONReportSnapshot": ".json_report_snapshot",
+    },
+)
@@ -0,0 +1,219 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide a persistent distribution metadata cache stored as a JSON file."""
+
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from depinfo.domain import AbstractMetadataCache, DistributionMetadata
+
+
+logger = logging.getLogger(__name__)
+
+
+class JSONMetadataCache(AbstractMetadataCache):
+    """
+    Define a persistent distribution metadata cache stored as a JSON file.
+
+    Entries are keyed by a distribution's metadata location and are only valid as long
+    as that location's modification time and inode number are unchanged. Installing,
+    upgrading, or removing a distribution thus invalidates its entry. Invalid entries
+    of locations that were not looked up are dropped whenever the cache is saved, such
+    that the cache file does not grow with every upgrade.
+
+    """
+
+    format_version = 1
+
+    def __init__(
+        self,
+        path: Optional[Path],
+        entries: Optional[Dict[str, Tuple[List[int], DistributionMetadata]]] = None,
+    ) -> None:
+        """
+        Initialize a cache that is persisted to the given path.
+
+        Args:
+            path: The location of the cache file or `None` for a cache that is only
+                kept in memory, for example, as part of a report snapshot.
+            entries: A map from metadata locations to their stamps and metadata.
+
+        """
+        self.path = path
+        self._entries = {} if entries is None else entries
+        self._modified = False
+        self._seen: Set[str] = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def default_path(cls) -> Path:
+        """Return the default cache file location in the user's cache directory."""
+        if sys.platform == "win32":
+            base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+        elif sys.platform == "darwin":
+            base = os.path.expanduser("~/Library/Caches")
+        else:
+            base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+        return Path(base, "depinfo", "metadata.json")
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> JSONMetadataCache:
+        """
+        Load a cache from the given path.
+
+        A missing or unreadable cache file results in an empty cache.
+
+        Args:
+            path: The location of the cache file (default in the user's cache
+                directory).
+
+        Returns:
+            A cache instance.
+
+        """
+        if path is None:
+            path = cls.default_path()
+        try:
+            with path.open(encoding="utf-8") as handle:
+                content = json.load(handle)
+        except FileNotFoundError:
+            return cls(path=path)
+        except (OSError, ValueError) as error:
+            logger.warning(f"Ignoring unreadable metadata cache '{path}': {error}")
+            return cls(path=path)
+        return cls.from_json(path, content)
+
+    @classmethod
+    def from_json(
+        cls, path: Optional[Path], content: Dict[str, Any]
+    ) -> JSONMetadataCache:
+        """
+        Return a cache from its JSON representation.
+
+        Args:
+            path: The location of the cache file or `None` for a cache that is only
+                kept in memory.
+            content: The cache's JSON representation as returned by `to_json`.
+
+        Returns:
+            A cache instance which is empty if the representation is of a different
+            format.
+
+        """
+        if content.get("format_version") != cls.format_version:
+            logger.info(f"Ignoring metadata cache '{path}' of a different format.")
+            return cls(path=path)
+        return cls(
+            path=path,
+            entries={
+                location: (
+                    entry["stamp"],
+                    DistributionMetadata(
+                        name=entry["name"],
+                        version=entry["version"],
+                        requires=entry["requires"],
+                    ),
+                )
+                for location, entry in content["entries"].items()
+            },
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        """Return the cache's JSON representation."""
+        with self._lock:
+            return {
+                "format_version": self.format_version,
+                "entries": {
+                    location: {"stamp": stamp, **metadata._asdict()}
+                    for location, (stamp, metadata) in self._entries.items()
+                },
+            }
+
+    def save(self) -> None:
+        """Write the cache to its path if any entries were added or replaced."""
+        if self.path is None or not self._modified:
+            return
+        self._prune()
+        content = self.to_json()
+        # The module is imported here because it is comparatively slow to import
+        # and only needed when the cache was modified.
+        import tempfile
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first such that concurrent runs never observe
+        # a partially written cache.
+        descriptor, temporary = tempfile.mkstemp(
+            dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as handle:
+                json.dump(content, handle, separators=(",", ":"))
+            os.replace(temporary, self.path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+        self._modified = False
+
+    def _prune(self) -> None:
+        """Drop the entries of locations that were not looked up and are invalid."""
+        with self._lock:
+            # Entries of other environments remain as long as their location is
+            # unchanged.
+            invalid = [
+                location
+                for location, (stamp, _) in self._entries.items()
+                if location not in self._seen and self._stamp(Path(location)) != stamp
+            ]
+            for location in invalid:
+                del self._entries[location]
+
+    def get(self, location: Path) -> Optional[DistributionMetadata]:
+        """Return the cached metadata for a location if it is still valid."""
+        self._seen.add(str(location))
+        entry = self._entries.get(str(location))
+        if entry is None:
+            return None
+        stamp, metadata = entry
+        if stamp != self._stamp(location):
+            return None
+        return metadata
+
+    def set(self, location: Path, metadata: DistributionMetadata) -> None:
+        """Store the metadata read from a location together with its stamp."""
+        stamp = self._stamp(location)
+        if stamp is None:
+            return
+        with self._lock:
+            self._seen.add(str(location))
+            self._entries[str(location)] = (stamp, metadata)
+            self._modified = True
+
+    @classmethod
+    def _stamp(cls, location: Path) -> Optional[List[int]]:
+        """Return a location's modification time and inode number if it exists."""
+        try:
+            stat = os.stat(location)
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_ino]
@@ -0,0 +1,253 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Provide snapshots of dependency reports that are stored as JSON files."""
+
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from depinfo.domain import (
+    DependencyReport,
+    EnvironmentIndex,
+    Package,
+    PackageGraph,
+    Platform,
+    Python,
+)
+
+from .json_metadata_cache import JSONMetadataCache
+
+
+@dataclass(frozen=True)
+class JSONReportSnapshot:
+    """
+    Define a snapshot of dependency reports that is stored as a JSON file.
+
+    Besides the reports and the parameters they were created with, a snapshot records
+    the metadata of every distribution that was read, stamped like the entries of a
+    `JSONMetadataCache`. Taking the snapshot again, for example, to compare it with
+    the live environment, thus only reads the metadata of distributions that were
+    installed, upgraded, or removed in the meantime.
+
+    Attributes:
+        reports: The dependency reports which share their packages.
+        roots: The PEP 503 normalized names of the reports' root packages or `None`
+            if the reports cover every installed distribution.
+        build_tools: The PEP 503 normalized names of the build tools.
+        max_depth: The maximum depth of requirements nesting.
+        include_inactive: Whether inactive requirements were followed.
+        cache: The metadata of all distributions read for the reports.
+
+    """
+
+    format_version = 1
+
+    reports: List[DependencyReport]
+    roots: Optional[List[str]]
+    build_tools: List[str]
+    max_depth: int
+    include_inactive: bool
+    cache: JSONMetadataCache
+
+    @classmethod
+    def create(
+        cls,
+        roots: Optional[Iterable[str]],
+        build_tools: Iterable[str],
+        max_depth: int = 1,
+        include_inactive: bool = False,
+        max_workers: Optional[int] = None,
+        index: Optional[EnvironmentIndex] = None,
+        cache: Optional[JSONMetadataCache] = None,
+    ) -> JSONReportSnapshot:
+        """
+        Create a snapshot of the current environment.
+
+        Args:
+            roots: The distribution names of the root packages or `None` for every
+                installed distribution.
+            build_tools: A list of build packages to include.
+            max_depth: The maximum desired depth of requirements nesting.
+            include_inactive: Whether to follow requirements whose environment
+                markers do not apply to the running interpreter.
+            max_workers: If given, load package metadata concurrently using this many
+                threads.
+            index: An index of the installed distributions. If none is given, the
+                current environment is scanned.
+            cache: Previously recorded metadata to reuse where it is still valid. It
+                is updated with the metadata of changed distributions. By default, a
+                new cache is used.
+
+        Returns:
+            A snapshot instance.
+
+        """
+        if index is None:
+            index = EnvironmentIndex.create()
+        if cache is None:
+            cache = JSONMetadataCache(path=None)
+        build_tools = [EnvironmentIndex.normalize_name(name) for name in build_tools]
+        if roots is not None:
+            roots = [EnvironmentIndex.normalize_name(name) for name in roots]
+        reports = DependencyReport.from_roots(
+            roots=sorted(index.locations) if roots is None else roots,
+            build_tools=build_tools,
+            max_depth=max_depth,
+            index=index,
+            cache=cache,
+            max_workers=max_workers,
+            include_inactive=include_inactive,
+        )
+        return cls(
+            reports=reports,
+            roots=roots,
+            build_tools=build_tools,
+            max_depth=max_depth,
+            include_inactive=include_inactive,
+            cache=cache,
+        )
+
+    def retake(
+        self,
+        max_workers: Optional[int] = None,
+        index: Optional[EnvironmentIndex] = None,
+    ) -> JSONReportSnapshot:
+        """
+        Take the snapshot again, with the same parameters, in the current environment.
+
+        Args:
+            max_workers: If given, load package metadata concurrently using this many
+                threads.
+            index: An index of the installed distributions. If none is given, the
+                current environment is scanned.
+
+        Returns:
+            A new snapshot instance. Only the metadata of distributions that changed
+            since this snapshot was taken are read.
+
+        """
+        return self.create(
+            roots=self.roots,
+            build_tools=self.build_tools,
+            max_depth=self.max_depth,
+            include_inactive=self.include_inactive,
+            max_workers=max_workers,
+            index=index,
+            cache=JSONMetadataCache.from_json(path=None, content=self.cache.to_json()),
+        )
+
+    @property
+    def packages(self) -> Dict[str, Package]:
+        """Return the map from package names to instances shared by all reports."""
+        return self.reports[0].packages if self.reports else {}
+
+    def save(self, path: Path) -> None:
+        """
+        Write the snapshot to a JSON file.
+
+        Args:
+            path: The location of the snapshot file.
+
+        """
+        first = self.reports[0] if self.reports else None
+        keys = {id(pkg): key for key, pkg in self.packages.items()}
+        content = {
+            "format_version": self.format_version,
+            "roots": self.roots,
+            "build_tools": self.build_tools,
+            "max_depth": self.max_depth,
+            "include_inactive": self.include_inactive,
+            "platform": None if first is None else list(first.platform),
+            "python": None if first is None else list(first.python),
+            "packages": {
+                key: [pkg.name, pkg.version, pkg.requirements]
+                for key, pkg in self.packages.items()
+            },
+            "report_roots": [keys[id(report.root)] for report in self.reports],
+            "metadata": self.cache.to_json(),
+        }
+        # The module is imported here because it is comparatively slow to import
+        # and only needed when saving a snapshot.
+        import tempfile
+
+        # Write to a temporary file first such that an interrupted run never leaves
+        # a partially written snapshot behind.
+        descriptor, temporary = tempfile.mkstemp(
+            dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as handle:
+                json.dump(content, handle, separators=(",", ":"))
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    @classmethod
+    def load(cls, path: Path) -> JSONReportSnapshot:
+        """
+        Read a snapshot from a JSON file.
+
+        Args:
+            path: The location of the snapshot file.
+
+        Returns:
+            A snapshot instance.
+
+        Raises:
+            ValueError: If the file is not a snapshot of the supported format.
+
+        """
+        with path.open(encoding="utf-8") as handle:
+            content = json.load(handle)
+        if not isinstance(content, dict) or content.get("format_version") != (
+            cls.format_version
+        ):
+            raise ValueError(f"'{path}' is not a snapshot of a supported format.")
+        packages = {
+            key: Package(name=name, version=version, requirements=requirements)
+            for key, (name, version, requirements) in content["packages"].items()
+        }
+        graph = PackageGraph.from_packages(packages)
+        build_tools = [packages[name] for name in content["build_tools"]]
+        reports = []
+        if content["report_roots"]:
+            platform = Platform(*content["platform"])
+            python = Python(*content["python"])
+            reports = [
+                DependencyReport(
+                    root=packages[name],
+                    platform=platform,
+                    python=python,
+                    build_tools=build_tools,
+                    packages=packages,
+                    graph=graph,
+                )
+                for name in content["report_roots"]
+            ]
+        return cls(
+            reports=reports,
+            roots=content["roots"],
+            build_tools=content["build_tools"],
+            max_depth=content["max_depth"],
+            include_inactive=content["include_inactive"],
+            cache=JSONMetadataCache.from_json(path=None, content=content["metadata"]),
+        )
@@ -16,10 +16,13 @@
 """Test the depinfo command line interface."""
 
 
+import json
+from pathlib import Path
 from typing import List
 
 import pytest
 
+from depinfo.domain import Package
 from depinfo.infrastructure.application.cli import main
 
 
@@ -41,6 +44,16 @@ def test_help(capsys, options: List[str]) -> None:
     assert "positional arguments:" in captured.out
 
 
+def test_version(capsys) -> None:
+    """Expect the installed version to be shown."""
+    with pytest.raises(SystemExit) as exc:
+        main(["--version"])
+    assert exc.value.code == 0
+
+    captured = capsys.readouterr()
+    assert captured.out.rstrip().endswith(Package.from_name("depinfo").version)
+
+
 def test_simple_format(capsys) -> None:
     """Expect the dependency information in simple format."""
     main(["depinfo"])
@@ -97,3 +110,343 @@ def test_too_deep(caplog) -> None:
     assert any(
         msg == "The maximum depth must be >=0 and <5." for msg in caplog.messages
     )
+
+
+def test_max_depth_all(capsys) -> None:
+    """Expect every transitive dependency with an unlimited depth."""
+    main(["--max-depth", "4", "--json", "pytest"])
+    deep = json.loads(capsys.readouterr().out)
+    main(["--max-depth", "all", "--json", "pytest"])
+    assert json.loads(capsys.readouterr().out)["dependencies"] == deep["dependencies"]
+
+
+def test_max_depth_invalid() -> None:
+    """Expect that the maximum depth is an integer or 'all'."""
+    with pytest.raises(SystemExit) as exc:
+        main(["--max-depth", "deep", "depinfo"])
+    assert exc.value.code == 2
+
+
+def test_cache(capsys, tmp_path) -> None:
+    """Expect identical output from a cold and a warm metadata cache."""
+    path = tmp_path / "cache.json"
+    main(["--cache", str(path), "depinfo"])
+    cold = capsys.readouterr().out
+    assert path.is_file()
+
+    main(["--cache", str(path), "depinfo"])
+    assert capsys.readouterr().out == cold
+
+
+def test_profile(capsys, tmp_path) -> None:
+    """Expect a profile on standard error and in a JSON file."""
+    path = tmp_path / "profile.json"
+    main(["--profile", "--profile-json", str(path), "depinfo"])
+    captured = capsys.readouterr()
+    assert "Package Information" in captured.out
+    assert "Profile" not in captured.out
+    for phase in ("discovery", "loading", "graph", "traversal", "formatting"):
+        assert phase in captured.err
+    profile = json.loads(path.read_text())
+    assert set(profile["phases"]) == {
+        "discovery",
+        "loading",
+        "graph",
+        "traversal",
+        "formatting",
+    }
+    assert profile["lookups"]["packages"] > 0
+
+
+def test_fingerprint(capsys) -> None:
+    """Expect the same fingerprint on its own and in JSON reports."""
+    main(["--fingerprint"])
+    fingerprint = capsys.readouterr().out.strip()
+    assert len(fingerprint) == 64
+
+    main(["--json", "depinfo"])
+    assert "fingerprint" not in json.loads(capsys.readouterr().out)
+
+    main(["--json", "--fingerprint", "depinfo"])
+    assert json.loads(capsys.readouterr().out)["fingerprint"] == fingerprint
+
+
+def test_tree(capsys) -> None:
+    """Expect every dependency in the tree and a flat table without the option."""
+    main(["--max-depth", "2", "pytest"])
+    flat = capsys.readouterr().out
+    main(["--tree", "--max-depth", "2", "pytest"])
+    tree = capsys.readouterr().out
+    assert tree != flat
+    for line in flat.split("Dependency Information")[1].splitlines()[2:]:
+        if not line:
+            break
+        assert f"-- {line.split()[0]} " in tree
+
+
+def test_max_workers(capsys) -> None:
+    """Expect identical output when loading metadata concurrently."""
+    main(["--max-depth", "2", "depinfo"])
+    sequential = capsys.readouterr().out
+
+    main(["--max-depth", "2", "--max-workers", "4", "depinfo"])
+    assert capsys.readouterr().out == sequential
+
+
+def test_too_few_workers(caplog) -> None:
+    """Test that at least one worker is required."""
+    with pytest.raises(SystemExit) as exc:
+        main(["--max-workers", "0", "depinfo"])
+    assert exc.value.code == 2
+
+    assert any(msg == "The number of workers must be >=1." for msg in caplog.messages)
+
+
+@pytest.mark.parametrize("options", [["--markdown", "--all"], ["--all"]])
+def test_all(capsys, options: List[str]) -> None:
+    """Expect one report per installed package and shared sections only once."""
+    main(options)
+
+    captured = capsys.readouterr()
+    assert captured.out.count("Package Information") > 1
+    assert "depinfo" in captured.out
+    assert captured.out.count("Build Tools Information") == 1
+    assert captured.out.count("Platform Information") == 1
+
+
+@pytest.mark.parametrize("options", [[], ["--all", "depinfo"]])
+def test_package_or_all(caplog, options: List[str]) -> None:
+    """Test that either a package name or the all option is required."""
+    with pytest.raises(SystemExit) as exc:
+        main(options)
+    assert exc.value.code == 2
+
+    assert any(
+        msg == "Please provide either a package name or the --all option."
+        for msg in caplog.messages
+    )
+
+
+def test_json_format(capsys) -> None:
+    """Expect the dependency information as a JSON object."""
+    main(["--json", "depinfo"])
+
+    captured = capsys.readouterr()
+    report = json.loads(captured.out)
+    assert report["package"]["name"] == "depinfo"
+    assert {"pip", "setuptools", "wheel"}.issubset(
+        tool["name"] for tool in report["build_tools"]
+    )
+
+
+def test_exclusive_formats() -> None:
+    """Expect that only one display format can be chosen."""
+    with pytest.raises(SystemExit) as exc:
+        main(["--json", "--markdown", "depinfo"])
+    assert exc.value.code == 2
+
+
+@pytest.fixture()
+def fleet(tmp_path, capsys) -> List[str]:
+    """Provide the JSON report files of three hosts, one with an older pip."""
+    main(["--json", "depinfo"])
+    report = json.loads(capsys.readouterr().out)
+    paths = []
+    for host in ("alpha", "beta", "gamma"):
+        for tool in report["build_tools"]:
+            if tool["name"] == "pip":
+                tool["version"] = "0.1" if host == "gamma" else "99.0"
+        path = tmp_path / f"{host}.ndjson"
+        path.write_text(json.dumps(report) + "\n")
+        paths.append(str(path))
+    return paths
+
+
+def test_aggregate_package(capsys, fleet: List[str]) -> None:
+    """Expect the hosts of each version of a package."""
+    main(["aggregate", "--package", "pip", *fleet])
+
+    captured = capsys.readouterr()
+    assert captured.out.splitlines() == ["99.0: alpha, beta", "0.1: gamma"]
+
+
+def test_aggregate_package_normalized(capsys, fleet: List[str]) -> None:
+    """Expect that the queried package name is normalized."""
+    main(["aggregate", "--package", "PIP", "--json", *fleet])
+
+    captured = capsys.readouterr()
+    assert json.loads(captured.out) == {
+        "package": "pip",
+        "versions": {"99.0": ["alpha", "beta"], "0.1": ["gamma"]},
+    }
+
+
+def test_aggregate_skew(capsys, fleet: List[str]) -> None:
+    """Expect the packages with more than one version."""
+    main(["aggregate", *fleet])
+
+    captured = capsys.readouterr()
+    assert captured.out.splitlines() == ["pip: 99.0 (2 hosts), 0.1 (1 host)"]
+
+
+def test_aggregate_outliers(capsys, fleet: List[str]) -> None:
+    """Expect the hosts with rare versions as JSON."""
+    main(["aggregate", "--outliers", "0.5", "--json", *fleet])
+
+    captured = capsys.readouterr()
+    assert json.loads(captured.out) == [
+        {"package": "pip", "version": "0.1", "hosts": ["gamma"]}
+    ]
+
+
+def test_aggregate_missing_file(tmp_path) -> None:
+    """Expect an error for unreadable report files."""
+    with pytest.raises(SystemExit) as exc:
+        main(["aggregate", str(tmp_path / "missing.ndjson")])
+    assert exc.value.code == 1
+
+
+def test_aggregate_duplicate_host(tmp_path, fleet: List[str]) -> None:
+    """Expect an error for report files that name the same host."""
+    other = tmp_path / "other"
+    other.mkdir()
+    duplicate = other / Path(fleet[0]).name
+    duplicate.write_text(Path(fleet[0]).read_text())
+    with pytest.raises(SystemExit) as exc:
+        main(["aggregate", *fleet, str(duplicate)])
+    assert exc.value.code == 2
+
+
+def test_command_name_as_package(capsys, tmp_path) -> None:
+    """Expect a package named like a command to be displayed after a separator."""
+    metadata = tmp_path / "why-1.0.dist-info"
+    metadata.mkdir()
+    (metadata / "METADATA").write_text(
+        "Metadata-Version: 2.1\nName: why\nVersion: 1.0\n"
+    )
+    main(["--json", "--site-packages", str(tmp_path), "--", "why"])
+    report = json.loads(capsys.readouterr().out)
+    assert report["package"] == {"name": "why", "version": "1.0"}
+
+
+def test_snapshot_diff(capsys, tmp_path) -> None:
+    """Expect no differences between a snapshot and the unchanged environment."""
+    path = tmp_path / "snapshot.json"
+    main(["snapshot", str(path), "depinfo"])
+    main(["diff", str(path)])
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+
+
+def test_diff_changed(capsys, tmp_path) -> None:
+    """Expect changed packages and a non-zero exit status."""
+    old = tmp_path / "old.json"
+    new = tmp_path / "new.json"
+    main(["snapshot", str(new), "depinfo"])
+    content = json.loads(new.read_text())
+    content["packages"]["pip"][1] = "0.1"
+    old.write_text(json.dumps(content))
+    with pytest.raises(SystemExit) as exc:
+        main(["diff", str(old), str(new)])
+    assert exc.value.code == 1
+
+    captured = capsys.readouterr()
+    assert "Changed Packages" in captured.out
+    assert any(line.startswith("pip") for line in captured.out.splitlines())
+
+
+def test_diff_invalid(tmp_path) -> None:
+    """Expect an error for files that are not snapshots."""
+    path = tmp_path / "snapshot.json"
+    path.write_text("[]")
+    with pytest.raises(SystemExit) as exc:
+        main(["diff", str(path)])
+    assert exc.value.code == 2
+
+
+def test_why(capsys) -> None:
+    """Expect the chains of requirements that lead to a package."""
+    main(["why", "iniconfig"])
+    captured = capsys.readouterr()
+    assert "pytest -> iniconfig" in captured.out.splitlines()
+
+    main(["why", "depinfo"])
+    captured = capsys.readouterr()
+    assert captured.out.startswith("depinfo is not required")
+
+
+def test_why_missing(caplog) -> None:
+    """Expect an error for packages that are not installed."""
+    with pytest.raises(SystemExit) as exc:
+        main(["why", "nonexistent-distribution"])
+    assert exc.value.code == 1
+    assert "not installed" in caplog.text
+
+
+@pytest.fixture()
+def virtual_environment(tmp_path: Path) -> Path:
+    """Provide a virtual environment of another Python version."""
+    metadata = (
+        tmp_path
+        / "lib"
+        / "python3.9"
+        / "site-packages"
+        / "crystal_ball-4.2.0.dist-info"
+    )
+    metadata.mkdir(parents=True)
+    (metadata / "METADATA").write_text(
+        "Metadata-Version: 2.1\n"
+        "Name: crystal-ball\n"
+        "Version: 4.2.0\n"
+        "Requires-Dist: tomli; python_version < '3.11'\n"
+    )
+    (tmp_path / "pyvenv.cfg").write_text("version = 3.9.16\n")
+    return tmp_path
+
+
+def test_env(capsys, virtual_environment: Path) -> None:
+    """Expect a report on another environment with its environment markers."""
+    main(["--json", "--env", str(virtual_environment), "crystal-ball"])
+    report = json.loads(capsys.readouterr().out)
+    assert report["package"] == {"name": "crystal-ball", "version": "4.2.0"}
+    assert report["dependencies"] == [{"name": "tomli", "version": None, "depth": 1}]
+    assert report["python"]["version"] == "3.9.16"
+    assert report["build_tools"] == []
+
+
+def test_site_packages(capsys, virtual_environment: Path) -> None:
+    """Expect a report on the distributions in the given directories only."""
+    site_packages = virtual_environment / "lib" / "python3.9" / "site-packages"
+    main(["--json", "--all", "--site-packages", str(site_packages)])
+    reports = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["package"]["name"] for line in reports] == ["crystal-ball"]
+
+
+def test_batch(capsys, caplog, virtual_environment: Path, tmp_path_factory) -> None:
+    """Expect one stream of reports for many environments."""
+    missing = tmp_path_factory.mktemp("empty")
+    with pytest.raises(SystemExit) as exc:
+        main(
+            ["batch", str(virtual_environment), str(missing), str(virtual_environment)]
+        )
+    assert exc.value.code == 1
+    assert str(missing) in caplog.text
+    reports = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [report["environment"] for report in reports] == 2 * [
+        str(virtual_environment)
+    ]
+    assert reports[0]["package"]["name"] == "crystal-ball"
+
+
+def test_batch_failure(capsys, caplog, virtual_environment: Path) -> None:
+    """Expect other environments to be reported on if one fails unexpectedly."""
+    with pytest.raises(SystemExit) as exc:
+        main(["batch", str(virtual_environment) + "\0", str(virtual_environment)])
+    assert exc.value.code == 1
+    assert "Could not report on the environment" in caplog.text
+    assert "site-packages" not in caplog.text
+    reports = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["environment"] for line in reports] == [
+        str(virtual_environment)
+    ]
@@ -0,0 +1,117 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test that the command line interface imports only what it needs."""
+
+
+import subprocess
+import sys
+from typing import List, Set, Tuple
+
+import pytest
+
+
+# Modules that are comparatively slow to import and not needed for showing the help.
+HEAVY_MODULES = (
+    "asyncio",
+    "concurrent.futures",
+    "dataclasses",
+    "email",
+    "hashlib",
+    "importlib.metadata",
+    "socketserver",
+    "tempfile",
+    "zipfile",
+)
+
+
+def run_cli(argv: List[str]) -> Tuple[Set[str], Set[str]]:
+    """
+    Run the command line interface and return the modules it imported.
+
+    Args:
+        argv: The command line arguments.
+
+    Returns:
+        The modules listed by `-X importtime` and all loaded modules. The listing
+        omits modules that are loaded via `importlib.import_module`.
+
+    """
+    code = (
+        "import sys\n"
+        "from depinfo.infrastructure.application import cli\n"
+        "try:\n"
+        f"    cli.main({argv!r})\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "sys.stderr.write('\\n'.join(['modules:', *sys.modules]))\n"
+    )
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    listing, _, modules = process.stderr.partition("modules:\n")
+    # Each line reads `import time: <self> | <cumulative> | <indented name>`.
+    imported = {
+        line.rsplit("|", 1)[1].strip()
+        for line in listing.splitlines()
+        if line.startswith("import time:") and line.count("|") == 2
+    }
+    return imported, set(modules.splitlines())
+
+
+@pytest.mark.parametrize("argv", [["--version"], ["--help"]])
+def test_minimal_entry_path(argv: List[str]) -> None:
+    """Expect that showing the version or help loads no application or domain logic."""
+    _, modules = run_cli(argv)
+    assert "depinfo.application.display_application" not in modules
+    assert "depinfo.domain.dependency_report" not in modules
+    assert "depinfo.infrastructure.application.simple_display_service" not in modules
+
+
+def test_heavy_imports() -> None:
+    """Expect that showing the help imports none of the heavy modules."""
+    imported, modules = run_cli(["--help"])
+    # Guard against an empty listing, for example, if the option were ignored.
+    assert "depinfo.infrastructure.application.cli" in imported
+    assert [name for name in HEAVY_MODULES if name in imported] == []
+    assert [name for name in HEAVY_MODULES if name in modules] == []
+
+
+@pytest.mark.parametrize(
+    ("argv", "needed", "unneeded"),
+    [
+        (
+            ["depinfo"],
+            "depinfo.infrastructure.application.simple_display_service",
+            "depinfo.infrastructure.application.markdown_table_display_service",
+        ),
+        (
+            ["--markdown", "depinfo"],
+            "depinfo.infrastructure.application.markdown_table_display_service",
+            "depinfo.infrastructure.application.simple_display_service",
+        ),
+    ],
+)
+def test_format_imports(argv: List[str], needed: str, unneeded: str) -> None:
+    """Expect that only the chosen display service is imported."""
+    _, modules = run_cli(argv)
+    assert needed in modules
+    assert unneeded not in modules
+    assert "importlib.metadata" not in modules
+    assert "asyncio" not in modules
+    assert "rich" not in modules
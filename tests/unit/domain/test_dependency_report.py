@@ -16,11 +16,26 @@
 """Test that the dependency report works as expected."""
 
 
-from typing import Dict
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 import pytest
 
-from depinfo.domain import DependencyReport, Package, Platform, Python
+from depinfo.domain import (
+    AbstractMetadataCache,
+    DependencyReport,
+    DistributionMetadata,
+    EnvironmentFingerprint,
+    EnvironmentIndex,
+    Package,
+    Platform,
+    Profiler,
+    Python,
+)
 
 
 @pytest.fixture(scope="module")
@@ -38,7 +53,7 @@ def python() -> Python:
 @pytest.fixture(scope="module")
 def depinfo() -> Package:
     """Provide a package fixture."""
-    return Package.from_name("depinfo")
+    return Package.from_name("depinfo", include_inactive=True)
 
 
 @pytest.fixture(scope="module")
@@ -87,8 +102,361 @@ def test_iter_unique_requirements(report: DependencyReport) -> None:
 
 def test_from_root() -> None:
     """Test dependency report creation from a root name."""
-    report = DependencyReport.from_root("depinfo", ("pip", "setuptools"))
+    report = DependencyReport.from_root(
+        "depinfo", ("pip", "setuptools"), include_inactive=True
+    )
     assert {pkg.name for _, pkg in report.iter_requirements()}.issuperset(
         {"importlib-metadata"}
     )
     assert {pkg.name for pkg in report.build_tools}.issuperset({"pip", "setuptools"})
+
+
+@pytest.mark.parametrize("max_depth", [0, 1, 3])
+def test_from_root_concurrently(max_depth: int) -> None:
+    """Test that concurrent loading yields the same report as sequential loading."""
+    sequential = DependencyReport.from_root(
+        "depinfo", ("pip", "setuptools", "pip"), max_depth=max_depth
+    )
+    concurrent = DependencyReport.from_root(
+        "depinfo", ("pip", "setuptools", "pip"), max_depth=max_depth, max_workers=4
+    )
+    assert list(concurrent.packages.items()) == list(sequential.packages.items())
+    assert concurrent.build_tools == sequential.build_tools
+    assert list(concurrent.iter_requirements(max_depth)) == list(
+        sequential.iter_requirements(max_depth)
+    )
+
+
+@pytest.mark.parametrize("max_depth", [0, 1, 3])
+def test_afrom_root(max_depth: int) -> None:
+    """Test that asynchronous loading yields the same report as sequential loading."""
+    sequential = DependencyReport.from_root(
+        "depinfo", ("pip", "setuptools", "pip"), max_depth=max_depth
+    )
+    report = asyncio.run(
+        DependencyReport.afrom_root(
+            "depinfo", ("pip", "setuptools", "pip"), max_depth=max_depth
+        )
+    )
+    assert list(report.packages.items()) == list(sequential.packages.items())
+    assert report.build_tools == sequential.build_tools
+    assert list(report.iter_requirements(max_depth)) == list(
+        sequential.iter_requirements(max_depth)
+    )
+
+
+def test_afrom_environment() -> None:
+    """Test that every installed distribution becomes a root asynchronously."""
+    index = EnvironmentIndex.create()
+    reports = asyncio.run(DependencyReport.afrom_environment(("pip",), index=index))
+    assert len(reports) == len(index.locations)
+
+
+class SlowCache(AbstractMetadataCache):
+    """Define a cache that counts and delays all lookups."""
+
+    def __init__(self) -> None:
+        """Initialize an empty count."""
+        self.lookups = 0
+
+    def get(self, location: Path) -> Optional[DistributionMetadata]:
+        """Count and delay a lookup."""
+        self.lookups += 1
+        time.sleep(0.05)
+        return None
+
+    def set(self, location: Path, metadata: DistributionMetadata) -> None:
+        """Ignore the metadata."""
+
+
+def test_afrom_environment_timeout() -> None:
+    """Test that lookups which have not started are dropped on a timeout."""
+    index = EnvironmentIndex.create()
+    cache = SlowCache()
+
+    async def create() -> None:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    DependencyReport.afrom_environment(
+                        (), index=index, cache=cache, executor=executor
+                    ),
+                    timeout=0.1,
+                )
+
+    asyncio.run(create())
+    assert cache.lookups < len(index.locations)
+
+
+def test_from_roots() -> None:
+    """Test that multiple reports share their packages."""
+    reports = DependencyReport.from_roots(["depinfo", "Pip"], ("setuptools",))
+    assert [report.root.name for report in reports] == ["depinfo", "pip"]
+    first, second = reports
+    assert first.packages is second.packages
+    assert first.build_tools is second.build_tools
+    assert {"depinfo", "pip", "setuptools"}.issubset(first.packages)
+
+
+def test_from_environment() -> None:
+    """Test that every installed distribution becomes a root."""
+    index = EnvironmentIndex.create()
+    reports = DependencyReport.from_environment(("pip",), index=index)
+    assert len(reports) == len(index.locations)
+    assert "depinfo" in {report.root.name for report in reports}
+    # The fingerprint is computed only when it is asked for.
+    assert index.environment_fingerprint is None
+    assert reports[0].fingerprint == EnvironmentFingerprint.create(index)
+    assert all(report.fingerprint is reports[0].fingerprint for report in reports)
+
+
+def test_from_root_profiler() -> None:
+    """Test that the profiler records the phases and every package lookup."""
+    profiler = Profiler()
+    report = DependencyReport.from_root("depinfo", ("pip",), profiler=profiler)
+    assert list(profiler.phases) == ["discovery", "loading", "graph"]
+    assert set(profiler.lookups) == set(report.packages) | {"pip"}
+    assert profiler.cache_hits == profiler.cache_misses == 0
+    assert profiler.bytes_read > 0
+
+
+@pytest.fixture(scope="module")
+def diamond(platform: Platform, python: Python) -> DependencyReport:
+    """Provide a report on a graph with diamonds and a cycle back to the root."""
+    packages = {
+        "a": Package(name="a", version="1", requirements=["b", "c"]),
+        "b": Package(name="b", version="1", requirements=["d"]),
+        "c": Package(name="c", version=None, requirements=["d", "b"]),
+        "d": Package(name="d", version="1", requirements=["e", "a"]),
+        "e": Package(name="e", version="1", requirements=[]),
+    }
+    return DependencyReport(
+        root=packages["a"],
+        platform=platform,
+        python=python,
+        build_tools=[],
+        packages=packages,
+    )
+
+
+@pytest.mark.parametrize(
+    "max_depth, expected",
+    [
+        (0, []),
+        (1, [(1, "b"), (1, "c")]),
+        (2, [(1, "b"), (1, "c"), (2, "d")]),
+        (3, [(1, "b"), (1, "c"), (2, "d"), (3, "e"), (3, "a")]),
+        (10, [(1, "b"), (1, "c"), (2, "d"), (3, "e"), (3, "a")]),
+    ],
+)
+def test_iter_requirements_minimum_depth(
+    diamond: DependencyReport, max_depth: int, expected: List[Tuple[int, str]]
+) -> None:
+    """Test that every package is visited once at its minimum depth."""
+    assert [
+        (level, pkg.name) for level, pkg in diamond.iter_requirements(max_depth)
+    ] == expected
+
+
+def test_iter_requirements_cached(diamond: DependencyReport) -> None:
+    """Test that the traversal order is computed only once per report."""
+    list(diamond.iter_requirements(1))
+    order = diamond.order
+    assert order is not None
+    list(diamond.iter_requirements(5))
+    assert diamond.order is order
+
+
+def test_iter_unique_requirements_minimum_depth(diamond: DependencyReport) -> None:
+    """Test that unique requirements are listed in breadth-first order."""
+    assert list(diamond.iter_unique_requirements(max_depth=2)) == [
+        ("b", "1"),
+        ("c", "missing"),
+        ("d", "1"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "max_depth, expected",
+    [
+        (0, []),
+        (1, [(1, "b", False, False), (1, "c", True, False)]),
+        (
+            2,
+            [
+                (1, "b", False, False),
+                (2, "d", True, False),
+                (1, "c", True, False),
+                (2, "d", False, False),
+                (2, "b", True, False),
+            ],
+        ),
+        (
+            10,
+            [
+                (1, "b", False, False),
+                (2, "d", True, False),
+                (3, "e", False, False),
+                (3, "a", True, True),
+                (1, "c", True, False),
+                (2, "d", False, True),
+                (2, "b", True, True),
+            ],
+        ),
+    ],
+)
+def test_iter_tree(
+    diamond: DependencyReport,
+    max_depth: int,
+    expected: List[Tuple[int, str, bool, bool]],
+) -> None:
+    """Test that each package's requirements are expanded only once."""
+    assert [
+        (level, pkg.name, is_last, is_reference)
+        for level, pkg, is_last, is_reference in diamond.iter_tree(max_depth)
+    ] == expected
+
+
+def test_iter_tree_minimum_depth(platform: Platform, python: Python) -> None:
+    """Test that subtrees are expanded at their minimum depth to be complete."""
+    packages = {
+        "root": Package(name="root", version="1", requirements=["a", "b"]),
+        "a": Package(name="a", version="1", requirements=["b"]),
+        "b": Package(name="b", version="1", requirements=["c"]),
+        "c": Package(name="c", version="1", requirements=["d"]),
+        "d": Package(name="d", version="1", requirements=[]),
+    }
+    report = DependencyReport(
+        root=packages["root"],
+        platform=platform,
+        python=python,
+        build_tools=[],
+        packages=packages,
+    )
+    assert [
+        (level, pkg.name, is_reference)
+        for level, pkg, _, is_reference in report.iter_tree(max_depth=3)
+    ] == [
+        (1, "a", False),
+        (2, "b", True),
+        (1, "b", False),
+        (2, "c", False),
+        (3, "d", False),
+    ]
+
+
+@pytest.fixture(scope="module")
+def dotted(platform: Platform, python: Python) -> DependencyReport:
+    """Provide a report on a root with dots in its name that is part of a cycle."""
+    packages = {
+        "zope-interface": Package(
+            name="zope.interface", version="5.5", requirements=["zope-event"]
+        ),
+        "zope-event": Package(
+            name="zope.event", version="4.6", requirements=["zope-interface"]
+        ),
+    }
+    return DependencyReport(
+        root=packages["zope-interface"],
+        platform=platform,
+        python=python,
+        build_tools=[],
+        packages=packages,
+    )
+
+
+def test_iter_tree_dotted_root(dotted: DependencyReport) -> None:
+    """Test that a root with dots in its name is referred to in cycles."""
+    assert dotted.root_id() is not None
+    assert [
+        (level, pkg.name, is_reference)
+        for level, pkg, _, is_reference in dotted.iter_tree(max_depth=3)
+    ] == [(1, "zope.event", False), (2, "zope.interface", True)]
+
+
+def test_cycles_dotted_root(dotted: DependencyReport) -> None:
+    """Test that cycles through a root with dots in its name are found."""
+    assert [[pkg.name for pkg in cycle] for cycle in dotted.cycles(2)] == [
+        ["zope.event", "zope.interface"]
+    ]
+
+
+@pytest.mark.parametrize(
+    ("max_depth", "expected"),
+    [
+        (0, []),
+        (1, []),
+        (2, []),
+        (3, [["a", "b", "c", "d"]]),
+        (sys.maxsize, [["a", "b", "c", "d"]]),
+    ],
+)
+def test_cycles(
+    diamond: DependencyReport,
+    report: DependencyReport,
+    max_depth: int,
+    expected: List[List[str]],
+) -> None:
+    """Test that displayed packages requiring each other are grouped."""
+    assert [
+        [pkg.name for pkg in cycle] for cycle in diamond.cycles(max_depth)
+    ] == expected
+    assert report.cycles(max_depth) == []
+
+
+def test_parse_roots() -> None:
+    """Test that roots may request extras."""
+    assert DependencyReport._parse_roots(["Depinfo[Rich]", "pip", "[rich]"]) == (
+        ["depinfo", "pip", "[rich]"],
+        {"depinfo": {"rich": None}},
+    )
+
+
+def test_expand_extras() -> None:
+    """Test that extras requested anywhere in the traversal are followed."""
+    a = Package(name="a", version="1", requirements=["b"], extras={"b": ("x",)})
+    b = Package(
+        name="b",
+        version="1",
+        requirements=[],
+        extra_requirements={"x": {"c": ()}, "y": {"d": ()}},
+    )
+    packages = {"a": a}
+    requested: Dict[str, Dict[str, None]] = {}
+    assert DependencyReport._expand([a], packages, requested) == ["b"]
+    packages["b"] = b
+    assert DependencyReport._expand([b], packages, requested) == ["c"]
+    # A later request of another extra of a loaded package follows its requirements.
+    e = Package(name="e", version="1", requirements=["b"], extras={"b": ("y",)})
+    packages["e"] = e
+    assert DependencyReport._expand([e], packages, requested) == ["b", "d"]
+    DependencyReport._add_extra_requirements(packages, requested)
+    assert packages["b"].requirements == ["c", "d"]
+    assert packages["a"] is a
+
+
+def test_from_root_extras() -> None:
+    """Test that the requirements of a root's requested extras are included."""
+    report = DependencyReport.from_root("depinfo[rich]", ())
+    assert report.root.requirements == ["rich"]
+    assert "rich" in report.packages
+
+
+def test_from_root_extras_of_dotted_name(tmp_path: Path) -> None:
+    """Test that extras of distributions with dots in their names are followed."""
+    for directory, metadata in [
+        (
+            "Foo.Bar-1.0.dist-info",
+            "Name: Foo.Bar\nVersion: 1.0\n"
+            "Requires-Dist: top-pkg ; extra == 'extra1'\n",
+        ),
+        ("top_pkg-2.0.dist-info", "Name: top-pkg\nVersion: 2.0\n"),
+    ]:
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / "METADATA").write_text(metadata)
+    index = EnvironmentIndex.create([str(tmp_path)])
+    report = DependencyReport.from_root(
+        "Foo.Bar[extra1]", (), max_depth=sys.maxsize, index=index
+    )
+    assert report.root.requirements == ["top-pkg"]
+    assert report.packages["top-pkg"].version == "2.0"
@@ -0,0 +1,76 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test that the environment fingerprint changes exactly when distributions do."""
+
+
+import os
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from depinfo.domain import EnvironmentFingerprint, EnvironmentIndex
+
+
+@pytest.fixture()
+def site_packages(tmp_path: Path) -> Path:
+    """Provide a directory with a few distributions' metadata."""
+    for name in ["crystal_ball-4.2.0.dist-info", "tarot-0.1.dist-info"]:
+        directory = tmp_path / name
+        directory.mkdir()
+        (directory / "METADATA").write_text("Metadata-Version: 2.1\n")
+    return tmp_path
+
+
+def fingerprint(path: Path) -> EnvironmentFingerprint:
+    """Return the fingerprint of a single search path."""
+    return EnvironmentFingerprint.create(EnvironmentIndex.create([str(path)]))
+
+
+def test_create(site_packages: Path) -> None:
+    """Test that the fingerprint lists the indexed distributions by name."""
+    result = fingerprint(site_packages)
+    assert [name for name, *_ in result.distributions] == ["crystal-ball", "tarot"]
+    assert result == fingerprint(site_packages)
+    assert result.digest == fingerprint(site_packages).digest
+    assert len(result.digest) == 64
+
+
+def test_install(site_packages: Path) -> None:
+    """Test that installing a distribution changes the fingerprint."""
+    before = fingerprint(site_packages)
+    (site_packages / "runes-1.0.dist-info").mkdir()
+    assert fingerprint(site_packages).digest != before.digest
+
+
+def test_upgrade(site_packages: Path) -> None:
+    """Test that replacing a distribution's metadata changes the fingerprint."""
+    before = fingerprint(site_packages)
+    location = site_packages / "tarot-0.1.dist-info"
+    stat = location.stat()
+    os.utime(location, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert fingerprint(site_packages).digest != before.digest
+
+
+def test_archive(tmp_path: Path) -> None:
+    """Test that metadata within a zip archive is stamped by the archive."""
+    path = tmp_path / "app.pyz"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("tarot-0.1.dist-info/METADATA", "Metadata-Version: 2.1\n")
+    ((name, location, mtime, size),) = fingerprint(path).distributions
+    assert name == "tarot"
+    assert location == str(path / "tarot-0.1.dist-info")
+    assert (mtime, size) == (path.stat().st_mtime_ns, path.stat().st_size)
@@ -0,0 +1,204 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test that the environment index locates distributions as expected."""
+
+
+import os
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from depinfo.domain import EnvironmentIndex, MissingSitePackagesError
+
+
+@pytest.fixture()
+def site_packages(tmp_path: Path) -> Path:
+    """Provide a directory with a few distributions' metadata."""
+    for name in [
+        "crystal_ball-4.2.0.dist-info",
+        "Zope.Interface-5.0.egg-info",
+        "not_metadata",
+    ]:
+        directory = tmp_path / name
+        directory.mkdir()
+        (directory / "METADATA").write_text("Metadata-Version: 2.1\n")
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        ("crystalball", "crystalball"),
+        ("Crystal_Ball", "crystal-ball"),
+        ("zope.interface", "zope-interface"),
+        ("foo-.-bar", "foo-bar"),
+        ("crystal_ball-4.2.0.dist-info", "crystal-ball-4-2-0"),
+    ],
+)
+def test_normalize_name(name: str, expected: str) -> None:
+    """Test that distribution names are normalized according to PEP 503."""
+    assert EnvironmentIndex.normalize_name(name) == expected
+
+
+def test_create(site_packages: Path) -> None:
+    """Test that the index finds metadata directories in the search paths."""
+    index = EnvironmentIndex.create([str(site_packages)])
+    assert index.exhaustive
+    assert set(index.locations) == {"crystal-ball", "zope-interface"}
+    assert (
+        index.locate("crystal-ball") == site_packages / "crystal_ball-4.2.0.dist-info"
+    )
+    assert (
+        index.locate("Zope_Interface") == site_packages / "Zope.Interface-5.0.egg-info"
+    )
+    assert index.locate("not-metadata") is None
+
+
+def test_precedence(site_packages: Path, tmp_path_factory) -> None:
+    """Test that the first distribution on the search path takes precedence."""
+    other = tmp_path_factory.mktemp("other")
+    (other / "crystal_ball-1.0.0.dist-info").mkdir()
+    index = EnvironmentIndex.create([str(other), str(site_packages)])
+    assert index.locate("crystal-ball") == other / "crystal_ball-1.0.0.dist-info"
+
+
+def test_not_exhaustive(site_packages: Path) -> None:
+    """Test that an index with unscannable entries is marked as such."""
+    archive = site_packages / "bundle.zip"
+    archive.write_bytes(b"")
+    index = EnvironmentIndex.create([str(site_packages), str(archive)])
+    assert not index.exhaustive
+
+
+def test_archives(tmp_path: Path) -> None:
+    """Test that zip archives and zipped eggs on the search path are scanned."""
+    bundle = tmp_path / "bundle.zip"
+    with zipfile.ZipFile(bundle, "w") as archive:
+        archive.writestr(
+            "crystal_ball-4.2.0.dist-info/METADATA",
+            "Name: crystal_ball\nVersion: 4.2.0\nRequires-Dist: runes\n",
+        )
+        archive.writestr("lib/runes-1.0.dist-info/METADATA", "Version: 1.0\n")
+    egg = tmp_path / "Tarot-0.1-py3.9.egg"
+    with zipfile.ZipFile(egg, "w") as archive:
+        archive.writestr("EGG-INFO/PKG-INFO", "Name: Tarot\nVersion: 0.1\n")
+    index = EnvironmentIndex.create([str(bundle), str(bundle / "lib"), str(egg)])
+    assert index.exhaustive
+    assert index.locations == {
+        "crystal-ball": bundle / "crystal_ball-4.2.0.dist-info",
+        "runes": bundle / "lib" / "runes-1.0.dist-info",
+        "tarot": egg / "EGG-INFO",
+    }
+    # Each archive is opened once and shared by all of its distributions.
+    assert (
+        index.archives[index.locations["crystal-ball"]]
+        is index.archives[index.locations["runes"]]
+    )
+    metadata = index.metadata("crystal-ball")
+    assert metadata is not None
+    assert (metadata.version, metadata.requires) == ("4.2.0", ["runes"])
+    dist = index.distribution("tarot")
+    assert dist is not None
+    assert dist.version == "0.1"
+
+
+def test_missing_path(tmp_path: Path) -> None:
+    """Test that missing search paths are ignored."""
+    index = EnvironmentIndex.create([str(tmp_path / "missing")])
+    assert index.exhaustive
+    assert index.locations == {}
+
+
+def test_distribution() -> None:
+    """Test that an installed distribution is found via the index."""
+    index = EnvironmentIndex.create()
+    dist = index.distribution("depinfo")
+    assert dist is not None
+    assert dist.metadata["Name"] == "depinfo"
+    assert index.distribution("cystalball") is None
+
+
+def test_refresh(site_packages: Path) -> None:
+    """Test that the index is only recreated after its search paths changed."""
+    index = EnvironmentIndex.create([str(site_packages)])
+    assert index.refresh() is index
+    (site_packages / "cards-2.0.dist-info").mkdir()
+    stat = os.stat(site_packages)
+    # Ensure a different modification time on file systems with coarse resolution.
+    os.utime(site_packages, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    refreshed = index.refresh()
+    assert refreshed is not index
+    assert "cards" in refreshed.locations
+    assert refreshed.refresh() is refreshed
+
+
+@pytest.fixture()
+def virtual_environment(tmp_path_factory) -> Path:
+    """Provide a virtual environment that includes its base's site-packages."""
+    base = tmp_path_factory.mktemp("base")
+    (base / "lib" / "python3.9" / "site-packages" / "pip-22.3.dist-info").mkdir(
+        parents=True
+    )
+    prefix = tmp_path_factory.mktemp("venv")
+    site_packages = prefix / "lib" / "python3.9" / "site-packages"
+    (site_packages / "crystal_ball-4.2.0.dist-info").mkdir(parents=True)
+    # A site-packages directory of another Python version must be ignored.
+    (prefix / "lib" / "python3.8" / "site-packages" / "runes-1.0.dist-info").mkdir(
+        parents=True
+    )
+    project = tmp_path_factory.mktemp("project")
+    (project / "tarot.egg-info").mkdir()
+    (site_packages / "easy-install.pth").write_text(
+        f"# A comment\nimport sys\n{project}\n../missing\n"
+    )
+    (prefix / "pyvenv.cfg").write_text(
+        f"home = {base / 'bin'}\n"
+        "include-system-site-packages = true\n"
+        "version = 3.9.16\n"
+    )
+    return prefix
+
+
+def test_from_prefix(virtual_environment: Path) -> None:
+    """Test that another environment is scanned without running its interpreter."""
+    index = EnvironmentIndex.from_prefix(virtual_environment)
+    assert list(index.locations) == ["crystal-ball", "tarot", "pip"]
+    assert index.marker_environment == {
+        "python_full_version": "3.9.16",
+        "python_version": "3.9",
+    }
+    assert index.refresh().marker_environment == index.marker_environment
+
+
+def test_from_prefix_without_configuration(virtual_environment: Path) -> None:
+    """Test that the Python version is taken from the site-packages directory."""
+    (virtual_environment / "pyvenv.cfg").unlink()
+    (virtual_environment / "lib" / "python3.8").rename(
+        virtual_environment / "lib" / "python3.7"
+    )
+    index = EnvironmentIndex.from_prefix(virtual_environment)
+    assert list(index.locations) == ["runes", "crystal-ball", "tarot"]
+    assert index.marker_environment == {
+        "python_full_version": "3.7.0",
+        "python_version": "3.7",
+    }
+
+
+def test_from_prefix_missing(tmp_path: Path) -> None:
+    """Test that an environment must have a site-packages directory."""
+    with pytest.raises(MissingSitePackagesError, match="no site-packages"):
+        EnvironmentIndex.from_prefix(tmp_path)
@@ -0,0 +1,143 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test that environment markers are evaluated as described in PEP 508."""
+
+
+from typing import Tuple
+
+import pytest
+
+from depinfo.domain import Marker
+
+
+ENVIRONMENT = {
+    "implementation_name": "cpython",
+    "implementation_version": "3.10.4",
+    "os_name": "posix",
+    "platform_machine": "x86_64",
+    "platform_python_implementation": "CPython",
+    "platform_release": "5.15.0-generic",
+    "platform_system": "Linux",
+    "platform_version": "#1 SMP",
+    "python_full_version": "3.10.4",
+    "python_version": "3.10",
+    "sys_platform": "linux",
+    "extra": "",
+}
+
+
+@pytest.mark.parametrize(
+    ("marker", "expected"),
+    [
+        ('python_version < "3.8"', False),
+        ('python_version >= "3.8"', True),
+        ("python_version > '3.9'", True),
+        ('python_version == "3.10.*"', True),
+        ('python_version != "3.*"', False),
+        ('python_full_version ~= "3.10.0"', True),
+        ('python_full_version ~= "3.9.0"', False),
+        ('python_full_version < "3.10.4.post1"', True),
+        ('sys_platform == "win32"', False),
+        ('"linux" in sys_platform', True),
+        ('sys_platform not in "win32 cygwin"', True),
+        ('os.name == "posix"', True),
+        ('platform_release == "5.15.0-generic"', True),
+        ('extra == "docs"', False),
+        ('sys_platform == "win32" or python_version >= "3.8"', True),
+        ('sys_platform == "win32" or python_version >= "3.8" and extra == "a"', False),
+        (
+            '(sys_platform == "win32" or python_version >= "3.8") and os_name == "nt"',
+            False,
+        ),
+    ],
+)
+def test_evaluate(marker: str, expected: bool) -> None:
+    """Test that markers are evaluated in a given environment."""
+    assert Marker.compile(marker).evaluate(ENVIRONMENT) is expected
+
+
+@pytest.mark.parametrize(
+    ("marker", "extra", "expected"),
+    [
+        ('extra == "docs"', "docs", True),
+        ('extra == "Docs_Build"', "docs.build", True),
+        ('extra == "docs"', "test", False),
+    ],
+)
+def test_evaluate_extra(marker: str, extra: str, expected: bool) -> None:
+    """Test that extras are compared in their normalized form."""
+    assert Marker.compile(marker).evaluate({"extra": extra}) is expected
+
+
+@pytest.mark.parametrize(
+    "marker",
+    [
+        "",
+        'python_version < "3.8" and',
+        '(python_version < "3.8"',
+        'unknown_variable == "1"',
+        'python_version <> "3.8"',
+    ],
+)
+def test_compile_invalid(marker: str) -> None:
+    """Test that invalid markers are rejected."""
+    with pytest.raises(ValueError):
+        Marker.compile(marker)
+
+
+@pytest.mark.parametrize(
+    ("release", "expected"),
+    [
+        ("5.15.0-generic", True),
+        ("4.19.0-foo", False),
+    ],
+)
+def test_string_comparison(release: str, expected: bool) -> None:
+    """Test that ordering comparisons of non-versions fall back to strings."""
+    environment = {**ENVIRONMENT, "platform_release": release}
+    assert Marker.compile('platform_release >= "5"').evaluate(environment) is expected
+
+
+def test_undefined_comparison() -> None:
+    """Test that compatible release comparisons of non-versions are rejected."""
+    with pytest.raises(ValueError, match="Undefined comparison"):
+        Marker.compile('platform_release ~= "5.1"').evaluate(ENVIRONMENT)
+
+
+def test_compile_cached() -> None:
+    """Test that identical markers are compiled only once."""
+    assert Marker.compile('os_name == "nt"') is Marker.compile('os_name == "nt"')
+
+
+def test_default_environment() -> None:
+    """Test that the default environment describes the running interpreter."""
+    environment = Marker.default_environment()
+    assert set(environment) == set(ENVIRONMENT)
+    assert environment["extra"] == ""
+    assert Marker.compile("python_version >= '3.7'").evaluate()
+
+
+@pytest.mark.parametrize(
+    ("marker", "expected"),
+    [
+        ('os_name == "nt"', ()),
+        ('extra == "Dev_Tools"', ("dev-tools",)),
+        ('"docs" == extra or (extra == "test" and os_name == "nt")', ("docs", "test")),
+    ],
+)
+def test_extras(marker: str, expected: Tuple[str, ...]) -> None:
+    """Test that the extras that a marker compares against are collected."""
+    assert Marker.compile(marker).extras == expected
@@ -0,0 +1,149 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test that distribution metadata headers are read as expected."""
+
+
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from depinfo.domain import (
+    DistributionMetadata,
+    EnvironmentIndex,
+    MetadataReader,
+    ZipArchive,
+)
+
+
+if sys.version_info < (3, 8):
+    from importlib_metadata import PathDistribution
+else:
+    from importlib.metadata import PathDistribution
+
+
+@pytest.fixture()
+def dist_info(tmp_path: Path) -> Path:
+    """Provide a dist-info directory with a long description."""
+    result = tmp_path / "crystal_ball-4.2.0.dist-info"
+    result.mkdir()
+    (result / "METADATA").write_text(
+        "Metadata-Version: 2.1\n"
+        "Name: crystal_ball\n"
+        "Version: 4.2.0\n"
+        "Summary: Predict the future\n"
+        "  with great confidence.\n"
+        "License: MIT License\n"
+        "        \n"
+        "        Permission is hereby granted.\n"
+        "Requires-Dist: pip (>=20)\n"
+        'Requires-Dist: wheel ; extra == "build"\n'
+        "\n"
+        "Requires-Dist: not-a-header\n" + "A long description.\n" * 1000,
+        encoding="utf-8",
+    )
+    return result
+
+
+def test_read_dist_info(dist_info: Path) -> None:
+    """Test that reading stops at the end of the headers."""
+    assert MetadataReader.read(dist_info) == DistributionMetadata(
+        name="crystal_ball",
+        version="4.2.0",
+        requires=["pip (>=20)", 'wheel ; extra == "build"'],
+    )
+
+
+def test_read_egg_info(tmp_path: Path) -> None:
+    """Test that egg-info requirements are read from the requires.txt file."""
+    egg_info = tmp_path / "crystal_ball.egg-info"
+    egg_info.mkdir()
+    (egg_info / "PKG-INFO").write_text(
+        "Metadata-Version: 1.2\nName: crystal-ball\nVersion: 1.0\n"
+    )
+    (egg_info / "requires.txt").write_text(
+        "pip>=20\n"
+        "\n"
+        "[:python_version < '3.8']\n"
+        "importlib_metadata\n"
+        "\n"
+        "[build]\n"
+        "wheel\n"
+        "\n"
+        '[docs:sys_platform == "win32"]\n'
+        "sphinx @ https://example.org/sphinx.zip\n"
+    )
+    expected = [
+        "pip>=20",
+        "importlib_metadata; python_version < '3.8'",
+        'wheel; extra == "build"',
+        'sphinx @ https://example.org/sphinx.zip ; (sys_platform == "win32") and '
+        'extra == "docs"',
+    ]
+    assert MetadataReader.read(egg_info) == DistributionMetadata(
+        name="crystal-ball", version="1.0", requires=expected
+    )
+    assert PathDistribution(egg_info).requires == expected
+
+
+def test_read_egg_info_file(tmp_path: Path) -> None:
+    """Test that a single egg-info file is read."""
+    egg_info = tmp_path / "crystal_ball-1.0.egg-info"
+    egg_info.write_text("Metadata-Version: 1.0\nName: crystal_ball\nVersion: 1.0\n")
+    assert MetadataReader.read(egg_info) == DistributionMetadata(
+        name="crystal_ball", version="1.0", requires=[]
+    )
+
+
+def test_read_archive(dist_info: Path, tmp_path_factory) -> None:
+    """Test that metadata are read from a zip archive like from a directory."""
+    path = tmp_path_factory.mktemp("archive") / "bundle.zip"
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.write(dist_info / "METADATA", f"{dist_info.name}/METADATA")
+        archive.writestr(
+            "crystal_ball.egg-info/PKG-INFO", "Name: crystal-ball\nVersion: 1.0\n"
+        )
+        archive.writestr("crystal_ball.egg-info/requires.txt", "pip\n[build]\nwheel\n")
+    archive = ZipArchive.from_path(path)
+    assert MetadataReader.read(
+        path / dist_info.name, archive=archive
+    ) == MetadataReader.read(dist_info)
+    assert MetadataReader.read(
+        path / "crystal_ball.egg-info", archive=archive
+    ) == DistributionMetadata(
+        name="crystal-ball", version="1.0", requires=["pip", 'wheel; extra == "build"']
+    )
+    assert MetadataReader.read(path / "missing", archive=archive) == (
+        DistributionMetadata(name=None, version=None, requires=[])
+    )
+
+
+def test_read_missing(tmp_path: Path) -> None:
+    """Test that a metadata directory without metadata file yields empty fields."""
+    assert MetadataReader.read(tmp_path) == DistributionMetadata(
+        name=None, version=None, requires=[]
+    )
+
+
+def test_read_installed() -> None:
+    """Test that all installed distributions are read like `importlib` reads them."""
+    index = EnvironmentIndex.create()
+    for location in index.locations.values():
+        dist = PathDistribution(location)
+        metadata = MetadataReader.read(location)
+        assert metadata.version == dist.version
+        assert metadata.requires == (dist.requires or [])
@@ -16,11 +16,12 @@
 """Test that package information is detected as expected."""
 
 
-from typing import Dict
+import sys
+from typing import Dict, List, Tuple
 
 import pytest
 
-from depinfo.domain import Package
+from depinfo.domain import EnvironmentIndex, Package
 
 
 @pytest.mark.parametrize(
@@ -38,11 +39,31 @@ def test_init(attributes: Dict[str, str]) -> None:
         assert getattr(pkg, attr) == value
 
 
+@pytest.mark.skipif(
+    sys.version_info < (3, 10), reason="Data classes support slots since Python 3.10."
+)
+def test_slots() -> None:
+    """Test that packages do not carry a per-instance dictionary."""
+    pkg = Package(name="cystalball", version="4.2.0", requirements=[])
+    assert not hasattr(pkg, "__dict__")
+
+
 def test_from_name() -> None:
     """Test the package factory with an existing package name."""
-    pkg = Package.from_name("depinfo")
+    pkg = Package.from_name("depinfo", include_inactive=True)
     assert pkg.name == "depinfo"
     assert "importlib-metadata" in pkg.requirements
+    assert "rich" in pkg.requirements
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 8), reason="The requirement is active before Python 3.8."
+)
+def test_from_name_active() -> None:
+    """Test that requirements with inapplicable environment markers are skipped."""
+    pkg = Package.from_name("depinfo")
+    assert "importlib-metadata" not in pkg.requirements
+    assert "rich" not in pkg.requirements
 
 
 def test_missing_name() -> None:
@@ -51,3 +72,97 @@ def test_missing_name() -> None:
     assert pkg.name == "cystalball"
     assert pkg.version is None
     assert pkg.requirements == []
+
+
+def test_from_name_with_index() -> None:
+    """Test the package factory with a pre-built environment index."""
+    index = EnvironmentIndex.create()
+    pkg = Package.from_name("depinfo", index=index)
+    assert pkg.name == "depinfo"
+    assert pkg.version is not None
+    assert Package.from_name("cystalball", index=index).version is None
+
+
+def test_get_requirements_of_environment() -> None:
+    """Test that environment markers are evaluated for another environment."""
+    requires = ["tomli; python_version < '3.11'", "pip"]
+    assert Package._get_requirements(
+        requires, environment={"python_version": "3.9"}
+    ) == ["tomli", "pip"]
+    assert Package._get_requirements(
+        requires, environment={"python_version": "3.12"}
+    ) == ["pip"]
+
+
+@pytest.mark.parametrize(
+    ("requires", "include_inactive", "expected"),
+    [
+        (["pip (>=20)", "Wheel_Thing"], False, ["pip", "wheel-thing"]),
+        (["requests[socks]>=2; extra == 'http'"], False, []),
+        (["requests[socks]>=2; extra == 'http'"], True, ["requests"]),
+        (['colorama; sys_platform == "nonexistent"', "pip"], False, ["pip"]),
+        (
+            ["pip>=20; python_version >= '3'", "pip<20; python_version < '3'"],
+            True,
+            ["pip"],
+        ),
+        (["pip; platform_release >= '1'"], False, ["pip"]),
+    ],
+)
+def test_get_requirements(
+    requires: List[str], include_inactive: bool, expected: List[str]
+) -> None:
+    """Test that requirements are filtered by their environment markers."""
+    assert Package._get_requirements(requires, include_inactive) == expected
+
+
+def test_resolve_requirements() -> None:
+    """Test that requirements of extras are kept apart from active requirements."""
+    requires = [
+        "requests[socks,Use_Chardet]>=2",
+        "pytest; extra == 'test'",
+        "sphinx; extra == 'docs' and python_version < '3'",
+        "requests[security]; extra == 'test'",
+    ]
+    assert Package._resolve_requirements(requires) == (
+        {"requests": ("socks", "use-chardet")},
+        {"test": {"pytest": (), "requests": ("security",)}},
+    )
+
+
+@pytest.fixture(scope="module")
+def extended() -> Package:
+    """Provide a package with requirements that apply for its extras."""
+    return Package(
+        name="a",
+        version="1.0",
+        requirements=["b"],
+        extras={"b": ("x",)},
+        extra_requirements={"test": {"b": ("y",), "c": ()}, "docs": {"d": ()}},
+    )
+
+
+@pytest.mark.parametrize(
+    ("extras", "expected"),
+    [
+        ((), [("b", ("x",))]),
+        (("test",), [("b", ("x",)), ("b", ("y",)), ("c", ())]),
+        (("unknown",), [("b", ("x",))]),
+    ],
+)
+def test_iter_edges(
+    extended: Package,
+    extras: Tuple[str, ...],
+    expected: List[Tuple[str, Tuple[str, ...]]],
+) -> None:
+    """Test that the requirements of requested extras are included."""
+    assert list(extended.iter_edges(extras)) == expected
+
+
+def test_with_extras(extended: Package) -> None:
+    """Test that the requirements of requested extras are merged."""
+    assert extended.with_extras(("unknown",)) is extended
+    pkg = extended.with_extras(("test", "docs"))
+    assert pkg.requirements == ["b", "c", "d"]
+    assert pkg.extras == {"b": ("x", "y")}
+    assert pkg.extra_requirements == extended.extra_requirements
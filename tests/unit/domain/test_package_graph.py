@@ -0,0 +1,137 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test that the package graph represents requirements as expected."""
+
+
+from typing import Dict
+
+import pytest
+
+from depinfo.domain import Package, PackageGraph
+
+
+@pytest.fixture(scope="module")
+def packages() -> Dict[str, Package]:
+    """Provide a diamond-shaped map of packages with one requirement left out."""
+    return {
+        "a": Package(name="a", version="1", requirements=["b", "c"]),
+        "b": Package(name="b", version="1", requirements=["d"]),
+        "c": Package(name="c", version="1", requirements=["d", "e"]),
+        "d": Package(name="d", version="1", requirements=[]),
+    }
+
+
+def test_from_packages(packages: Dict[str, Package]) -> None:
+    """Test that names are interned and edges are stored in CSR format."""
+    graph = PackageGraph.from_packages(packages)
+    assert len(graph) == 4
+    assert graph.names == ["a", "b", "c", "d"]
+    assert graph.packages == list(packages.values())
+    assert list(graph.offsets) == [0, 2, 3, 4, 4]
+    assert list(graph.targets) == [1, 2, 3, 3]
+    assert graph.num_edges == 4
+
+
+def test_successors(packages: Dict[str, Package]) -> None:
+    """Test that requirements are returned as identifiers."""
+    graph = PackageGraph.from_packages(packages)
+    assert [graph.names[node] for node in graph.successors(0)] == ["b", "c"]
+    # The requirement `e` is not part of the graph.
+    assert [graph.names[node] for node in graph.successors(2)] == ["d"]
+    assert list(graph.successors(3)) == []
+
+
+def test_lookup(packages: Dict[str, Package]) -> None:
+    """Test that names are mapped to identifiers."""
+    graph = PackageGraph.from_packages(packages)
+    assert graph.node_id("c") == 2
+    assert graph.node_id("e") is None
+    assert graph.lookup(["d", "e", "a"]) == [3, 0]
+
+
+def test_predecessors(packages: Dict[str, Package]) -> None:
+    """Test that the inverted edges are stored in CSR format."""
+    graph = PackageGraph.from_packages(packages)
+    assert list(graph.reverse_offsets) == [0, 0, 1, 2, 4]
+    assert list(graph.reverse_targets) == [0, 0, 1, 2]
+    assert list(graph.predecessors(0)) == []
+    assert [graph.names[node] for node in graph.predecessors(3)] == ["b", "c"]
+
+
+def test_shortest_chains(packages: Dict[str, Package]) -> None:
+    """Test that chains start at top-level packages and are shortest."""
+    graph = PackageGraph.from_packages(
+        {
+            **packages,
+            "f": Package(name="f", version="1", requirements=["c"]),
+            "g": Package(name="g", version="1", requirements=["d", "g"]),
+        }
+    )
+    chains = [
+        [graph.names[node] for node in chain]
+        for chain in graph.shortest_chains(graph.ids["d"])
+    ]
+    # The package `g` requires itself and is thus not a top-level package.
+    assert chains == [["a", "b", "d"], ["f", "c", "d"]]
+    assert graph.shortest_chains(graph.ids["a"]) == [[graph.ids["a"]]]
+
+
+def test_strongly_connected_components() -> None:
+    """Test that components are found in reverse topological order."""
+    graph = PackageGraph.from_packages(
+        {
+            "a": Package(name="a", version="1", requirements=["b"]),
+            "b": Package(name="b", version="1", requirements=["c", "d"]),
+            "c": Package(name="c", version="1", requirements=["a"]),
+            "d": Package(name="d", version="1", requirements=["d", "e"]),
+            "e": Package(name="e", version="1", requirements=[]),
+        }
+    )
+    components = graph.strongly_connected_components()
+    assert [sorted(graph.names[node] for node in comp) for comp in components] == [
+        ["e"],
+        ["d"],
+        ["a", "b", "c"],
+    ]
+    assert graph.strongly_connected_components() is components
+    assert [sorted(graph.names[node] for node in comp) for comp in graph.cycles()] == [
+        ["d"],
+        ["a", "b", "c"],
+    ]
+
+
+def test_strongly_connected_components_deep() -> None:
+    """Test that long chains of requirements do not exhaust the stack."""
+    num_packages = 10_000
+    graph = PackageGraph.from_packages(
+        {
+            str(index): Package(
+                name=str(index),
+                version="1",
+                requirements=[str((index + 1) % num_packages)],
+            )
+            for index in range(num_packages)
+        }
+    )
+    (component,) = graph.strongly_connected_components()
+    assert sorted(component) == list(range(num_packages))
+
+
+def test_acyclic(packages: Dict[str, Package]) -> None:
+    """Test that a graph without cycles consists of single packages."""
+    graph = PackageGraph.from_packages(packages)
+    assert len(graph.strongly_connected_components()) == len(graph)
+    assert graph.cycles() == []
@@ -0,0 +1,68 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test that the profiler records phases, lookups, and metadata reads."""
+
+
+from typing import Iterator
+
+import pytest
+
+from depinfo.domain import Profiler
+
+
+@pytest.fixture()
+def profiler() -> Profiler:
+    """Provide a profiler whose clock advances by one second per call."""
+    ticks: Iterator[float] = iter(range(1000))
+    return Profiler(clock=lambda: float(next(ticks)))
+
+
+def test_phase(profiler: Profiler) -> None:
+    """Test that repeated phases accumulate their wall time."""
+    with profiler.phase("loading"):
+        pass
+    with profiler.phase("loading"):
+        pass
+    with profiler.phase("graph"):
+        pass
+    assert profiler.phases == {"loading": 2.0, "graph": 1.0}
+
+
+def test_phase_error(profiler: Profiler) -> None:
+    """Test that a phase is recorded even if its block raises."""
+    with pytest.raises(RuntimeError):
+        with profiler.phase("loading"):
+            raise RuntimeError()
+    assert profiler.phases == {"loading": 1.0}
+
+
+def test_to_dict(profiler: Profiler) -> None:
+    """Test that the profile summarizes the recorded measurements."""
+    profiler.record_lookup("pip", 0.5)
+    profiler.record_lookup("depinfo", 2.0)
+    profiler.record_lookup("pip", 1.0)
+    profiler.record_cache(hit=True)
+    profiler.record_cache(hit=False)
+    profiler.record_cache(hit=False)
+    profiler.record_bytes(100)
+    profiler.record_bytes(23)
+    result = profiler.to_dict(max_packages=1)
+    assert result["lookups"] == {"packages": 2, "count": 3, "seconds": 3.5}
+    assert result["slowest_lookups"] == [
+        {"name": "depinfo", "count": 1, "seconds": 2.0}
+    ]
+    assert result["cache"] == {"hits": 1, "misses": 2}
+    assert result["bytes_read"] == 123
@@ -37,3 +37,11 @@ def test_create() -> None:
     python = Python.create()
     assert python.name
     assert python.version == sys.version.split(maxsplit=1)[0]
+
+
+def test_create_for_environment() -> None:
+    """Test that marker variables override the running interpreter's information."""
+    assert Python.create(
+        {"platform_python_implementation": "PyPy", "python_full_version": "3.9.16"}
+    ) == Python(name="PyPy", version="3.9.16")
+    assert Python.create({"python_version": "3.7"}).version == "3.7"
@@ -0,0 +1,48 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test that the differences between the packages of two reports are found."""
+
+
+from depinfo.domain import Package, ReportDiff
+
+
+def test_from_packages() -> None:
+    """Test that added, removed, and changed packages are found."""
+    old = {
+        "pip": Package(name="pip", version="21.0", requirements=[]),
+        "tarot": Package(name="tarot", version="0.1", requirements=["runes"]),
+        "runes": Package(name="runes", version="1.0", requirements=[]),
+        "cards": Package(name="cards", version="2.0", requirements=[]),
+        "wheel": Package(name="wheel", version=None, requirements=[]),
+    }
+    new = {
+        "pip": Package(name="pip", version="22.3", requirements=[]),
+        "tarot": Package(name="tarot", version="0.1", requirements=[]),
+        "runes": Package(name="runes", version="1.0", requirements=[]),
+        "wheel": Package(name="wheel", version="0.38", requirements=[]),
+        "flit": Package(name="flit", version=None, requirements=[]),
+    }
+    result = ReportDiff.from_packages(old, new)
+    assert result.added == [new["wheel"]]
+    assert result.removed == [old["cards"]]
+    assert result.changed == [(old["pip"], new["pip"]), (old["tarot"], new["tarot"])]
+    assert not result.is_empty
+
+
+def test_no_differences() -> None:
+    """Test that identical packages yield an empty difference."""
+    packages = {"pip": Package(name="pip", version="22.3", requirements=[])}
+    assert ReportDiff.from_packages(packages, dict(packages)).is_empty
@@ -0,0 +1,94 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test that requirements are parsed as described in PEP 508."""
+
+
+from typing import Tuple
+
+import pytest
+
+from depinfo.domain import Requirement
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("pip", Requirement(name="pip")),
+        ("zope.interface>=5", Requirement(name="zope.interface", specifier=">=5")),
+        (
+            "requests[socks, security] (>=2.0, <3) ; python_version >= '3.8'",
+            Requirement(
+                name="requests",
+                extras=("socks", "security"),
+                specifier=">=2.0,<3",
+                marker="python_version >= '3.8'",
+            ),
+        ),
+        (
+            'importlib_metadata; python_version < "3.8"',
+            Requirement(name="importlib_metadata", marker='python_version < "3.8"'),
+        ),
+        (
+            'sphinx @ https://example.org/a;b.zip ; extra == "docs"',
+            Requirement(
+                name="sphinx",
+                url="https://example.org/a;b.zip",
+                marker='extra == "docs"',
+            ),
+        ),
+    ],
+)
+def test_parse(text: str, expected: Requirement) -> None:
+    """Test that requirements are parsed into their parts."""
+    assert Requirement.parse(text) == expected
+
+
+def test_parse_invalid() -> None:
+    """Test that a requirement must start with a distribution name."""
+    with pytest.raises(ValueError, match="Invalid requirement"):
+        Requirement.parse(">=1.0")
+
+
+@pytest.mark.parametrize(
+    ("requirement", "expected"),
+    [
+        (Requirement(name="pip"), True),
+        (Requirement(name="pip", marker='extra == "docs"'), False),
+        (Requirement(name="pip", marker="python_version >= '3'"), True),
+        (Requirement(name="pip", marker="not a marker"), True),
+    ],
+)
+def test_is_active(requirement: Requirement, expected: bool) -> None:
+    """Test that requirements are active depending on their marker."""
+    assert requirement.is_active() is expected
+
+
+def test_parse_cached() -> None:
+    """Test that identical requirements are parsed only once."""
+    assert Requirement.parse("pip>=20") is Requirement.parse("pip>=20")
+
+
+@pytest.mark.parametrize(
+    ("requirement", "expected"),
+    [
+        (Requirement(name="pip"), ()),
+        (Requirement(name="pip", marker='extra == "docs"'), ("docs",)),
+        (Requirement(name="pip", marker="not a marker"), ()),
+    ],
+)
+def test_marker_extras(requirement: Requirement, expected: Tuple[str, ...]) -> None:
+    """Test that the extras named by a requirement's marker are returned."""
+    assert requirement.marker_extras() == expected
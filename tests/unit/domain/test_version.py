@@ -0,0 +1,79 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test that versions are parsed and ordered as described in PEP 440."""
+
+
+import pytest
+
+from depinfo.domain import Version
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("1.0", Version(epoch=0, release=(1, 0))),
+        ("v2!1.2.3", Version(epoch=2, release=(1, 2, 3))),
+        ("1.0a1", Version(epoch=0, release=(1, 0), pre=("a", 1))),
+        ("1.0-beta.2", Version(epoch=0, release=(1, 0), pre=("b", 2))),
+        ("1.0c3", Version(epoch=0, release=(1, 0), pre=("rc", 3))),
+        ("1.0.post", Version(epoch=0, release=(1, 0), post=0)),
+        ("1.0-4", Version(epoch=0, release=(1, 0), post=4)),
+        ("1.0.dev", Version(epoch=0, release=(1, 0), dev=0)),
+        ("1.0+local.7", Version(epoch=0, release=(1, 0), local="local.7")),
+    ],
+)
+def test_parse(text: str, expected: Version) -> None:
+    """Test that versions are parsed correctly."""
+    version = Version.parse(text)
+    assert version == expected
+    assert version.release == expected.release
+    assert version.pre == expected.pre
+    assert version.post == expected.post
+    assert version.dev == expected.dev
+    assert version.local == expected.local
+
+
+@pytest.mark.parametrize("text", ["", "one", "1.0-foo", "1..0"])
+def test_parse_invalid(text: str) -> None:
+    """Test that invalid versions are rejected."""
+    with pytest.raises(ValueError, match="Invalid version"):
+        Version.parse(text)
+
+
+def test_order() -> None:
+    """Test that versions are ordered as described in PEP 440."""
+    ordered = [
+        "1.0.dev0",
+        "1.0a1.dev0",
+        "1.0a1",
+        "1.0b1",
+        "1.0rc1",
+        "1.0",
+        "1.0.post1.dev0",
+        "1.0.post1",
+        "1.1",
+        "1.10",
+        "1!0.1",
+    ]
+    versions = [Version.parse(text) for text in ordered]
+    assert sorted(reversed(versions)) == versions
+
+
+def test_equality() -> None:
+    """Test that trailing zeros and local labels are ignored when comparing."""
+    assert Version.parse("1") == Version.parse("1.0.0")
+    assert Version.parse("1.0+cpu") == Version.parse("1.0")
+    assert len({Version.parse("1"), Version.parse("1.0")}) == 1
@@ -0,0 +1,89 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test that the version matrix indexes and queries package versions by host."""
+
+
+import pytest
+
+from depinfo.domain import VersionMatrix
+
+
+@pytest.fixture(scope="module")
+def matrix() -> VersionMatrix:
+    """Provide a version matrix of a small fleet."""
+    result = VersionMatrix()
+    for host in ("alpha", "beta", "gamma", "delta", "epsilon"):
+        result.add(
+            host, [("pip", "22.3"), ("tarot", "0.1"), ("pip", "22.3"), ("runes", None)]
+        )
+    result.add("zeta", [("pip", "21.0"), ("tarot", "0.2")])
+    result.add("eta", [("pip", "22.3"), ("tarot", "0.2")])
+    return result
+
+
+def test_add(matrix: VersionMatrix) -> None:
+    """Test that duplicates and missing versions are skipped."""
+    assert len(matrix) == 14
+    assert matrix.packages == ["pip", "tarot"]
+    assert matrix.versions == ["22.3", "0.1", "21.0", "0.2"]
+    assert len(matrix.hosts) == 7
+
+
+def test_versions_of(matrix: VersionMatrix) -> None:
+    """Test that hosts are grouped by version, most common first."""
+    assert matrix.versions_of("pip") == {
+        "22.3": ["alpha", "beta", "delta", "epsilon", "eta", "gamma"],
+        "21.0": ["zeta"],
+    }
+    assert matrix.versions_of("runes") == {}
+
+
+def test_skew(matrix: VersionMatrix) -> None:
+    """Test that packages in multiple versions are listed with host counts."""
+    assert matrix.skew() == [
+        ("pip", {"22.3": 6, "21.0": 1}),
+        ("tarot", {"0.1": 5, "0.2": 2}),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("fraction", "expected"),
+    [
+        (0.1, []),
+        (0.2, [("pip", "21.0", ["zeta"])]),
+        (0.5, [("pip", "21.0", ["zeta"]), ("tarot", "0.2", ["eta", "zeta"])]),
+    ],
+)
+def test_outliers(matrix: VersionMatrix, fraction: float, expected: list) -> None:
+    """Test that rare versions are reported with their hosts."""
+    assert matrix.outliers(fraction=fraction) == expected
+
+
+def test_add_after_query() -> None:
+    """Test that the grouping by package is updated after adding hosts."""
+    matrix = VersionMatrix()
+    matrix.add("alpha", [("pip", "22.3")])
+    assert matrix.versions_of("pip") == {"22.3": ["alpha"]}
+    matrix.add("beta", [("pip", "22.3")])
+    assert matrix.versions_of("pip") == {"22.3": ["alpha", "beta"]}
+
+
+def test_add_host_twice() -> None:
+    """Test that a host's packages cannot be added twice."""
+    matrix = VersionMatrix()
+    matrix.add("alpha", [("pip", "22.3")])
+    with pytest.raises(ValueError, match="alpha"):
+        matrix.add("alpha", [("pip", "22.3")])
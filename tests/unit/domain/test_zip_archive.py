@@ -0,0 +1,106 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test that zip archives are read through a memory map as expected."""
+
+
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from depinfo.domain import ZipArchive
+
+
+DESCRIPTION = "A very long description.\n" * 10_000
+
+
+@pytest.fixture()
+def archive_path(tmp_path: Path) -> Path:
+    """Provide a zip archive with stored and deflated members."""
+    path = tmp_path / "bundle.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(
+            "crystal_ball-4.2.0.dist-info/METADATA",
+            f"Name: crystal_ball\nVersion: 4.2.0\n\n{DESCRIPTION}",
+            compress_type=zipfile.ZIP_DEFLATED,
+        )
+        archive.writestr(
+            "crystal_ball-4.2.0.dist-info/RECORD",
+            "",
+            compress_type=zipfile.ZIP_STORED,
+        )
+        archive.writestr(
+            "crystal_ball/__init__.py", "", compress_type=zipfile.ZIP_STORED
+        )
+    return path
+
+
+def test_from_path(archive_path: Path) -> None:
+    """Test that the central directory is read."""
+    archive = ZipArchive.from_path(archive_path)
+    assert list(archive.members) == [
+        "crystal_ball-4.2.0.dist-info/METADATA",
+        "crystal_ball-4.2.0.dist-info/RECORD",
+        "crystal_ball/__init__.py",
+    ]
+    assert "crystal_ball/__init__.py" in archive
+    assert "crystal_ball" not in archive
+
+
+def test_children(archive_path: Path) -> None:
+    """Test that the immediate children of a directory are listed."""
+    archive = ZipArchive.from_path(archive_path)
+    assert archive.children() == ["crystal_ball-4.2.0.dist-info", "crystal_ball"]
+    assert archive.children("crystal_ball-4.2.0.dist-info/") == ["METADATA", "RECORD"]
+    assert archive.children("missing") == []
+
+
+def test_read(archive_path: Path) -> None:
+    """Test that stored and deflated members are read completely."""
+    archive = ZipArchive.from_path(archive_path)
+    assert archive.read("crystal_ball-4.2.0.dist-info/METADATA").decode() == (
+        f"Name: crystal_ball\nVersion: 4.2.0\n\n{DESCRIPTION}"
+    )
+    assert archive.read("crystal_ball-4.2.0.dist-info/RECORD") == b""
+    with pytest.raises(KeyError):
+        archive.read("missing")
+
+
+def test_open(archive_path: Path) -> None:
+    """Test that members are streamed line by line."""
+    archive = ZipArchive.from_path(archive_path)
+    with archive.open("crystal_ball-4.2.0.dist-info/METADATA") as handle:
+        assert next(handle) == b"Name: crystal_ball\n"
+        assert next(handle) == b"Version: 4.2.0\n"
+
+
+def test_prepended_data(archive_path: Path, tmp_path: Path) -> None:
+    """Test that offsets are adjusted for data in front of the archive."""
+    application = tmp_path / "application.pyz"
+    application.write_bytes(b"#!/usr/bin/env python3\n" + archive_path.read_bytes())
+    archive = ZipArchive.from_path(application)
+    assert archive.read("crystal_ball-4.2.0.dist-info/METADATA").startswith(
+        b"Name: crystal_ball\n"
+    )
+
+
+@pytest.mark.parametrize("content", [b"", b"not an archive"])
+def test_not_an_archive(tmp_path: Path, content: bytes) -> None:
+    """Test that other files are rejected."""
+    path = tmp_path / "bundle.zip"
+    path.write_bytes(content)
+    with pytest.raises(ValueError, match="not a zip archive"):
+        ZipArchive.from_path(path)
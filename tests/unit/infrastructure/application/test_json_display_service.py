@@ -0,0 +1,132 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test that the JSON display service writes valid (newline-delimited) JSON."""
+
+
+import json
+from dataclasses import replace
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from depinfo.application import DisplayFormat, DisplayServiceRegistry
+from depinfo.domain import (
+    DependencyReport,
+    EnvironmentIndex,
+    Package,
+    Platform,
+    Python,
+)
+from depinfo.infrastructure.application import JsonDisplayService
+
+
+@pytest.fixture(scope="module")
+def report() -> DependencyReport:
+    """Provide a dependency report fixture."""
+    packages = {
+        "crystal-ball": Package(
+            name="crystal-ball", version="4.2.0", requirements=["tarot", "runes"]
+        ),
+        "tarot": Package(name="tarot", version="0.1", requirements=["runes"]),
+        "runes": Package(name="runes", version=None, requirements=[]),
+        "pip": Package(name="pip", version="22.3", requirements=[]),
+        "flit": Package(name="flit", version=None, requirements=[]),
+    }
+    return DependencyReport(
+        root=packages["crystal-ball"],
+        platform=Platform(name="Pi", version="3.1.4"),
+        python=Python(name="PyPy", version="4.2.0"),
+        build_tools=[packages["pip"], packages["flit"]],
+        packages=packages,
+    )
+
+
+def test_registry() -> None:
+    """Test that the service is registered for the JSON format."""
+    assert (
+        DisplayServiceRegistry.display_service(DisplayFormat.Json) is JsonDisplayService
+    )
+
+
+def test_display(report: DependencyReport) -> None:
+    """Test that a report is written as a single JSON object."""
+    stream = StringIO()
+    JsonDisplayService.display(report, max_depth=2, stream=stream)
+    assert json.loads(stream.getvalue()) == {
+        "package": {"name": "crystal-ball", "version": "4.2.0"},
+        "dependencies": [
+            {"name": "tarot", "version": "0.1", "depth": 1},
+            {"name": "runes", "version": None, "depth": 1},
+        ],
+        "cycles": [],
+        "build_tools": [{"name": "pip", "version": "22.3"}],
+        "platform": {"name": "Pi", "version": "3.1.4"},
+        "python": {"name": "PyPy", "version": "4.2.0"},
+    }
+
+
+def test_display_cycles(report: DependencyReport) -> None:
+    """Test that cycles among the displayed packages are listed."""
+    packages = dict(report.packages)
+    packages["runes"] = Package(name="runes", version=None, requirements=["tarot"])
+    cyclic = replace(report, packages=packages, graph=None)
+    stream = StringIO()
+    JsonDisplayService.display(cyclic, max_depth=1, stream=stream)
+    assert json.loads(stream.getvalue())["cycles"] == []
+    stream = StringIO()
+    JsonDisplayService.display(cyclic, max_depth=2, stream=stream)
+    assert json.loads(stream.getvalue())["cycles"] == [["runes", "tarot"]]
+
+
+def test_display_without_dependencies(report: DependencyReport) -> None:
+    """Test that the dependencies are an empty list at depth zero."""
+    stream = StringIO()
+    JsonDisplayService.display(report, max_depth=0, stream=stream)
+    assert json.loads(stream.getvalue())["dependencies"] == []
+
+
+def test_display_all(report: DependencyReport) -> None:
+    """Test that multiple reports are written as newline-delimited JSON."""
+    stream = StringIO()
+    JsonDisplayService.display_all([report, report], stream=stream)
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 2
+    assert all(json.loads(line)["python"]["name"] == "PyPy" for line in lines)
+
+
+def test_display_environment(report: DependencyReport) -> None:
+    """Test that the environment is recorded if given."""
+    stream = StringIO()
+    JsonDisplayService.display_all([report], stream=stream, environment="/opt/venv")
+    assert json.loads(stream.getvalue())["environment"] == "/opt/venv"
+
+
+def test_display_fingerprint(report: DependencyReport, tmp_path: Path) -> None:
+    """Test that the environment's fingerprint is recorded if requested."""
+    index = EnvironmentIndex.create([str(tmp_path)])
+    stream = StringIO()
+    JsonDisplayService.display_all([replace(report, index=index)], stream=stream)
+    assert "fingerprint" not in json.loads(stream.getvalue())
+    assert index.environment_fingerprint is None
+    stream = StringIO()
+    JsonDisplayService.display_all(
+        [replace(report, index=index)] * 2, stream=stream, fingerprint=True
+    )
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line)["fingerprint"] for line in lines] == 2 * [
+        index.fingerprint().digest
+    ]
@@ -0,0 +1,66 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test that reports written as JSON are read back."""
+
+
+from io import StringIO
+
+from depinfo.domain import DependencyReport, Package, Platform, Python
+from depinfo.infrastructure.application import JsonDisplayService, JsonReportReader
+
+
+def test_iter_packages() -> None:
+    """Test that all packages of all reports are read with normalized names."""
+    packages = {
+        "crystal-ball": Package(
+            name="crystal-ball", version="4.2.0", requirements=["runes"]
+        ),
+        "runes": Package(name="runes", version=None, requirements=[]),
+        "pip": Package(name="pip", version="22.3", requirements=[]),
+        "zope-interface": Package(
+            name="zope.interface", version="5.5.2", requirements=[]
+        ),
+    }
+    report = DependencyReport(
+        root=packages["crystal-ball"],
+        platform=Platform(name="Pi", version="3.1.4"),
+        python=Python(name="PyPy", version="4.2.0"),
+        build_tools=[packages["pip"], packages["zope-interface"]],
+        packages=packages,
+    )
+    stream = StringIO()
+    JsonDisplayService.display_all([report, report], stream=stream)
+    stream.seek(0)
+    assert list(JsonReportReader.iter_packages(stream)) == 2 * [
+        ("crystal-ball", "4.2.0"),
+        ("runes", None),
+        ("pip", "22.3"),
+        ("zope-interface", "5.5.2"),
+    ]
+
+
+def test_iter_packages_invalid(caplog) -> None:
+    """Test that invalid lines are skipped with a warning."""
+    lines = [
+        "",
+        "not json",
+        '{"package": {"name": "pip"}}',
+        '{"package": {"name": "pip", "version": "22.3"}, "dependencies": [], '
+        '"build_tools": []}',
+    ]
+    assert list(JsonReportReader.iter_packages(lines)) == [("pip", "22.3")]
+    assert "line 2" in caplog.text
+    assert "line 3" in caplog.text
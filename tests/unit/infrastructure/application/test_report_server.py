@@ -0,0 +1,105 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test that the report server answers requests."""
+
+
+import json
+import socket
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from depinfo.infrastructure.application import ReportServer
+
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory) -> ReportServer:
+    """Return a report server for the current environment."""
+    return ReportServer(
+        path=tmp_path_factory.mktemp("server") / "depinfo.sock", max_depth_limit=5
+    )
+
+
+def test_respond(server: ReportServer) -> None:
+    """Test that a report is rendered in the requested format."""
+    response = server.respond({"package": "depinfo", "format": "Json"})
+    assert json.loads(response)["package"]["name"] == "depinfo"
+    assert "\ndepinfo " in server.respond({"package": "depinfo"})
+
+
+def test_respond_repeated(server: ReportServer) -> None:
+    """Test that identical requests are answered with the same report."""
+    request = {"package": "depinfo", "max_depth": 2}
+    assert server.respond(request) is server.respond(dict(request))
+
+
+@pytest.mark.parametrize(
+    "request_",
+    [
+        {},
+        {"package": "depinfo", "all": True},
+        {"package": "depinfo", "format": "Fancy"},
+        {"package": "depinfo", "max_depth": -1},
+        {"package": "depinfo", "max_depth": 5},
+        {"package": "depinfo", "build_tools": "pip"},
+        {"package": "depinfo", "build_tools": 1},
+        {"package": "depinfo", "build_tools": ["pip", 1]},
+        {"package": ["depinfo"]},
+        ["depinfo"],
+    ],
+)
+def test_respond_invalid(server: ReportServer, request_) -> None:
+    """Test that invalid requests are rejected."""
+    with pytest.raises(ValueError):
+        server.respond(request_)
+
+
+def _request(path: Path, line: bytes) -> str:
+    """Send a request and return the complete answer."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(path))
+        client.sendall(line)
+        with client.makefile("rb") as answer:
+            return answer.read().decode("utf-8")
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="requires Unix sockets")
+def test_serve_forever(server: ReportServer) -> None:
+    """Test that requests are answered over the socket."""
+    # A stale socket file must not prevent the server from starting.
+    server.path.touch()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    for _ in range(100):
+        try:
+            response = _request(server.path, b'{"package": "depinfo"}\n')
+            break
+        except OSError:
+            time.sleep(0.05)
+    assert response == server.respond({"package": "depinfo"})
+    assert _request(server.path, b"not json\n").startswith("error:")
+    assert _request(server.path, b'{"package": "depinfo", "build_tools": 1}\n') == (
+        "error: The build tools must be a list of package names.\n"
+    )
+    assert _request(server.path, b" " * server.max_request_size + b"{}\n") == (
+        f"error: The request exceeds {server.max_request_size:,} bytes.\n"
+    )
+    assert server.path.stat().st_mode & 0o777 == 0o600
+    # Another server must not take over the socket of a running one.
+    with pytest.raises(OSError, match="Another server"):
+        ReportServer(path=server.path).serve_forever()
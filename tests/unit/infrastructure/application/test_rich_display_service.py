@@ -0,0 +1,93 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test that the rich display service renders trees and tables."""
+
+
+from io import StringIO
+
+import pytest
+
+from depinfo.application import DisplayFormat, DisplayServiceRegistry
+from depinfo.domain import DependencyReport, Package, Platform, Python
+
+
+pytest.importorskip("rich")
+
+from depinfo.infrastructure.application import RichDisplayService  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def report() -> DependencyReport:
+    """Provide a dependency report whose requirements share a package."""
+    packages = {
+        "crystal-ball": Package(
+            name="crystal-ball", version="4.2.0", requirements=["tarot", "runes"]
+        ),
+        "tarot": Package(name="tarot", version="0.1", requirements=["cards"]),
+        "runes": Package(name="runes", version=None, requirements=["tarot"]),
+        "cards": Package(name="cards", version="1.0", requirements=[]),
+        "pip": Package(name="pip", version="22.3", requirements=[]),
+        "flit": Package(name="flit", version=None, requirements=[]),
+    }
+    return DependencyReport(
+        root=packages["crystal-ball"],
+        platform=Platform(name="Pi", version="3.1.4"),
+        python=Python(name="PyPy", version="4.2.0"),
+        build_tools=[packages["pip"], packages["flit"]],
+        packages=packages,
+    )
+
+
+def test_registry() -> None:
+    """Test that the service is registered for the rich format."""
+    assert (
+        DisplayServiceRegistry.display_service(DisplayFormat.Rich) is RichDisplayService
+    )
+
+
+def test_display(report: DependencyReport) -> None:
+    """Test that a shared subtree is expanded only once."""
+    stream = StringIO()
+    RichDisplayService.display(report, max_depth=3, stream=stream)
+    output = stream.getvalue()
+    assert (
+        "Dependency Information of crystal-ball 4.2.0\n"
+        "├── tarot 0.1\n"
+        "│   └── cards 1.0\n"
+        "└── runes missing\n"
+        "    └── tarot 0.1 (see above)\n"
+    ) in output
+    assert "pip" in output
+    assert "flit" not in output
+    assert "PyPy" in output
+
+
+def test_display_max_depth(report: DependencyReport) -> None:
+    """Test that the tree is cut off at the maximum depth."""
+    stream = StringIO()
+    RichDisplayService.display(report, max_depth=1, stream=stream)
+    output = stream.getvalue()
+    assert "├── tarot 0.1\n└── runes missing\n" in output
+    assert "cards" not in output
+
+
+def test_display_all(report: DependencyReport) -> None:
+    """Test that the shared environment is displayed once."""
+    stream = StringIO()
+    RichDisplayService.display_all([report, report], stream=stream)
+    output = stream.getvalue()
+    assert output.count("Dependency Information") == 2
+    assert output.count("Platform Information") == 1
@@ -0,0 +1,130 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test that the simple tables display service writes to the given stream."""
+
+
+from dataclasses import replace
+from io import StringIO
+
+import pytest
+
+from depinfo.domain import DependencyReport, Package, Platform, Python
+from depinfo.infrastructure.application import SimpleDisplayService
+
+
+@pytest.fixture(scope="module")
+def report() -> DependencyReport:
+    """Provide a dependency report fixture."""
+    packages = {
+        "crystal-ball": Package(
+            name="crystal-ball", version="4.2.0", requirements=["tarot", "runes"]
+        ),
+        "tarot": Package(name="tarot", version="0.1", requirements=[]),
+        "runes": Package(name="runes", version=None, requirements=[]),
+        "pip": Package(name="pip", version="22.3", requirements=[]),
+    }
+    return DependencyReport(
+        root=packages["crystal-ball"],
+        platform=Platform(name="Pi", version="3.1.4"),
+        python=Python(name="PyPy", version="4.2.0"),
+        build_tools=[packages["pip"]],
+        packages=packages,
+    )
+
+
+def test_display(report: DependencyReport) -> None:
+    """Test that the report is written to the stream."""
+    stream = StringIO()
+    SimpleDisplayService.display(report, stream=stream)
+    output = stream.getvalue()
+    assert "Dependency Information\n----------------------\n" in output
+    assert "missing" in output
+    assert "tarot" in output
+    assert "pip" in output
+    assert "PyPy" in output
+
+
+def test_display_default_stream(
+    report: DependencyReport, capsys: pytest.CaptureFixture
+) -> None:
+    """Test that the report is written to standard output by default."""
+    stream = StringIO()
+    SimpleDisplayService.display(report, stream=stream)
+    SimpleDisplayService.display(report)
+    assert capsys.readouterr().out == stream.getvalue()
+
+
+def test_display_all(report: DependencyReport) -> None:
+    """Test that the shared environment is written only once."""
+    stream = StringIO()
+    SimpleDisplayService.display_all([report, report], stream=stream)
+    output = stream.getvalue()
+    assert output.count("Dependency Information") == 2
+    assert output.count("Platform Information") == 1
+
+
+@pytest.fixture(scope="module")
+def nested() -> DependencyReport:
+    """Provide a dependency report whose requirements share a package."""
+    packages = {
+        "crystal-ball": Package(
+            name="crystal-ball", version="4.2.0", requirements=["tarot", "runes"]
+        ),
+        "tarot": Package(name="tarot", version="0.1", requirements=["cards"]),
+        "runes": Package(name="runes", version=None, requirements=["tarot"]),
+        "cards": Package(name="cards", version="1.0", requirements=[]),
+    }
+    return DependencyReport(
+        root=packages["crystal-ball"],
+        platform=Platform(name="Pi", version="3.1.4"),
+        python=Python(name="PyPy", version="4.2.0"),
+        build_tools=[],
+        packages=packages,
+    )
+
+
+def test_display_tree(nested: DependencyReport) -> None:
+    """Test that a shared subtree is written once and referred to afterwards."""
+    stream = StringIO()
+    SimpleDisplayService.display(nested, max_depth=3, stream=stream, tree=True)
+    assert (
+        "Dependency Information\n"
+        "----------------------\n"
+        "|-- tarot 0.1\n"
+        "|   `-- cards 1.0\n"
+        "`-- runes missing\n"
+        "    `-- tarot 0.1 (see above)\n"
+    ) in stream.getvalue()
+
+
+def test_display_cycles(nested: DependencyReport) -> None:
+    """Test that cycles are listed only if there are any among displayed packages."""
+    stream = StringIO()
+    SimpleDisplayService.display(nested, max_depth=3, stream=stream)
+    assert "Dependency Cycles" not in stream.getvalue()
+
+    packages = dict(nested.packages)
+    packages["cards"] = Package(name="cards", version="1.0", requirements=["runes"])
+    cyclic = replace(nested, packages=packages, graph=None)
+    stream = StringIO()
+    SimpleDisplayService.display(cyclic, max_depth=2, stream=stream)
+    assert "Dependency Cycles" not in stream.getvalue()
+    stream = StringIO()
+    SimpleDisplayService.display(cyclic, max_depth=3, stream=stream)
+    assert (
+        "Dependency Cycles\n-----------------\ncards, runes, tarot\n"
+        in stream.getvalue()
+    )
@@ -0,0 +1,149 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test that the textual display service loads the dependency tree lazily."""
+
+
+import asyncio
+from io import StringIO
+from typing import List
+
+import pytest
+
+from depinfo.application import DisplayFormat, DisplayServiceRegistry
+from depinfo.domain import DependencyReport, Package, Platform, Python
+
+
+pytest.importorskip("textual")
+
+from textual.widgets import Tree  # noqa: E402
+
+from depinfo.infrastructure.application import TextualDisplayService  # noqa: E402
+from depinfo.infrastructure.application.textual_display_service import (  # noqa: E402
+    DependencyApp,
+)
+
+
+@pytest.fixture(scope="module")
+def reports() -> List[DependencyReport]:
+    """Provide dependency reports of a small environment with a cycle."""
+    packages = {
+        "crystal-ball": Package(
+            name="crystal-ball", version="4.2.0", requirements=["tarot", "runes"]
+        ),
+        "tarot": Package(name="tarot", version="0.1", requirements=["runes"]),
+        "runes": Package(name="runes", version="0.2", requirements=["tarot"]),
+        "pip": Package(name="pip", version="22.3", requirements=[]),
+    }
+    return [
+        DependencyReport(
+            root=packages[name],
+            platform=Platform(name="Pi", version="3.1.4"),
+            python=Python(name="PyPy", version="4.2.0"),
+            build_tools=[packages["pip"]],
+            packages=packages,
+        )
+        for name in ("crystal-ball", "pip")
+    ]
+
+
+def test_registry() -> None:
+    """Test that the service is registered for the textual format."""
+    assert (
+        DisplayServiceRegistry.display_service(DisplayFormat.Textual)
+        is TextualDisplayService
+    )
+
+
+def test_display_redirected(reports: List[DependencyReport]) -> None:
+    """Test that reports are rendered with rich unless shown in a terminal."""
+    stream = StringIO()
+    TextualDisplayService.display(reports[0], stream=stream)
+    assert "Dependency Information of crystal-ball 4.2.0" in stream.getvalue()
+
+
+def labels(node) -> List[str]:
+    """Return the plain labels of a node's children."""
+    return [child.label.plain for child in node.children]
+
+
+def test_app_lazy(reports: List[DependencyReport]) -> None:
+    """Test that requirements are loaded only when their node is expanded."""
+
+    async def run() -> None:
+        app = DependencyApp(reports[:1], max_depth=1)
+        async with app.run_test() as pilot:
+            tree = app.query_one(Tree)
+            assert labels(tree.root) == ["tarot 0.1", "runes 0.2"]
+            tarot = tree.root.children[0]
+            assert not tarot.children
+            tarot.expand()
+            await pilot.pause()
+            assert labels(tarot) == ["runes 0.2"]
+            # The cycle back to tarot is only followed on demand.
+            runes = tarot.children[0]
+            runes.expand()
+            await pilot.pause()
+            assert labels(runes) == ["tarot 0.1"]
+            assert not runes.children[0].children
+
+    asyncio.run(run())
+
+
+def test_app_all(reports: List[DependencyReport]) -> None:
+    """Test that the trees of multiple reports start collapsed."""
+
+    async def run() -> None:
+        app = DependencyApp(reports)
+        async with app.run_test():
+            tree = app.query_one(Tree)
+            assert labels(tree.root) == ["crystal-ball 4.2.0", "pip 22.3"]
+            assert not tree.root.children[0].children
+            assert not tree.root.children[1].allow_expand
+
+    asyncio.run(run())
+
+
+def test_app_dotted_root() -> None:
+    """Test that roots with dots in their names are part of the tree."""
+    packages = {
+        "zope-interface": Package(
+            name="zope.interface", version="5.5", requirements=["zope-event"]
+        ),
+        "zope-event": Package(name="zope.event", version="4.6", requirements=[]),
+    }
+    reports = [
+        DependencyReport(
+            root=packages[name],
+            platform=Platform(name="Pi", version="3.1.4"),
+            python=Python(name="PyPy", version="4.2.0"),
+            build_tools=[],
+            packages=packages,
+        )
+        for name in ("zope-event", "zope-interface")
+    ]
+
+    async def run() -> None:
+        app = DependencyApp(reports[1:])
+        async with app.run_test():
+            assert labels(app.query_one(Tree).root) == ["zope.event 4.6"]
+        app = DependencyApp(reports)
+        async with app.run_test():
+            assert labels(app.query_one(Tree).root) == [
+                "zope.event 4.6",
+                "zope.interface 5.5",
+            ]
+
+    asyncio.run(run())
@@ -0,0 +1,134 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test that the JSON metadata cache persists and invalidates entries."""
+
+
+import os
+from pathlib import Path
+
+import pytest
+
+from depinfo.domain import DistributionMetadata, EnvironmentIndex
+from depinfo.infrastructure.domain import JSONMetadataCache
+
+
+@pytest.fixture()
+def location(tmp_path: Path) -> Path:
+    """Provide a distribution metadata location."""
+    result = tmp_path / "site-packages" / "crystal_ball-4.2.0.dist-info"
+    result.mkdir(parents=True)
+    (result / "METADATA").write_text(
+        "Metadata-Version: 2.1\n"
+        "Name: crystal_ball\n"
+        "Version: 4.2.0\n"
+        "Requires-Dist: pip\n"
+        "\n"
+        "A long description.\n"
+    )
+    return result
+
+
+@pytest.fixture()
+def metadata() -> DistributionMetadata:
+    """Provide a distribution metadata fixture."""
+    return DistributionMetadata(name="crystal_ball", version="4.2.0", requires=["pip"])
+
+
+def test_missing_file(tmp_path: Path) -> None:
+    """Test that a missing cache file results in an empty cache."""
+    cache = JSONMetadataCache.load(tmp_path / "cache.json")
+    assert cache.get(tmp_path) is None
+
+
+def test_corrupt_file(tmp_path: Path, caplog) -> None:
+    """Test that an unreadable cache file is ignored."""
+    path = tmp_path / "cache.json"
+    path.write_text("{")
+    cache = JSONMetadataCache.load(path)
+    assert cache.get(tmp_path) is None
+    assert any("Ignoring unreadable" in msg for msg in caplog.messages)
+
+
+def test_round_trip(
+    tmp_path: Path, location: Path, metadata: DistributionMetadata
+) -> None:
+    """Test that cached metadata survives saving and loading."""
+    path = tmp_path / "nested" / "cache.json"
+    cache = JSONMetadataCache.load(path)
+    cache.set(location, metadata)
+    assert cache.get(location) == metadata
+    cache.save()
+    assert path.is_file()
+    assert JSONMetadataCache.load(path).get(location) == metadata
+
+
+def test_invalidation(
+    tmp_path: Path, location: Path, metadata: DistributionMetadata
+) -> None:
+    """Test that entries become invalid when their location is modified."""
+    cache = JSONMetadataCache.load(tmp_path / "cache.json")
+    cache.set(location, metadata)
+    stat = os.stat(location)
+    os.utime(location, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.get(location) is None
+
+
+def test_prune(tmp_path: Path, location: Path, metadata: DistributionMetadata) -> None:
+    """Test that entries of removed locations are dropped on saving."""
+    path = tmp_path / "cache.json"
+    other = tmp_path / "other" / "runes-1.0.dist-info"
+    other.mkdir(parents=True)
+    cache = JSONMetadataCache.load(path)
+    cache.set(location, metadata)
+    cache.set(other, DistributionMetadata(name="runes", version="1.0", requires=[]))
+    cache.save()
+    # Upgrading replaces the metadata directory.
+    upgraded = location.with_name("crystal_ball-4.3.0.dist-info")
+    location.rename(upgraded)
+    cache = JSONMetadataCache.load(path)
+    cache.set(upgraded, metadata._replace(version="4.3.0"))
+    cache.save()
+    assert set(JSONMetadataCache.load(path).to_json()["entries"]) == {
+        str(upgraded),
+        str(other),
+    }
+
+
+def test_index_integration(tmp_path: Path, location: Path) -> None:
+    """Test that the environment index fills and then consults the cache."""
+    index = EnvironmentIndex.create([str(location.parent)])
+    cache = JSONMetadataCache.load(tmp_path / "cache.json")
+    first = index.metadata("crystal-ball", cache=cache)
+    assert first == DistributionMetadata(
+        name="crystal_ball", version="4.2.0", requires=["pip"]
+    )
+    assert cache.get(location) == first
+    # A cached entry is returned without touching the metadata file.
+    (location / "METADATA").write_text("Metadata-Version: 2.1\nVersion: 0.0.0\n")
+    os.utime(
+        location, ns=(os.stat(location).st_atime_ns, os.stat(location).st_mtime_ns)
+    )
+    assert index.metadata("crystal-ball", cache=cache) == first
+
+
+def test_in_memory(location: Path) -> None:
+    """Test that a cache without a path is kept in memory only."""
+    cache = JSONMetadataCache(path=None)
+    metadata = EnvironmentIndex.create([str(location.parent)]).metadata(
+        "crystal-ball", cache=cache
+    )
+    cache.save()
+    assert JSONMetadataCache.from_json(None, cache.to_json()).get(location) == metadata
@@ -0,0 +1,128 @@
+# Copyright (c) 2022, Moritz E. Beber
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test that report snapshots are saved, loaded, and retaken incrementally."""
+
+
+import shutil
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from depinfo.domain import EnvironmentIndex, MetadataReader, ReportDiff
+from depinfo.infrastructure.domain import JSONReportSnapshot
+
+
+def write_distribution(
+    site_packages: Path, name: str, version: str, requires: List[str]
+) -> None:
+    """Write a minimal distribution metadata directory."""
+    location = site_packages / f"{name}-{version}.dist-info"
+    location.mkdir()
+    (location / "METADATA").write_text(
+        f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n"
+        + "".join(f"Requires-Dist: {req}\n" for req in requires)
+    )
+
+
+@pytest.fixture()
+def site_packages(tmp_path: Path) -> Path:
+    """Provide a small environment."""
+    result = tmp_path / "site-packages"
+    result.mkdir()
+    write_distribution(result, "crystal_ball", "4.2.0", ["tarot", "runes"])
+    write_distribution(result, "tarot", "0.1", ["runes"])
+    write_distribution(result, "runes", "1.0", [])
+    write_distribution(result, "pip", "22.3", [])
+    return result
+
+
+def test_round_trip(site_packages: Path, tmp_path: Path) -> None:
+    """Test that a loaded snapshot equals the saved one."""
+    index = EnvironmentIndex.create([str(site_packages)])
+    snapshot = JSONReportSnapshot.create(
+        roots=["Crystal-Ball"], build_tools=["pip"], max_depth=2, index=index
+    )
+    snapshot.save(tmp_path / "snapshot.json")
+    loaded = JSONReportSnapshot.load(tmp_path / "snapshot.json")
+    assert loaded.roots == ["crystal-ball"]
+    assert loaded.build_tools == ["pip"]
+    assert loaded.max_depth == 2
+    assert loaded.packages == snapshot.packages
+    assert [report.root for report in loaded.reports] == [
+        report.root for report in snapshot.reports
+    ]
+    assert list(loaded.reports[0].iter_requirements(2)) == list(
+        snapshot.reports[0].iter_requirements(2)
+    )
+
+
+def test_save_interrupted(site_packages: Path, tmp_path: Path, monkeypatch) -> None:
+    """Test that an interrupted save leaves the previous snapshot intact."""
+    path = tmp_path / "snapshot.json"
+    path.write_text("previous")
+    index = EnvironmentIndex.create([str(site_packages)])
+    snapshot = JSONReportSnapshot.create(
+        roots=["Crystal-Ball"], build_tools=[], index=index
+    )
+
+    def interrupt(*args, **kwargs) -> None:
+        raise KeyboardInterrupt()
+
+    monkeypatch.setattr("json.dump", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        snapshot.save(path)
+    assert path.read_text() == "previous"
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_load_invalid(tmp_path: Path) -> None:
+    """Test that files of a different format are rejected."""
+    path = tmp_path / "snapshot.json"
+    path.write_text('{"format_version": 0}')
+    with pytest.raises(ValueError, match="not a snapshot"):
+        JSONReportSnapshot.load(path)
+
+
+def test_retake(site_packages: Path, tmp_path: Path, monkeypatch) -> None:
+    """Test that only the metadata of changed distributions is read again."""
+    snapshot = JSONReportSnapshot.create(
+        roots=None,
+        build_tools=["pip"],
+        index=EnvironmentIndex.create([str(site_packages)]),
+    )
+    snapshot.save(tmp_path / "snapshot.json")
+    shutil.rmtree(site_packages / "pip-22.3.dist-info")
+    write_distribution(site_packages, "pip", "23.0", [])
+    write_distribution(site_packages, "cards", "2.0", [])
+
+    read = []
+    original = MetadataReader.read
+
+    def spy(location: Path, **kwargs):
+        read.append(location.name)
+        return original(location, **kwargs)
+
+    monkeypatch.setattr(MetadataReader, "read", spy)
+    retaken = JSONReportSnapshot.load(tmp_path / "snapshot.json").retake(
+        index=EnvironmentIndex.create([str(site_packages)])
+    )
+    assert sorted(read) == ["cards-2.0.dist-info", "pip-23.0.dist-info"]
+    differences = ReportDiff.from_packages(snapshot.packages, retaken.packages)
+    assert [pkg.name for pkg in differences.added] == ["cards"]
+    assert [(old.version, new.version) for old, new in differences.changed] == [
+        ("22.3", "23.0")
+    ]